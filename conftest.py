@@ -1,16 +1,36 @@
 import pytest
 import os
-import platform
+import re
 import allure
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 
+
+pytest_plugins = [
+    "utils.action_retry",
+    "utils.browser_watchdog",
+    "utils.duration_scheduler",
+    "utils.impact_analysis",
+    "utils.instrumentation",
+    "utils.load_generator",
+    "utils.performance",
+    "utils.resource_filter",
+]
+
+# The helpers imported below import several of these plugins too: register them first, so pytest
+# still rewrites their asserts instead of warning that they were imported too early
+pytest.register_assert_rewrite(*pytest_plugins)
+
+from utils.api_client import ApiClient
+from utils.artifacts import ArtifactPipeline
+from utils.browser_watchdog import BrowserWatchdog
 from utils.config import Config
-from utils.logger import logger
+from utils.driver_factory import DriverFactory
+from utils.data_reader import DataReader
+from utils.driver_pool import DriverPool, DriverPoolStats, WarmSpares
+from utils.load_generator import LoadGenerator
+from utils.local_server import LocalOrangeHRMServer
+from utils.logger import Logger, logger
+from utils.session_cache import SessionCache
 
 
 def pytest_addoption(parser):
@@ -18,17 +38,152 @@ def pytest_addoption(parser):
     Add command line options to pytest
     """
     parser.addoption("--browser", action="store", default="chrome",
-                     help="Browser to run tests (chrome or firefox)")
+                     help="Browser to run tests (chrome or firefox), or several separated by commas "
+                          "(e.g. chrome,firefox) to run every browser test once per browser in one session")
     parser.addoption("--headless", action="store_true", default=False,
                      help="Run browser in headless mode")
+    parser.addoption("--driver-scope", action="store", default=Config.DRIVER_SCOPE,
+                     choices=("function", "worker"),
+                     help="Launch a browser per test (function) or reuse pooled browsers per worker (worker)")
+    parser.addoption("--warm-spares", action="store", type=int, default=Config.WARM_SPARES,
+                     help="Browsers kept launched in the background per worker so tests don't wait for start-up "
+                          "(default 0: disabled)")
+    parser.addoption("--target", action="store", default=Config.TARGET, choices=("remote", "local"),
+                     help="Run against BASE_URL (remote) or the bundled local OrangeHRM stand-in (local)")
+    parser.addoption("--credentials-file", action="store", default=Config.CREDENTIALS_FILE,
+                     help="CSV or JSONL credentials for data driven login tests (e.g. from utils.data_generator)")
+    parser.addoption("--driver-offline", action="store_true", default=Config.DRIVER_OFFLINE,
+                     help="Resolve WebDriver binaries from the local cache or PATH only, never from the network")
+    parser.addoption("--page-load-strategy", action="store", default=Config.PAGE_LOAD_STRATEGY,
+                     choices=("normal", "eager", "none"),
+                     help="Wait for all subresources (normal), DOMContentLoaded (eager) or nothing (none) "
+                          "before page objects check their own readiness conditions")
+
+
+def pytest_configure(config):
+    """
+    Prepare session wide state
+    """
+    config._driver_pool_stats = DriverPoolStats()
 
+    unsupported = [name for name in Config.parse_browsers(config.getoption("--browser"))
+                   if name not in ("chrome", "firefox")]
+    if unsupported:
+        raise pytest.UsageError(f"Unsupported browser: {', '.join(unsupported)}")
+    Config.DRIVER_OFFLINE = config.getoption("--driver-offline")
+    Config.PAGE_LOAD_STRATEGY = config.getoption("--page-load-strategy")
 
-@pytest.fixture(scope="session")
+
+def pytest_generate_tests(metafunc):
+    """
+    Run browser tests once per --browser entry and turn every row of the login credentials CSV into its own test item
+    """
+    browsers = Config.parse_browsers(metafunc.config.getoption("--browser"))
+    if "browser" in metafunc.fixturenames and len(browsers) > 1:
+        metafunc.parametrize("browser", browsers, indirect=True)
+
+    if "credential_row" in metafunc.fixturenames:
+        file_path = metafunc.config.getoption("--credentials-file")
+        rows = DataReader.iter_login_credentials(file_path) if file_path else DataReader.get_login_credentials()
+        metafunc.parametrize("credential_row", credential_params(rows))
+
+
+def credential_params(rows):
+    """
+    Build parametrize entries with stable, readable IDs for credentials rows
+
+    Rows are independent items: every row exercises the login form itself (successful
+    rows log in and out again), so there is no login state to share and xdist may
+    spread them over all workers.
+
+    :param rows: Iterable of dictionaries with username, password and expected_result
+    :return: List of pytest.param objects
+    """
+    params = []
+
+    for index, row in enumerate(rows, 1):
+        username = re.sub(r"\W+", "_", row["username"]) or "no_username"
+        password = "with_password" if row["password"] else "no_password"
+        param_id = f"row{index:03d}-{username}-{password}-{row['expected_result']}"
+        params.append(pytest.param(row, id=param_id))
+
+    return params
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    Collect driver pool statistics sent back by xdist workers
+    """
+    stats = getattr(node, "workeroutput", {}).get("driver_pool")
+    if stats:
+        node.config._driver_pool_stats.merge(stats)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    """
+    Flush pending artifacts and logs, ship driver pool statistics from an xdist worker to the controller,
+    and merge the per-worker log files into a single time-ordered stream (xdist controller only)
+    """
+    ArtifactPipeline.shutdown()
+
+    config = session.config
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["driver_pool"] = config._driver_pool_stats.as_dict()
+        Logger.flush()
+    elif getattr(config.option, "numprocesses", None):
+        config._merged_log_path = Logger.merge_worker_logs()
+
+
+def pytest_unconfigure(config):
+    """
+    Stop the log listener while pytest's capture streams, which the console handler may write to, are still open
+    """
+    Logger.shutdown()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Report results per browser and how much time browser reuse saved
+    """
+    # Written here rather than logged: the log listener is stopped before pytest closes its streams
+    merged_path = getattr(config, "_merged_log_path", None)
+    if merged_path:
+        terminalreporter.write_line(f"Merged worker logs into {merged_path}")
+
+    if len(Config.parse_browsers(config.getoption("--browser"))) > 1:
+        outcomes = {}
+        for reports in terminalreporter.stats.values():
+            for report in reports:
+                browser = dict(getattr(report, "user_properties", ())).get("browser")
+                if browser and (report.when == "call" or (report.when == "setup" and not report.passed)):
+                    counts = outcomes.setdefault(browser, {})
+                    counts[report.outcome] = counts.get(report.outcome, 0) + 1
+        if outcomes:
+            terminalreporter.section("Results per browser")
+            for browser, counts in sorted(outcomes.items()):
+                terminalreporter.write_line(
+                    f"{browser}: " + ", ".join(f"{count} {outcome}" for outcome, count in sorted(counts.items())))
+
+    stats = config._driver_pool_stats
+    if stats.launches or stats.spares_used:
+        terminalreporter.section("WebDriver pool")
+        for line in stats.summary_lines():
+            terminalreporter.write_line(line)
+
+
+@pytest.fixture
 def browser(request):
     """
-    Return the browser name from command line option or default
+    Return the browser this test runs on and tag its results with it
+
+    With several browsers in --browser the tests are parametrized over them (see pytest_generate_tests).
     """
-    return request.config.getoption("--browser")
+    name = getattr(request, "param", None) or Config.parse_browsers(request.config.getoption("--browser"))[0]
+    request.node.user_properties.append(("browser", name))
+    allure.dynamic.tag(name)
+    return name
 
 
 @pytest.fixture(scope="session")
@@ -39,68 +194,170 @@ def headless(request):
     return request.config.getoption("--headless")
 
 
+@pytest.fixture(scope="session", autouse=True)
+def target_server(request):
+    """
+    Start the local OrangeHRM stand-in for --target=local and point Config.BASE_URL at it
+
+    :return: Base URL of the application under test
+    """
+    if request.config.getoption("--target") != "local":
+        yield Config.BASE_URL
+        return
+
+    server = LocalOrangeHRMServer().start()
+    original_base_url = Config.BASE_URL
+    Config.BASE_URL = server.url
+
+    yield server.url
+
+    Config.BASE_URL = original_base_url
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def driver_scope(request):
+    """
+    Return the driver scope from command line option or default
+    """
+    return request.config.getoption("--driver-scope")
+
+
+@pytest.fixture(scope="session")
+def warm_spares(request):
+    """
+    Browsers launched in the background ahead of need (for every --browser entry), or None with --warm-spares=0
+    """
+    count = request.config.getoption("--warm-spares")
+    if count <= 0:
+        yield None
+        return
+
+    spares = WarmSpares(count)
+    for browser in Config.parse_browsers(request.config.getoption("--browser")):
+        spares.prime(browser)
+    yield spares
+    spares.close()
+    request.config._driver_pool_stats.merge(spares.stats.as_dict())
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, warm_spares):
+    """
+    Keep browsers alive for the whole worker session and quit them at the end
+    """
+    pool = DriverPool(spares=warm_spares, watchdog=BrowserWatchdog.instance())
+    yield pool
+    pool.close()
+    request.config._driver_pool_stats.merge(pool.stats.as_dict())
+
+
 @pytest.fixture
-def driver(browser, headless):
+def driver(request, browser, headless, driver_scope, warm_spares):
     """
     Setup WebDriver instance before test and teardown after test
 
     :param browser: Browser to use
     :param headless: Whether to run in headless mode
+    :param driver_scope: "function" for a fresh browser per test, "worker" to reuse pooled browsers
+    :param warm_spares: WarmSpares fixture new browsers are taken from (None launches them directly)
     :return: WebDriver instance
     """
     # Set environment variables based on fixture params
     os.environ["BROWSER"] = browser
     os.environ["HEADLESS"] = str(headless).lower()
 
-    # Initialize WebDriver based on browser type
-    try:
-        if browser.lower() == "chrome":
-            options = Config.get_browser_options("chrome")
-
-            # On Windows, we need to handle WebDriver initialization differently
-            if platform.system() == "Windows":
-                driver = webdriver.Chrome(options=options)
-            else:
-                driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
-
-        elif browser.lower() == "firefox":
-            options = Config.get_browser_options("firefox")
-
-            # On Windows, we need to handle WebDriver initialization differently
-            if platform.system() == "Windows":
-                driver = webdriver.Firefox(options=options)
-            else:
-                driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()), options=options)
-        else:
-            raise ValueError(f"Unsupported browser: {browser}")
-
-    except Exception as e:
-        logger.error(f"Failed to initialize WebDriver: {str(e)}")
-
-        # Try alternative initialization method as fallback
-        if browser.lower() == "chrome":
-            driver = webdriver.Chrome()
-        elif browser.lower() == "firefox":
-            driver = webdriver.Firefox()
-        else:
-            raise ValueError(f"Unsupported browser: {browser}")
-
-    # Set implicit wait
-    driver.implicitly_wait(Config.IMPLICIT_WAIT)
-
-    # Maximize window
-    driver.maximize_window()
+    if driver_scope == "worker":
+        pool = request.getfixturevalue("driver_pool")
+        driver = pool.acquire(browser)
+
+        yield driver
+
+        # Hand the browser back: the watchdog may recycle it, otherwise it is reset for the next test
+        pool.release(driver)
+        return
+
+    driver = warm_spares.take(browser) if warm_spares else DriverFactory.create_driver(browser)
+    watchdog = BrowserWatchdog.instance()
+    watchdog.start(driver, browser)
 
     logger.info(f"Starting WebDriver session with {browser} browser")
 
     # Return driver for test use
     yield driver
 
-    # Teardown after test
+    # Teardown after test (the sample still goes into the memory curve)
+    watchdog.after_test(driver)
+    watchdog.stop(driver)
     logger.info("Closing WebDriver session")
     driver.quit()
 
 
+@pytest.fixture(scope="session")
+def session_cache():
+    """
+    Authenticated session snapshots shared by all tests of this worker
+    """
+    return SessionCache()
+
+
+@pytest.fixture(scope="session")
+def api_client(target_server):
+    """
+    HTTP client logged in as the default admin, shared by all tests of this worker
+
+    Use it to create preconditions and verify results without the browser, and
+    ``api_client.authenticate_driver(driver)`` to hand its session to a browser.
+    """
+    client = ApiClient(target_server)
+    if not client.login():
+        pytest.fail("API login with the default credentials was rejected")
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def load_result(request, target_server):
+    """
+    Run the load described by the test's ``@pytest.mark.load(...)`` marker and return its LoadResult
+
+    The marker takes the LoadGenerator arguments, e.g. ``@pytest.mark.load(mode="http", users=50, duration=30)``.
+    Load is only generated against the local stand-in (--target=local), never against shared environments.
+    """
+    marker = request.node.get_closest_marker("load")
+    if marker is None:
+        pytest.fail("load_result needs a @pytest.mark.load(...) marker")
+    if request.config.getoption("--target") != "local":
+        pytest.skip("load tests only run against the local stand-in (--target=local)")
+
+    settings = dict(marker.kwargs)
+    settings.setdefault("browser", Config.parse_browsers(request.config.getoption("--browser"))[0])
+    result = LoadGenerator(target_server, **settings).run()
+
+    allure.attach(result.report(), name="Load report", attachment_type=allure.attachment_type.TEXT)
+    path = result.write_json(f"load_{request.node.name}")
+    logger.info(f"Load report written to {path}")
+    request.node.user_properties.append(("load", result.summary_line()))
+    return result
+
+
+@pytest.fixture
+def logged_in_driver(driver, session_cache):
+    """
+    Return a function that logs the driver in as a given role, reusing cached sessions
+
+    Usage: ``dashboard_page = logged_in_driver("Admin")``
+
+    :param driver: WebDriver fixture
+    :param session_cache: SessionCache fixture
+    :return: Function taking a role and returning a DashboardPage object
+    """
+    def login_as(role="Admin"):
+        return session_cache.login(driver, role)
+
+    return login_as
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
@@ -121,32 +378,58 @@ def pytest_runtest_makereport(item, call):
 
             # Take screenshot if driver is available
             if fixture_driver:
-                take_screenshot(fixture_driver, item.nodeid)
+                item.screenshot = take_screenshot(fixture_driver, item.nodeid, item.funcargs.get("browser"))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    """
+    Attach the failure screenshot to the Allure report once the artifact pipeline has written it
+
+    The writer downscales and stores the PNG while the fixtures are torn down, so the
+    report gets the stored file rather than the full-resolution capture.
+    """
+    yield
+    screenshot = getattr(item, "screenshot", None)
+    if screenshot is None:
+        return
+
+    path, name = screenshot
+    if ArtifactPipeline.instance().wait(path, timeout=Config.DEFAULT_TIMEOUT):
+        allure.attach.file(path, name=name, attachment_type=allure.attachment_type.PNG)
+    else:
+        logger.warning(f"Screenshot {path} was not written, it is not attached to the report")
 
 
-def take_screenshot(driver, node_id):
+def take_screenshot(driver, node_id, browser=None):
     """
-    Take screenshot and attach to Allure report
+    Take screenshot and hand it to the artifact pipeline
+
+    The PNG is written to disk by the background artifact pipeline and attached to the
+    Allure report in test teardown; identical screenshots are stored and attached only once.
 
     :param driver: WebDriver instance
     :param node_id: Test node ID
+    :param browser: Browser the test ran on, used as the file name prefix
+    :return: Tuple (path, attachment name) of a screenshot still to attach, or None
     """
-    # Create screenshots directory if it doesn't exist
-    if not os.path.exists(Config.SCREENSHOT_DIR):
-        os.makedirs(Config.SCREENSHOT_DIR)
-
     # Generate unique screenshot filename
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     test_name = node_id.split("::")[-1]
-    screenshot_path = f"{Config.SCREENSHOT_DIR}/{test_name}_{timestamp}.png"
+    if browser:
+        test_name = f"{browser}_{test_name}"
 
     # Take screenshot
-    driver.save_screenshot(screenshot_path)
+    png = driver.get_screenshot_as_png()
+    screenshot_path, is_new = ArtifactPipeline.instance().submit(png, f"{test_name}_{timestamp}")
+
+    if screenshot_path is None:
+        return None
+
     logger.info(f"Screenshot saved to {screenshot_path}")
 
-    # Attach screenshot to Allure report
-    allure.attach.file(
-        screenshot_path,
-        name=f"Screenshot_{test_name}",
-        attachment_type=allure.attachment_type.PNG
-    )
\ No newline at end of file
+    if not is_new:
+        allure.attach(f"Identical to screenshot {screenshot_path}", name=f"Screenshot_{test_name}",
+                      attachment_type=allure.attachment_type.TEXT)
+        return None
+    return screenshot_path, f"Screenshot_{test_name}"
@@ -1,6 +1,74 @@
-from selenium.webdriver.support.ui import WebDriverWait
+import time
 from selenium.webdriver.support import expected_conditions as ec
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from utils.action_retry import ActionRetry
+from utils.artifacts import ArtifactPipeline
+from utils.config import Config
+from utils.impact_analysis import DependencyRecorder
+from utils.instrumentation import instrumented
+from utils.logger import logger
+from utils.performance import PERFORMANCE_SCRIPT, PerformanceMonitor
+
+
+# Resolves a batch of locators and reads their state in a single script round-trip
+SNAPSHOT_SCRIPT = """
+const [locators, attributeNames] = arguments;
+
+function resolve(by, value) {
+    switch (by) {
+        case 'id': return document.getElementById(value);
+        case 'name': return document.getElementsByName(value)[0] || null;
+        case 'css selector': return document.querySelector(value);
+        case 'class name': return document.getElementsByClassName(value)[0] || null;
+        case 'tag name': return document.getElementsByTagName(value)[0] || null;
+        case 'xpath':
+            return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'link text':
+            return Array.from(document.links).find(a => a.innerText.trim() === value) || null;
+        case 'partial link text':
+            return Array.from(document.links).find(a => a.innerText.includes(value)) || null;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+
+return locators.map(([by, value]) => {
+    const element = resolve(by, value);
+    if (!element) {
+        return {present: false, visible: false, text: null, value: null, attributes: {}};
+    }
+    const style = window.getComputedStyle(element);
+    const visible = !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length)
+        && style.visibility !== 'hidden' && style.display !== 'none';
+    const attributes = {};
+    for (const name of attributeNames) {
+        attributes[name] = element.getAttribute(name);
+    }
+    return {
+        present: true,
+        visible: visible,
+        text: visible ? element.innerText.trim() : '',
+        value: element.value === undefined ? null : element.value,
+        attributes: attributes,
+    };
+});
+"""
+
+
+# Reports whether a new document is parsed and the network has been quiet for a while. Resource Timing only
+# lists finished requests, so "quiet" means no request has completed within the quiet window.
+DOCUMENT_STATE_SCRIPT = """
+const quietMs = arguments[0];
+const resources = performance.getEntriesByType('resource');
+const lastResponse = resources.reduce((latest, entry) => Math.max(latest, entry.responseEnd), 0);
+return {
+    time_origin: performance.timeOrigin,
+    parsed: document.readyState !== 'loading',
+    network_idle: document.readyState !== 'loading' && performance.now() - lastResponse >= quietMs,
+};
+"""
+
+# Readiness condition waiting for the network to go quiet (see DOCUMENT_STATE_SCRIPT)
+NETWORK_IDLE = "network-idle"
 
 
 class BasePage:
@@ -9,6 +77,14 @@ class BasePage:
     All page classes inherit from this base class.
     """
 
+    # Page-load budgets checked after navigations, e.g. {"load": 5000, "transfer_size": 2000000}
+    # (milliseconds for timings, bytes for sizes; see utils/performance.py for the metric names)
+    PERFORMANCE_BUDGET = {}
+
+    # What open_url waits for before handing control back: locators that must be visible and enabled,
+    # and/or NETWORK_IDLE. This, not the page-load strategy, is what makes a page ready to use.
+    READY_CONDITIONS = ()
+
     def __init__(self, driver):
         """
         Initialize the BasePage with a WebDriver instance
@@ -16,15 +92,48 @@ class BasePage:
         :param driver: Selenium WebDriver instance
         """
         self.driver = driver
+        self.wait_history = []
+        DependencyRecorder.record_page(type(self))
 
+    @instrumented
     def open_url(self, url):
         """
         Open a specific URL
 
         :param url: URL to navigate to
         """
+        # With the "none" strategy get() may return while the previous document is still displayed
+        previous_origin = self.time_origin() if Config.PAGE_LOAD_STRATEGY == "none" else None
         self.driver.get(url)
+        self.wait_until_ready(previous_origin)
+        self.measure_page_load()
 
+    @instrumented
+    def wait_until_ready(self, previous_origin=None, timeout=None):
+        """
+        Wait for the READY_CONDITIONS of the page, one or two round-trips per poll
+
+        :param previous_origin: performance.timeOrigin of the document before navigating, if it must change
+        :param timeout: Time to wait in seconds (defaults to Config.DEFAULT_TIMEOUT)
+        """
+        locators = [condition for condition in self.READY_CONDITIONS if condition != NETWORK_IDLE]
+        check_document = previous_origin is not None or NETWORK_IDLE in self.READY_CONDITIONS
+        if not locators and not check_document:
+            return
+
+        def ready(driver):
+            if check_document:
+                document = driver.execute_script(DOCUMENT_STATE_SCRIPT, Config.NETWORK_IDLE_MS)
+                if document["time_origin"] == previous_origin or not document["parsed"]:
+                    return False
+                if NETWORK_IDLE in self.READY_CONDITIONS and not document["network_idle"]:
+                    return False
+            states = self.snapshot(locators, ("disabled",)) if locators else {}
+            return all(state["visible"] and state["attributes"]["disabled"] is None for state in states.values())
+
+        self.wait_until(ready, timeout, f"{type(self).__name__} readiness")
+
+    @instrumented
     def find_element(self, locator):
         """
         Find a web element using the locator provided
@@ -32,8 +141,10 @@ class BasePage:
         :param locator: Tuple containing locator strategy and value (e.g. (By.ID, 'username'))
         :return: WebElement object
         """
+        DependencyRecorder.record_locators(type(self), [locator])
         return self.driver.find_element(*locator)
 
+    @instrumented
     def find_elements(self, locator):
         """
         Find multiple web elements using the locator provided
@@ -41,27 +152,34 @@ class BasePage:
         :param locator: Tuple containing locator strategy and value
         :return: List of WebElement objects
         """
+        DependencyRecorder.record_locators(type(self), [locator])
         return self.driver.find_elements(*locator)
 
+    @instrumented
     def click(self, locator):
         """
-        Click on an element
+        Click on an element, locating it again and retrying after transient errors (see ActionRetry)
 
         :param locator: Tuple containing locator strategy and value
         """
-        self.find_element(locator).click()
+        ActionRetry.run(self, "click", locator, lambda: self.find_element(locator).click())
 
+    @instrumented
     def input_text(self, locator, text):
         """
-        Input text into a field
+        Input text into a field, locating it again and retrying after transient errors (see ActionRetry)
 
         :param locator: Tuple containing locator strategy and value
         :param text: Text to input
         """
-        element = self.find_element(locator)
-        element.clear()
-        element.send_keys(text)
+        def type_text():
+            element = self.find_element(locator)
+            element.clear()
+            element.send_keys(text)
 
+        ActionRetry.run(self, "input_text", locator, type_text)
+
+    @instrumented
     def get_text(self, locator):
         """
         Get text from an element
@@ -71,44 +189,201 @@ class BasePage:
         """
         return self.find_element(locator).text
 
+    @instrumented
     def is_displayed(self, locator):
         """
-        Check if an element is displayed
+        Check if an element is displayed right now, without waiting
 
         :param locator: Tuple containing locator strategy and value
         :return: Boolean indicating if element is displayed
         """
         try:
-            return self.find_element(locator).is_displayed()
-        except (NoSuchElementException, StaleElementReferenceException):
+            elements = self.find_elements(locator)
+            return bool(elements) and elements[0].is_displayed()
+        except StaleElementReferenceException:
             return False
 
-    def wait_for_element(self, locator, timeout=10):
+    @instrumented
+    def is_present(self, locator):
+        """
+        Check if an element is present in the DOM right now, without waiting
+
+        :param locator: Tuple containing locator strategy and value
+        :return: Boolean indicating if element is present
+        """
+        return bool(self.find_elements(locator))
+
+    @instrumented
+    def snapshot(self, locators, attributes=()):
+        """
+        Read the state of many elements in a single WebDriver round-trip
+
+        :param locators: List of tuples containing locator strategy and value
+        :param attributes: Names of the attributes to read from every element
+        :return: Dictionary mapping each locator to a dictionary with the keys
+                 present, visible, text, value and attributes
+        """
+        DependencyRecorder.record_locators(type(self), locators)
+        states = self.driver.execute_script(SNAPSHOT_SCRIPT, [list(locator) for locator in locators], list(attributes))
+        return dict(zip(locators, states))
+
+    def get_state(self, locator, attributes=()):
+        """
+        Read the state of a single element in one round-trip
+
+        :param locator: Tuple containing locator strategy and value
+        :param attributes: Names of the attributes to read
+        :return: Dictionary with the keys present, visible, text, value and attributes
+        """
+        return self.snapshot([locator], attributes)[locator]
+
+    def wait_for_state(self, locator, predicate=None, timeout=None):
+        """
+        Wait until an element's state satisfies a predicate, one round-trip per poll
+
+        :param locator: Tuple containing locator strategy and value
+        :param predicate: Callable taking the state dictionary (defaults to "is visible")
+        :param timeout: Time to wait in seconds (defaults to Config.DEFAULT_TIMEOUT)
+        :return: State dictionary once the predicate holds
+        """
+        predicate = predicate or (lambda state: state["visible"])
+
+        def condition(driver):
+            state = self.get_state(locator)
+            return state if predicate(state) else None
+
+        return self.wait_until(condition, timeout, f"state of {locator}")
+
+    def assert_states(self, expectations, attributes=()):
+        """
+        Check several elements at once and report every mismatch in a single assertion
+
+        :param expectations: Dictionary mapping locators to dictionaries of expected state values,
+                             e.g. {LOGIN_BUTTON: {"visible": True}, HEADER: {"text": "Dashboard"}}
+        :param attributes: Names of the attributes to read (for "attributes" expectations)
+        :return: Snapshot of all checked elements
+        """
+        states = self.snapshot(list(expectations), attributes)
+        mismatches = []
+        for locator, expected in expectations.items():
+            for key, expected_value in expected.items():
+                actual_value = states[locator][key]
+                if actual_value != expected_value:
+                    mismatches.append(f"{locator} {key}: expected {expected_value!r}, got {actual_value!r}")
+
+        assert not mismatches, f"{type(self).__name__} state mismatch:\n" + "\n".join(mismatches)
+        return states
+
+    @instrumented
+    def wait_until(self, condition, timeout=None, description="condition"):
+        """
+        Poll a condition until it returns a truthy value.
+
+        This is the only wait mechanism of the framework: implicit waits are disabled,
+        polling starts at a few milliseconds and backs off, and the time actually spent
+        waiting is recorded in wait_history (slow waits are logged as warnings).
+
+        :param condition: Callable taking the driver, e.g. an expected_conditions object
+        :param timeout: Deadline in seconds (defaults to Config.DEFAULT_TIMEOUT)
+        :param description: Human readable name of the wait used in logs and errors
+        :return: The truthy value returned by the condition
+        """
+        timeout = Config.DEFAULT_TIMEOUT if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = Config.WAIT_POLL_INITIAL
+
+        try:
+            while True:
+                try:
+                    value = condition(self.driver)
+                    if value:
+                        return value
+                except (NoSuchElementException, StaleElementReferenceException):
+                    pass
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutException(f"Timed out after {timeout}s waiting for {description}")
+
+                time.sleep(min(interval, remaining))
+                interval = min(interval * 2, Config.WAIT_POLL_MAX)
+        finally:
+            self._record_wait(description, time.monotonic() - start)
+
+    def wait_for_element(self, locator, timeout=None):
         """
         Wait for an element to be visible
 
         :param locator: Tuple containing locator strategy and value
-        :param timeout: Time to wait in seconds
+        :param timeout: Time to wait in seconds (defaults to Config.DEFAULT_TIMEOUT)
         :return: WebElement once it's visible
         """
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(ec.visibility_of_element_located(locator))
+        DependencyRecorder.record_locators(type(self), [locator])
+        return self.wait_until(ec.visibility_of_element_located(locator), timeout,
+                               f"visibility of {locator}")
 
-    def wait_for_clickable(self, locator, timeout=10):
+    def wait_for_clickable(self, locator, timeout=None):
         """
         Wait for an element to be clickable
 
         :param locator: Tuple containing locator strategy and value
-        :param timeout: Time to wait in seconds
+        :param timeout: Time to wait in seconds (defaults to Config.DEFAULT_TIMEOUT)
         :return: WebElement once it's clickable
         """
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(ec.element_to_be_clickable(locator))
+        DependencyRecorder.record_locators(type(self), [locator])
+        return self.wait_until(ec.element_to_be_clickable(locator), timeout,
+                               f"clickability of {locator}")
+
+    def _record_wait(self, description, seconds):
+        """
+        Remember how long a wait took and surface slow ones
+
+        :param description: Human readable name of the wait
+        :param seconds: Time spent waiting
+        """
+        self.wait_history.append((description, seconds))
+        if seconds >= Config.SLOW_WAIT_THRESHOLD:
+            logger.warning(f"Slow wait on {type(self).__name__}: {description} took {seconds:.2f}s")
+
+    @instrumented
+    def measure_page_load(self, previous_origin=None, timeout=None):
+        """
+        Collect Navigation/Resource Timing and paint metrics and check them against PERFORMANCE_BUDGET
+
+        :param previous_origin: performance.timeOrigin of the document before a transition;
+                                waits until a new document has finished loading (only until
+                                DOMContentLoaded with the eager and none page-load strategies)
+        :param timeout: Time to wait for the load event in seconds (defaults to Config.DEFAULT_TIMEOUT)
+        :return: Metrics dictionary, or None if the page has no budget or budgets are disabled
+        """
+        if not self.PERFORMANCE_BUDGET or not PerformanceMonitor.enabled:
+            return None
+
+        def loaded(driver):
+            metrics = driver.execute_script(PERFORMANCE_SCRIPT, Config.PAGE_LOAD_STRATEGY == "normal")
+            return metrics if metrics and metrics["time_origin"] != previous_origin else None
+
+        metrics = self.wait_until(loaded, timeout, "page load metrics")
+        PerformanceMonitor.check(type(self).__name__, metrics, self.PERFORMANCE_BUDGET)
+        return metrics
+
+    @instrumented
+    def time_origin(self):
+        """
+        Identify the current document, to detect when a transition has loaded a new one
+
+        :return: performance.timeOrigin of the current document
+        """
+        return self.driver.execute_script("return performance.timeOrigin")
 
+    @instrumented
     def take_screenshot(self, name):
         """
         Take a screenshot
 
         :param name: Name of the screenshot file
+        :return: Path the screenshot is written to in the background (None if over budget)
         """
-        self.driver.save_screenshot(f"reports/screenshots/{name}.png")
\ No newline at end of file
+        path, _ = ArtifactPipeline.instance().submit(self.driver.get_screenshot_as_png(), name)
+        return path
\ No newline at end of file
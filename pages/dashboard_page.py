@@ -1,25 +1,39 @@
 from selenium.webdriver.common.by import By
-from pages.base_page import BasePage
+from pages.module_page import ModulePage
+from utils.config import Config
+from utils.instrumentation import instrumented
 
 
-class DashboardPage(BasePage):
+class DashboardPage(ModulePage):
     """
     Page object for OrangeHRM Dashboard page
     """
     # Locators
     DASHBOARD_HEADER = (By.CSS_SELECTOR, ".oxd-topbar-header-breadcrumb > h6")
-    USER_DROPDOWN = (By.CSS_SELECTOR, ".oxd-userdropdown-tab")
-    LOGOUT_OPTION = (By.XPATH, "//a[text()='Logout']")
-    SIDE_MENU_ITEMS = (By.CSS_SELECTOR, ".oxd-main-menu-item")
 
-    def __init__(self, driver):
+    READY_CONDITIONS = (DASHBOARD_HEADER, ModulePage.USER_DROPDOWN)
+
+    MENU_NAME = "Dashboard"
+
+    PERFORMANCE_BUDGET = {
+        "ttfb": 2000,
+        "first_contentful_paint": 4000,
+        "dom_content_loaded": 5000,
+        "load": 7000,
+        "transfer_size": 5 * 1024 * 1024,
+    }
+
+    def __init__(self, driver, name=None, url=None):
         """
         Initialize DashboardPage object
 
         :param driver: WebDriver instance
+        :param name: Side menu entry (defaults to MENU_NAME)
+        :param url: Address of the dashboard (defaults to the dashboard of Config.BASE_URL)
         """
-        super().__init__(driver)
+        super().__init__(driver, name, url or f"{Config.BASE_URL}/web/index.php/dashboard/index")
 
+    @instrumented
     def is_dashboard_displayed(self):
         """
         Check if dashboard page is loaded
@@ -27,46 +41,40 @@ class DashboardPage(BasePage):
         :return: Boolean indicating if dashboard is displayed
         """
         try:
-            self.wait_for_element(self.DASHBOARD_HEADER)
-            return self.get_text(self.DASHBOARD_HEADER) == "Dashboard"
+            return self.wait_for_state(self.DASHBOARD_HEADER)["text"] == "Dashboard"
         except:
             return False
 
-    def get_dashboard_title(self):
+    @instrumented
+    def is_session_valid(self):
         """
-        Get the title of the dashboard page
+        Check that the browser is authenticated (the application redirects to the login page otherwise)
 
-        :return: Title text
+        :return: Boolean indicating if the session is still logged in
         """
-        self.wait_for_element(self.DASHBOARD_HEADER)
-        return self.get_text(self.DASHBOARD_HEADER)
+        if "/auth/login" in self.driver.current_url:
+            return False
+        return self.is_dashboard_displayed()
 
-    def logout(self):
+    @instrumented
+    def get_dashboard_title(self):
         """
-        Perform logout action
+        Get the title of the dashboard page
 
-        :return: LoginPage object
+        :return: Title text
         """
-        self.wait_for_element(self.USER_DROPDOWN)
-        self.click(self.USER_DROPDOWN)
-        self.wait_for_element(self.LOGOUT_OPTION)
-        self.click(self.LOGOUT_OPTION)
-
-        # Import locally to avoid circular imports
-        from pages.login_page import LoginPage
-        return LoginPage(self.driver)
+        return self.wait_for_state(self.DASHBOARD_HEADER)["text"]
 
-    def navigate_to_menu(self, menu_name):
+    @instrumented
+    def assert_dashboard_displayed(self):
         """
-        Navigate to a specific menu item
+        Verify the dashboard header, user menu and side menu in a single round-trip
 
-        :param menu_name: Name of the menu to navigate to
-        :return: Respective page object based on navigation
+        :return: Snapshot of the dashboard elements
         """
-        menu_locator = (By.XPATH, f"//span[text()='{menu_name}']/parent::a")
-        self.wait_for_clickable(menu_locator)
-        self.click(menu_locator)
-
-        # Here you would normally return the appropriate page object
-        # For simplicity, we'll just return self
-        return self
\ No newline at end of file
+        self.wait_for_state(self.DASHBOARD_HEADER)
+        return self.assert_states({
+            self.DASHBOARD_HEADER: {"visible": True, "text": "Dashboard"},
+            self.USER_DROPDOWN: {"visible": True},
+            self.SIDE_MENU_ITEMS: {"visible": True},
+        })
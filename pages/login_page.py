@@ -1,5 +1,10 @@
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from utils.config import Config
+from utils.instrumentation import instrumented
+from utils.logger import logger
+from utils.performance import PerformanceMonitor
 
 
 class LoginPage(BasePage):
@@ -11,9 +16,20 @@ class LoginPage(BasePage):
     PASSWORD_INPUT = (By.NAME, "password")
     LOGIN_BUTTON = (By.CSS_SELECTOR, "button[type='submit']")
     ERROR_MESSAGE = (By.CSS_SELECTOR, ".oxd-alert-content-text")
+    FIELD_ERROR_MESSAGE = (By.CSS_SELECTOR, ".oxd-input-field-error-message")
     FORGOT_PASSWORD_LINK = (By.CSS_SELECTOR, ".orangehrm-login-forgot")
     BRAND_LOGO = (By.CSS_SELECTOR, ".orangehrm-login-branding > img")
 
+    READY_CONDITIONS = (USERNAME_INPUT, PASSWORD_INPUT, LOGIN_BUTTON)
+
+    PERFORMANCE_BUDGET = {
+        "ttfb": 1500,
+        "first_contentful_paint": 3000,
+        "dom_content_loaded": 4000,
+        "load": 5000,
+        "transfer_size": 3 * 1024 * 1024,
+    }
+
     def __init__(self, driver):
         """
         Initialize LoginPage object
@@ -21,15 +37,17 @@ class LoginPage(BasePage):
         :param driver: WebDriver instance
         """
         super().__init__(driver)
-        self.url = "https://opensource-demo.orangehrmlive.com/web/index.php/auth/login"
+        self.url = f"{Config.BASE_URL}/web/index.php/auth/login"
 
+    @instrumented
     def open(self):
         """
-        Open the login page
+        Open the login page and wait until the login form can be used
         """
         self.open_url(self.url)
         return self
 
+    @instrumented
     def login(self, username, password):
         """
         Perform login with given credentials
@@ -41,12 +59,24 @@ class LoginPage(BasePage):
         self.wait_for_element(self.USERNAME_INPUT)
         self.input_text(self.USERNAME_INPUT, username)
         self.input_text(self.PASSWORD_INPUT, password)
+        previous_origin = self.time_origin() if PerformanceMonitor.enabled else None
         self.click(self.LOGIN_BUTTON)
 
         # Importing locally to avoid circular imports
         from pages.dashboard_page import DashboardPage
-        return DashboardPage(self.driver)
+        dashboard_page = DashboardPage(self.driver)
+        # The side menu depends on who logged in
+        DashboardPage.invalidate_menu_index(self.driver)
+
+        # Measure the login -> dashboard transition; a login that never lands is reported by the test itself
+        try:
+            dashboard_page.measure_page_load(previous_origin)
+        except TimeoutException:
+            logger.warning("Dashboard did not finish loading after login, page-load metrics skipped")
 
+        return dashboard_page
+
+    @instrumented
     def login_with_invalid_credentials(self, username, password):
         """
         Attempt login with invalid credentials
@@ -61,15 +91,52 @@ class LoginPage(BasePage):
         self.click(self.LOGIN_BUTTON)
         return self
 
+    @instrumented
+    def assert_login_form_displayed(self):
+        """
+        Verify all login form fields in a single round-trip
+
+        :return: Snapshot of the login form elements
+        """
+        return self.assert_states({
+            self.USERNAME_INPUT: {"visible": True},
+            self.PASSWORD_INPUT: {"visible": True},
+            self.LOGIN_BUTTON: {"visible": True},
+            self.FORGOT_PASSWORD_LINK: {"visible": True},
+            self.BRAND_LOGO: {"visible": True},
+        })
+
+    @instrumented
+    def assert_login_failed(self, expected_error):
+        """
+        Verify that the login form is still shown together with an error, in a single round-trip
+
+        :param expected_error: Text expected to be contained in the error message
+        """
+        error_message = self.get_error_message()
+        assert expected_error in error_message, f"Expected error message '{expected_error}' not found in '{error_message}'"
+        self.assert_states({
+            self.USERNAME_INPUT: {"visible": True},
+            self.LOGIN_BUTTON: {"visible": True},
+        })
+
+    @instrumented
     def get_error_message(self):
         """
         Get error message displayed after failed login
 
-        :return: Text of the error message
+        Rejected credentials are reported in an alert, empty fields only by the
+        "Required" message under each field.
+
+        :return: Text of the alert, or else of the first field error
         """
-        self.wait_for_element(self.ERROR_MESSAGE)
-        return self.get_text(self.ERROR_MESSAGE)
+        def shown(driver):
+            states = self.snapshot([self.ERROR_MESSAGE, self.FIELD_ERROR_MESSAGE])
+            return next((state["text"] for state in states.values() if state["visible"]), None)
+
+        return self.wait_until(shown, description="login error message")
 
+    @instrumented
     def click_forgot_password(self):
         """
         Click on Forgot Password link
@@ -82,6 +149,7 @@ class LoginPage(BasePage):
         # For simplicity, just returning self for now
         return self
 
+    @instrumented
     def is_brand_logo_displayed(self):
         """
         Check if brand logo is displayed
@@ -0,0 +1,138 @@
+from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+from utils.impact_analysis import DependencyRecorder
+from utils.instrumentation import instrumented
+from utils.logger import logger
+
+
+# Reads the name and link of every side menu entry in a single round-trip
+MENU_INDEX_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(item => {
+    const link = item.closest('a') || item.querySelector('a');
+    return [item.textContent.trim(), link ? link.href : null];
+}).filter(([name, href]) => name && href);
+"""
+
+
+class ModulePage(BasePage):
+    """
+    Page object for an OrangeHRM module reached from the side menu (Admin, PIM, Leave, ...).
+
+    Modules without a page object of their own are represented by this class;
+    subclasses declaring MENU_NAME (e.g. DashboardPage) are returned for their entry instead.
+    """
+    # Locators
+    MODULE_HEADER = (By.CSS_SELECTOR, ".oxd-topbar-header-breadcrumb > h6")
+    USER_DROPDOWN = (By.CSS_SELECTOR, ".oxd-userdropdown-tab")
+    LOGOUT_OPTION = (By.XPATH, "//a[text()='Logout']")
+    SIDE_MENU_ITEMS = (By.CSS_SELECTOR, ".oxd-main-menu-item")
+
+    READY_CONDITIONS = (MODULE_HEADER, USER_DROPDOWN)
+
+    # Side menu entry this page object stands for
+    MENU_NAME = None
+
+    # Page object classes by side menu entry, filled in by subclasses declaring MENU_NAME
+    MENU_PAGES = {}
+
+    # Side menu indexes ({name: URL}) by WebDriver session, built once per logged in session
+    _menu_indexes = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.MENU_NAME:
+            ModulePage.MENU_PAGES[cls.MENU_NAME] = cls
+
+    def __init__(self, driver, name=None, url=None):
+        """
+        Initialize ModulePage object
+
+        :param driver: WebDriver instance
+        :param name: Side menu entry of the module (defaults to MENU_NAME)
+        :param url: Address of the module
+        """
+        super().__init__(driver)
+        self.name = name or self.MENU_NAME
+        self.url = url
+
+    @instrumented
+    def open(self):
+        """
+        Open the module page directly (requires an authenticated session)
+        """
+        self.open_url(self.url)
+        return self
+
+    @instrumented
+    def get_title(self):
+        """
+        Get the module name shown in the top bar
+
+        :return: Title text
+        """
+        return self.wait_for_state(self.MODULE_HEADER)["text"]
+
+    @instrumented
+    def menu_index(self, refresh=False):
+        """
+        Map every side menu entry to the URL it links to, reading the menu once per session
+
+        :param refresh: Read the menu again even if it was indexed already
+        :return: Dictionary {menu name: URL}
+        """
+        index = None if refresh else ModulePage._menu_indexes.get(self.driver.session_id)
+        if index is None:
+            DependencyRecorder.record_locators(type(self), [self.SIDE_MENU_ITEMS])
+            self.wait_for_state(self.SIDE_MENU_ITEMS)
+            index = dict(self.driver.execute_script(MENU_INDEX_SCRIPT, self.SIDE_MENU_ITEMS[1]))
+            ModulePage._menu_indexes[self.driver.session_id] = index
+            logger.info(f"Indexed {len(index)} side menu items")
+        return index
+
+    @staticmethod
+    def invalidate_menu_index(driver=None):
+        """
+        Forget indexed side menus (after logging in or out, or when a test changes the user's permissions)
+
+        :param driver: WebDriver instance whose index to drop, or None to drop every index
+        """
+        if driver is None:
+            ModulePage._menu_indexes.clear()
+        else:
+            ModulePage._menu_indexes.pop(driver.session_id, None)
+
+    @instrumented
+    def navigate_to_menu(self, menu_name):
+        """
+        Navigate to a side menu entry by opening the URL it links to
+
+        :param menu_name: Name of the menu to navigate to
+        :return: Page object of the module (ModulePage if the module has no page object of its own)
+        """
+        url = self.menu_index().get(menu_name)
+        if url is None:
+            # The menu may have changed since it was indexed
+            index = self.menu_index(refresh=True)
+            url = index.get(menu_name)
+            if url is None:
+                raise ValueError(f"No side menu item named {menu_name!r}, available: {', '.join(index)}")
+
+        page_class = ModulePage.MENU_PAGES.get(menu_name, ModulePage)
+        return page_class(self.driver, menu_name, url).open()
+
+    @instrumented
+    def logout(self):
+        """
+        Perform logout action
+
+        :return: LoginPage object
+        """
+        self.wait_for_element(self.USER_DROPDOWN)
+        self.click(self.USER_DROPDOWN)
+        self.wait_for_element(self.LOGOUT_OPTION)
+        self.click(self.LOGOUT_OPTION)
+        ModulePage.invalidate_menu_index(self.driver)
+
+        # Import locally to avoid circular imports
+        from pages.login_page import LoginPage
+        return LoginPage(self.driver)
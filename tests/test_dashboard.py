@@ -0,0 +1,82 @@
+import allure
+from utils.logger import logger
+
+
+@allure.epic("Dashboard")
+@allure.feature("Dashboard")
+class TestDashboard:
+
+    @allure.story("Dashboard Title")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.description("Test dashboard title for a logged in admin")
+    def test_dashboard_title(self, logged_in_driver):
+        """
+        Test that the dashboard title is shown for a logged in user
+
+        :param logged_in_driver: Fixture logging the browser in as a given role
+        """
+        logger.info("Starting dashboard title test")
+
+        with allure.step("Open dashboard as Admin"):
+            dashboard_page = logged_in_driver("Admin")
+
+        with allure.step("Verify dashboard title"):
+            assert dashboard_page.get_dashboard_title() == "Dashboard", "Dashboard title is not displayed"
+
+        with allure.step("Verify dashboard header, user menu and side menu"):
+            dashboard_page.assert_dashboard_displayed()
+
+        logger.info("Dashboard title test completed successfully")
+
+    @allure.story("Side Menu Navigation")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.description("Test moving between modules through the side menu")
+    def test_side_menu_navigation(self, logged_in_driver):
+        """
+        Test that side menu entries lead to their modules and back to the dashboard
+
+        :param logged_in_driver: Fixture logging the browser in as a given role
+        """
+        logger.info("Starting side menu navigation test")
+
+        with allure.step("Open dashboard as Admin"):
+            dashboard_page = logged_in_driver("Admin")
+
+        with allure.step("Navigate to PIM"):
+            pim_page = dashboard_page.navigate_to_menu("PIM")
+
+        with allure.step("Verify PIM module is displayed"):
+            assert pim_page.get_title() == "PIM", "PIM module is not displayed"
+
+        with allure.step("Navigate back to Dashboard"):
+            dashboard_page = pim_page.navigate_to_menu("Dashboard")
+
+        with allure.step("Verify dashboard title"):
+            assert dashboard_page.get_dashboard_title() == "Dashboard", "Dashboard title is not displayed"
+
+        logger.info("Side menu navigation test completed successfully")
+
+    @allure.story("Logout")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @allure.description("Test logout from the dashboard")
+    def test_logout(self, logged_in_driver, session_cache):
+        """
+        Test that a logged in user can log out
+
+        :param logged_in_driver: Fixture logging the browser in as a given role
+        :param session_cache: Cached authenticated sessions
+        """
+        logger.info("Starting logout test")
+
+        with allure.step("Open dashboard as Admin"):
+            dashboard_page = logged_in_driver("Admin")
+
+        with allure.step("Logout"):
+            login_page = dashboard_page.logout()
+            # Logging out ends the server side session the cache was holding
+            session_cache.invalidate("Admin")
+
+        with allure.step("Verify login page is displayed"):
+            login_page.wait_for_element(login_page.USERNAME_INPUT)
+
+        logger.info("Logout test completed successfully")
@@ -0,0 +1,109 @@
+import json
+import os
+import allure
+import pytest
+from utils.config import Config
+from utils.data_reader import DataReader
+
+
+@pytest.fixture
+def data_cache(tmp_path, monkeypatch):
+    """
+    Empty in-process cache and a binary cache directory of the test's own
+
+    :return: Directory for test data files
+    """
+    monkeypatch.setattr(Config, "DATA_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(Config, "DATA_BINARY_CACHE", False)
+    DataReader.clear_cache()
+    yield tmp_path
+    DataReader.clear_cache()
+
+
+def write_json(path, data):
+    """
+    Write a JSON test data file
+
+    :param path: File path
+    :param data: Data to write
+    :return: File size in bytes
+    """
+    path.write_text(json.dumps(data))
+    return os.path.getsize(path)
+
+
+@allure.epic("Framework")
+@allure.feature("Test data cache")
+class TestDataReader:
+
+    @allure.story("Versioned Cache")
+    @allure.description("Test that parsed files are reused until they change on disk")
+    def test_reparse_on_change(self, data_cache):
+        """
+        Test that the in-process cache is keyed on the file version
+
+        :param data_cache: Directory for test data files
+        """
+        path = data_cache / "users.json"
+        write_json(path, {"users": [1]})
+
+        first = DataReader.read_json(path)
+        assert DataReader.read_json(path) is first, "Unchanged file was parsed again"
+
+        write_json(path, {"users": [1, 2]})
+        assert DataReader.read_json(path) == {"users": [1, 2]}
+
+    @allure.story("LRU Eviction")
+    @allure.description("Test that the least recently used files are evicted over the byte budget")
+    def test_lru_eviction(self, data_cache, monkeypatch):
+        """
+        Test eviction order and the oversized file bypass
+
+        :param data_cache: Directory for test data files
+        :param monkeypatch: Pytest monkeypatch fixture
+        """
+        paths = [data_cache / f"{name}.json" for name in ("a", "b", "c")]
+        size = max(write_json(path, {"name": path.stem}) for path in paths)
+        big = data_cache / "big.json"
+        write_json(big, {"name": "big" * size})
+        monkeypatch.setattr(Config, "DATA_CACHE_MAX_BYTES", 2 * size)
+
+        DataReader.read_json(paths[0])
+        DataReader.read_json(paths[1])
+        DataReader.read_json(paths[0])
+        DataReader.read_json(paths[2])
+        DataReader.read_json(big)
+
+        cached = {os.path.basename(path) for _, path in DataReader._cache}
+        assert cached == {"a.json", "c.json"}
+        assert DataReader._cache_bytes <= Config.DATA_CACHE_MAX_BYTES
+
+    @allure.story("Binary Cache")
+    @allure.description("Test that other processes reuse the pickled copy and drop unreadable ones")
+    def test_binary_cache(self, data_cache, monkeypatch):
+        """
+        Test that a fresh process loads the pickle, and reparses when it is corrupt
+
+        :param data_cache: Directory for test data files
+        :param monkeypatch: Pytest monkeypatch fixture
+        """
+        monkeypatch.setattr(Config, "DATA_BINARY_CACHE", True)
+        parsed = []
+        parse_json = DataReader._parse_json
+        monkeypatch.setattr(DataReader, "_parse_json", staticmethod(lambda file_path: parsed.append(file_path)
+                                                                    or parse_json(file_path)))
+        path = data_cache / "users.json"
+        write_json(path, {"users": [1]})
+        DataReader.read_json(path)
+
+        # A new process starts with an empty in-process cache
+        DataReader.clear_cache()
+        assert DataReader.read_json(path) == {"users": [1]}
+        assert len(parsed) == 1, "Pickled copy was not used"
+
+        (pickle_path,) = (data_cache / "cache").iterdir()
+        pickle_path.write_bytes(b"truncated")
+        DataReader.clear_cache()
+        assert DataReader.read_json(path) == {"users": [1]}
+        assert len(parsed) == 2
+        assert pickle_path.read_bytes() != b"truncated", "Unreadable copy was not replaced"
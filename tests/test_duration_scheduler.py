@@ -0,0 +1,67 @@
+import allure
+import pytest
+from utils.duration_scheduler import DEFAULT_ESTIMATE, DurationStore, predict_makespan
+
+
+MODULE = "tests/test_login.py"
+
+
+@allure.epic("Framework")
+@allure.feature("Duration scheduling")
+class TestDurationScheduler:
+
+    @allure.story("Recorded Durations")
+    @allure.description("Test that recorded durations are smoothed per browser")
+    def test_record(self):
+        """
+        Test DurationStore.record smoothing and browser separation
+        """
+        store = DurationStore()
+        store.record("chrome", f"{MODULE}::TestLogin::test_valid_login", 4.0)
+        store.record("chrome", f"{MODULE}::TestLogin::test_valid_login", 2.0)
+
+        assert store.estimate("chrome", f"{MODULE}::TestLogin::test_valid_login") == 3.0
+        assert store.estimate("firefox", f"{MODULE}::TestLogin::test_valid_login") == DEFAULT_ESTIMATE
+
+    @allure.story("Estimates")
+    @allure.description("Test that unknown tests are estimated from the closest known group")
+    @pytest.mark.parametrize("nodeid, expected", [
+        (f"{MODULE}::TestLogin::test_invalid_login[c]", 3.0),
+        (f"{MODULE}::TestLogin::test_logout", 4.0),
+        (f"{MODULE}::test_function", 5.0),
+        ("tests/test_dashboard.py::TestDashboard::test_menu", 6.0),
+    ])
+    def test_estimate(self, nodeid, expected):
+        """
+        Test DurationStore.estimate for tests missing from the store
+
+        :param nodeid: Test node ID to estimate
+        :param expected: Expected estimate in seconds
+        """
+        store = DurationStore({"chrome": {
+            f"{MODULE}::TestLogin::test_invalid_login[a]": 2.0,
+            f"{MODULE}::TestLogin::test_invalid_login[b]": 4.0,
+            f"{MODULE}::TestLogin::test_valid_login": 6.0,
+            f"{MODULE}::test_other": 8.0,
+            "tests/test_load.py::TestLoad::test_load": 10.0,
+        }})
+
+        assert store.estimate("chrome", nodeid) == expected
+
+    @allure.story("Makespan")
+    @allure.description("Test the simulated longest-first makespan")
+    @pytest.mark.parametrize("durations, workers, expected", [
+        ([5, 4, 3, 3, 2, 1], 2, 9),
+        ([5, 4, 3, 3, 2, 1], 1, 18),
+        ([10, 1, 1], 4, 10),
+        ([2, 2], 0, 4),
+    ])
+    def test_predict_makespan(self, durations, workers, expected):
+        """
+        Test predict_makespan
+
+        :param durations: Expected test durations
+        :param workers: Number of workers
+        :param expected: Expected makespan in seconds
+        """
+        assert predict_makespan(durations, workers) == expected
@@ -0,0 +1,96 @@
+import allure
+import pytest
+from utils import impact_analysis
+from utils.impact_analysis import ImpactSelector, changed_lines, locator_ranges
+
+
+LOGIN_PAGE = "pages/login_page.py"
+
+IMPACT_MAP = {
+    "tests/test_login.py": {"files": ["tests/test_login.py", "utils/data_reader.py"], "symbols": []},
+    "tests/test_login.py::TestLogin::test_valid_login": {
+        "files": [LOGIN_PAGE], "symbols": [f"{LOGIN_PAGE}::LoginPage.USERNAME_INPUT"]},
+    "tests/test_dashboard.py": {"files": ["tests/test_dashboard.py"], "symbols": []},
+    "tests/test_dashboard.py::TestDashboard::test_dashboard_elements": {
+        "files": ["pages/dashboard_page.py"], "symbols": []},
+}
+
+VALID_LOGIN = "tests/test_login.py::TestLogin::test_valid_login"
+DASHBOARD = "tests/test_dashboard.py::TestDashboard::test_dashboard_elements"
+
+
+@allure.epic("Framework")
+@allure.feature("Test impact analysis")
+class TestImpactAnalysis:
+
+    @allure.story("Locator Ranges")
+    @allure.description("Test that the locator constants of a page object are found with their lines")
+    def test_locator_ranges(self):
+        """
+        Test locator_ranges on the login page object
+        """
+        ranges = locator_ranges(LOGIN_PAGE)
+
+        assert ranges[f"{LOGIN_PAGE}::LoginPage.USERNAME_INPUT"] == (15, 15)
+        assert f"{LOGIN_PAGE}::LoginPage.READY_CONDITIONS" in ranges
+        assert f"{LOGIN_PAGE}::LoginPage.PERFORMANCE_BUDGET" not in ranges, "Dictionaries are not locators"
+
+    @allure.story("Changed Lines")
+    @allure.description("Test that git diff hunks and untracked files are turned into changed lines")
+    def test_changed_lines(self, monkeypatch):
+        """
+        Test changed_lines on canned git output
+
+        :param monkeypatch: Pytest monkeypatch fixture
+        """
+        outputs = {
+            "merge-base": "abc123\n",
+            "diff": "\n".join([
+                "diff --git a/pages/login_page.py b/pages/login_page.py",
+                "--- a/pages/login_page.py",
+                "+++ b/pages/login_page.py",
+                "@@ -15 +15 @@ class LoginPage(BasePage):",
+                "@@ -30,2 +30,3 @@",
+                "@@ -40,2 +41,0 @@",
+                "--- a/utils/old.py",
+                "+++ /dev/null",
+                "--- /dev/null",
+                "+++ b/utils/new.py",
+                "@@ -0,0 +1,2 @@",
+            ]),
+            "ls-files": "data/extra.csv\n",
+        }
+        monkeypatch.setattr(impact_analysis, "git", lambda command, *args: outputs[command])
+
+        changes = changed_lines("main")
+
+        assert changes[LOGIN_PAGE] == {15, 30, 31, 32, 41, 42}
+        assert changes["utils/old.py"] == set()
+        assert changes["utils/new.py"] == {1, 2}
+        assert changes["data/extra.csv"] == set()
+
+    @allure.story("Impact Selection")
+    @allure.description("Test which tests are selected for file, locator and unmapped changes")
+    @pytest.mark.parametrize("changes, affected, unmapped", [
+        ({"tests/test_login.py": set()}, {VALID_LOGIN}, []),
+        ({"utils/data_reader.py": {3}}, {VALID_LOGIN}, []),
+        ({LOGIN_PAGE: {15}}, {VALID_LOGIN}, []),
+        ({LOGIN_PAGE: {16}}, set(), []),
+        ({LOGIN_PAGE: {15, 40}}, {VALID_LOGIN}, []),
+        ({"pages/dashboard_page.py": set()}, {DASHBOARD}, []),
+        ({"data/unused.csv": set(), "README.md": {1}}, set(), []),
+        ({"utils/unknown.py": {1}}, set(), ["utils/unknown.py"]),
+    ])
+    def test_impact_selector(self, changes, affected, unmapped):
+        """
+        Test ImpactSelector.is_affected and its unmapped files
+
+        :param changes: Changed lines per file
+        :param affected: Tests expected to be selected
+        :param unmapped: Files expected to force a full run
+        """
+        selector = ImpactSelector(IMPACT_MAP, changes)
+
+        assert {nodeid for nodeid in (VALID_LOGIN, DASHBOARD) if selector.is_affected(nodeid)} == affected
+        assert selector.unmapped == unmapped
+        assert selector.is_affected("tests/test_new.py::test_unknown"), "Tests missing from the map always run"
@@ -0,0 +1,41 @@
+import pytest
+import allure
+from utils.logger import logger
+
+
+@allure.epic("Authentication")
+@allure.feature("Login under load")
+class TestLoad:
+
+    @allure.story("Concurrent HTTP Logins")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.description("Test that logins keep succeeding with many concurrent HTTP users")
+    @pytest.mark.load(mode="http", users=50, ramp_up=10, duration=20)
+    def test_concurrent_http_logins(self, load_result):
+        """
+        Test the login flow with 50 concurrent lightweight users
+
+        :param load_result: LoadResult of the run described by the load marker
+        """
+        logger.info(f"HTTP load: {load_result.summary_line()}")
+
+        with allure.step("Verify no login failed"):
+            assert load_result.error_rate == 0, f"Errors under load: {load_result.error_counts()}"
+
+        with allure.step("Verify login latency stays within 2s at the 95th percentile"):
+            assert load_result.steps()["login"]["p95"] < 2000, load_result.report()
+
+    @allure.story("Concurrent Browser Logins")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.description("Test that logins keep succeeding with concurrent users in headless browsers")
+    @pytest.mark.load(mode="browser", users=8, pool_size=4, ramp_up=10, duration=30)
+    def test_concurrent_browser_logins(self, load_result):
+        """
+        Test LoginPage.login / DashboardPage.logout with 8 users sharing 4 headless browsers
+
+        :param load_result: LoadResult of the run described by the load marker
+        """
+        logger.info(f"Browser load: {load_result.summary_line()}")
+
+        with allure.step("Verify at most 1% of the iterations failed"):
+            assert load_result.error_rate <= 0.01, f"Errors under load: {load_result.error_counts()}"
@@ -0,0 +1,60 @@
+import json
+import allure
+from utils.config import Config
+from utils.logger import RUN_ID, Logger
+
+
+def write_log(path, timestamps, worker):
+    """
+    Write a worker log file with one record per timestamp
+
+    :param path: File path
+    :param timestamps: Record timestamps in file order
+    :param worker: xdist worker ID of the records
+    """
+    path.write_text("".join(json.dumps({"ts": ts, "worker": worker, "message": f"{worker} {ts}"}) + "\n"
+                            for ts in timestamps))
+
+
+@allure.epic("Framework")
+@allure.feature("Logging")
+class TestLogger:
+
+    @allure.story("Worker Log Merge")
+    @allure.description("Test that worker log files, including rotated ones, are merged in time order")
+    def test_merge_worker_logs(self, tmp_path, monkeypatch):
+        """
+        Test Logger.merge_worker_logs
+
+        :param tmp_path: Pytest temporary directory fixture
+        :param monkeypatch: Pytest monkeypatch fixture
+        """
+        monkeypatch.setattr(Config, "LOG_DIR", str(tmp_path))
+        # Rotated files hold older records, the highest suffix the oldest
+        write_log(tmp_path / f"test_run_{RUN_ID}_gw0.jsonl.2", [1.0, 3.0], "gw0")
+        write_log(tmp_path / f"test_run_{RUN_ID}_gw0.jsonl.1", [5.0], "gw0")
+        write_log(tmp_path / f"test_run_{RUN_ID}_gw0.jsonl", [8.0], "gw0")
+        write_log(tmp_path / f"test_run_{RUN_ID}_gw1.jsonl", [2.0, 4.0, 9.0], "gw1")
+        with open(tmp_path / f"test_run_{RUN_ID}_gw1.jsonl", 'a') as file:
+            file.write("not json\n")
+        write_log(tmp_path / "test_run_other_gw0.jsonl", [6.0], "other")
+
+        merged_path = Logger.merge_worker_logs()
+
+        with open(merged_path, 'r') as merged_file:
+            entries = [json.loads(line) for line in merged_file]
+        assert merged_path == str(tmp_path / f"test_run_{RUN_ID}.jsonl")
+        assert [entry["ts"] for entry in entries] == [1.0, 2.0, 3.0, 4.0, 5.0, 8.0, 9.0]
+
+    @allure.story("Worker Log Merge")
+    @allure.description("Test that nothing is merged when no worker wrote a log")
+    def test_merge_without_logs(self, tmp_path, monkeypatch):
+        """
+        Test that nothing is merged when no worker wrote a log
+
+        :param tmp_path: Pytest temporary directory fixture
+        :param monkeypatch: Pytest monkeypatch fixture
+        """
+        monkeypatch.setattr(Config, "LOG_DIR", str(tmp_path))
+
+        assert Logger.merge_worker_logs() is None
@@ -1,3 +1,4 @@
+import uuid
 import pytest
 import allure
 from pages.login_page import LoginPage
@@ -91,6 +92,10 @@ class TestLogin:
         with allure.step("Verify brand logo is displayed"):
             assert login_page.is_brand_logo_displayed(), "Brand logo is not displayed"
 
+        # Verify all login form fields in one go
+        with allure.step("Verify login form fields are displayed"):
+            login_page.assert_login_form_displayed()
+
         # Verify forgot password link exists
         with allure.step("Verify forgot password link is available"):
             login_page.click_forgot_password()
@@ -103,32 +108,56 @@ class TestLogin:
     @allure.story("Data Driven Login")
     @allure.severity(allure.severity_level.CRITICAL)  # Changed from HIGH to CRITICAL
     @allure.description("Test login with credentials from CSV file")
-    def test_login_with_csv_data(self, driver):
+    def test_login_with_csv_data(self, driver, credential_row):
         """
-        Test login using data from CSV file
+        Test login using one row of the CSV file (rows are parametrized at collection time)
 
         :param driver: WebDriver fixture
+        :param credential_row: Row of login_credentials.csv
         """
-        logger.info("Starting data driven login test")
+        username = credential_row["username"]
+        password = credential_row["password"]
+        expected_result = credential_row["expected_result"]
 
-        # Get credentials from CSV
-        credentials = DataReader.get_login_credentials()
+        logger.info(f"Starting data driven login test with username: {username}")
 
-        for cred in credentials:
-            login_page = LoginPage(driver)
-            login_page.open()
+        login_page = LoginPage(driver)
+        login_page.open()
 
-            username = cred["username"]
-            password = cred["password"]
-            expected_result = cred["expected_result"]
+        with allure.step(f"Login with username: {username}, expected result: {expected_result}"):
+            if expected_result == "success":
+                dashboard_page = login_page.login(username, password)
+                assert dashboard_page.is_dashboard_displayed(), "Dashboard page is not displayed after login"
+                dashboard_page.logout()
+            else:
+                login_page.login_with_invalid_credentials(username, password)
+                # We should have an error message, but won't check specific message in this test
 
-            with allure.step(f"Login with username: {username}, expected result: {expected_result}"):
-                if expected_result == "success":
-                    dashboard_page = login_page.login(username, password)
-                    assert dashboard_page.is_dashboard_displayed(), "Dashboard page is not displayed after login"
-                    dashboard_page.logout()
-                else:
-                    login_page.login_with_invalid_credentials(username, password)
-                    # We should have an error message, but won't check specific message in this test
+        logger.info("Data driven login test completed successfully")
 
-        logger.info("Data driven login test completed successfully")
\ No newline at end of file
+    @allure.story("API Provisioned User")
+    @allure.severity(allure.severity_level.NORMAL)
+    @allure.description("Test UI login with a user created and removed through the API")
+    def test_login_with_api_created_user(self, driver, api_client):
+        """
+        Test that a user created over HTTP can log in through the UI, and not after deletion
+
+        :param driver: WebDriver fixture
+        :param api_client: ApiClient fixture
+        """
+        username = f"auto_{uuid.uuid4().hex[:8]}"
+        password = f"Auto{uuid.uuid4().hex[:8]}1!"
+
+        with allure.step(f"Create user {username} through the API"):
+            user = api_client.create_user(username, password)
+
+        try:
+            with allure.step("Login through the UI with the new user"):
+                dashboard_page = LoginPage(driver).open().login(username, password)
+                assert dashboard_page.is_dashboard_displayed(), "Dashboard page is not displayed after login"
+        finally:
+            with allure.step("Delete the user through the API"):
+                api_client.delete_users([user["id"]])
+
+        with allure.step("Verify the deleted user can no longer log in"):
+            assert not api_client.check_login(username, password), "Deleted user can still log in"
@@ -0,0 +1,133 @@
+"""
+Step-level retries for page-object actions.
+
+A click or text input that fails with a transient error - the element went stale,
+another element intercepted the click, or it was not interactable yet - is retried
+on a freshly located element under a bounded policy (a few attempts with a short,
+doubling delay) instead of failing the whole test. Every retry is an Allure step,
+so flaky steps stay visible. The pytest plugin at the bottom of this module lists
+the tests that only passed thanks to retries in the session summary; whole-test
+reruns (pytest-rerunfailures, ``--reruns``) remain the fallback for anything else.
+"""
+import time
+
+import allure
+import pytest
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        StaleElementReferenceException)
+
+from utils.config import Config
+from utils.logger import logger
+
+
+# Errors worth retrying on a re-located element; anything else fails the step straight away
+TRANSIENT_ERRORS = (StaleElementReferenceException, ElementClickInterceptedException, ElementNotInteractableException)
+
+
+class ActionRetry:
+    """
+    Retry policy for page-object actions and the retries made during the current test
+    """
+
+    retries = Config.ACTION_RETRIES
+    delay = Config.ACTION_RETRY_DELAY
+
+    # Retries made during the current test: list of (action, attempt, error name)
+    history = []
+
+    @staticmethod
+    def run(page, name, locator, action):
+        """
+        Run an action, retrying it after transient errors
+
+        :param page: Page object performing the action
+        :param name: Name of the action, e.g. "click"
+        :param locator: Tuple containing locator strategy and value of the element acted on
+        :param action: Callable locating the element and interacting with it (called again for every retry)
+        :return: Value returned by the action
+        """
+        try:
+            return action()
+        except TRANSIENT_ERRORS as e:
+            error = e
+
+        # Only described once it fails, the first attempt is on the hot path of every test
+        description = f"{type(page).__name__}.{name} {locator}"
+        for attempt in range(1, ActionRetry.retries + 1):
+            error_name = type(error).__name__
+            ActionRetry.history.append((description, attempt, error_name))
+            logger.warning(f"{description} failed with {error_name}, retry {attempt}/{ActionRetry.retries}")
+            time.sleep(ActionRetry.delay * 2 ** (attempt - 1))
+            try:
+                with allure.step(f"Retry {attempt}/{ActionRetry.retries} of {description} after {error_name}"):
+                    return action()
+            except TRANSIENT_ERRORS as e:
+                error = e
+
+        raise error
+
+    @staticmethod
+    def reset():
+        """
+        Forget the retries of the previous test
+        """
+        ActionRetry.history = []
+
+
+def pytest_addoption(parser):
+    """
+    Add the option setting the number of action retries
+    """
+    parser.addoption("--action-retries", action="store", type=int, default=Config.ACTION_RETRIES,
+                     help="Retries of a page-object click or text input after a transient error (0 disables)")
+
+
+def pytest_configure(config):
+    """
+    Apply the retry count for the session
+    """
+    ActionRetry.retries = config.getoption("--action-retries")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    """
+    Start every test with an empty retry history
+    """
+    ActionRetry.reset()
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Record the retries of a test in its report, so they reach the xdist controller
+    """
+    outcome = yield
+    report = outcome.get_result()
+    if call.when == "call" and ActionRetry.history:
+        report.user_properties.append(("action_retries", list(ActionRetry.history)))
+
+
+def pytest_terminal_summary(terminalreporter):
+    """
+    List the tests whose page-object steps were retried
+    """
+    flaky = {}
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            retries = dict(getattr(report, "user_properties", ())).get("action_retries")
+            if retries and getattr(report, "when", None) == "call":
+                flaky[report.nodeid] = (report.outcome, retries)
+    if not flaky:
+        return
+
+    terminalreporter.section("Flaky page-object steps")
+    recovered = sum(1 for outcome, _ in flaky.values() if outcome == "passed")
+    terminalreporter.write_line(f"{len(flaky)} tests retried steps, {recovered} of them passed thanks to it")
+    for nodeid, (outcome, retries) in sorted(flaky.items()):
+        steps = {}
+        for description, _, error in retries:
+            steps[(description, error)] = steps.get((description, error), 0) + 1
+        terminalreporter.write_line(f"{nodeid} ({outcome}): " + "; ".join(
+            f"{description} x{count} ({error})" for (description, error), count in steps.items()))
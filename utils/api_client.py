@@ -0,0 +1,240 @@
+import html
+import re
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.config import Config
+from utils.logger import logger
+
+
+LOGIN_PATH = "/web/index.php/auth/login"
+VALIDATE_PATH = "/web/index.php/auth/validate"
+LOGOUT_PATH = "/web/index.php/auth/logout"
+DASHBOARD_PATH = "/web/index.php/dashboard/index"
+USERS_PATH = "/web/index.php/api/v2/admin/users"
+EMPLOYEES_PATH = "/web/index.php/api/v2/pim/employees"
+
+# OrangeHRM user role IDs
+USER_ROLES = {"Admin": 1, "ESS": 2}
+
+# The CSRF token is embedded in the login page, either as the Vue component's :token attribute
+# (the real application) or as a hidden form field
+TOKEN_PATTERNS = [
+    re.compile(r':token="&quot;([^&]+)&quot;"'),
+    re.compile(r'name="_token"\s+value="([^"]+)"'),
+]
+
+
+class ApiClient:
+    """
+    HTTP client for OrangeHRM used for browserless test setup and verification.
+
+    A single requests.Session keeps connections alive in a pool and retries
+    idempotent requests on connection errors and 5xx gateway responses. After
+    login() the session cookie can be handed to a browser with authenticate_driver().
+    """
+
+    def __init__(self, base_url=None, pool_size=None, retries=None, timeout=None):
+        """
+        Initialize the client and its connection pool
+
+        :param base_url: Application URL (defaults to Config.BASE_URL)
+        :param pool_size: Maximum kept-alive connections (defaults to Config.API_POOL_SIZE)
+        :param retries: Retries per request (defaults to Config.API_RETRIES)
+        :param timeout: Request timeout in seconds (defaults to Config.API_TIMEOUT)
+        """
+        self.base_url = (base_url or Config.BASE_URL).rstrip("/")
+        self.timeout = timeout if timeout is not None else Config.API_TIMEOUT
+        self.username = None
+
+        retry = Retry(
+            total=retries if retries is not None else Config.API_RETRIES,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "DELETE"}),
+        )
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size or Config.API_POOL_SIZE,
+                                   max_retries=retry)
+        self.session = self._new_session()
+
+    def login(self, username=None, password=None):
+        """
+        Authenticate the session the way the login form does
+
+        :param username: Username (defaults to Config.DEFAULT_USERNAME)
+        :param password: Password (defaults to Config.DEFAULT_PASSWORD)
+        :return: Boolean indicating if the login succeeded
+        """
+        username = username if username is not None else Config.DEFAULT_USERNAME
+        password = password if password is not None else Config.DEFAULT_PASSWORD
+
+        if self._submit_login(self.session, username, password):
+            self.username = username
+            logger.info(f"API session authenticated as {username}")
+            return True
+        return False
+
+    def check_login(self, username, password):
+        """
+        Check whether credentials are accepted, without touching this client's session
+
+        :param username: Username to check
+        :param password: Password to check
+        :return: Boolean indicating if the login succeeded
+        """
+        # A throwaway cookie jar on the shared connection pool (closing the session would close the pool)
+        return self._submit_login(self._new_session(), username, password)
+
+    def is_session_valid(self):
+        """
+        Check that the session is authenticated by opening the dashboard (which redirects to login otherwise)
+
+        :return: Boolean indicating if the session is still logged in
+        """
+        response = self.session.get(f"{self.base_url}{DASHBOARD_PATH}", allow_redirects=False, timeout=self.timeout)
+        return response.status_code == 200
+
+    def logout(self):
+        """
+        End the session the way the user menu's Logout link does
+        """
+        self.session.get(f"{self.base_url}{LOGOUT_PATH}", allow_redirects=False, timeout=self.timeout)
+        self.session.cookies.clear()
+        self.username = None
+
+    def list_users(self, **params):
+        """
+        List system users
+
+        :param params: Query parameters, e.g. username="Admin", limit=50
+        :return: List of user dictionaries
+        """
+        return self._request("GET", USERS_PATH, params=params)["data"]
+
+    def get_user(self, user_id):
+        """
+        Read a system user
+
+        :param user_id: User ID
+        :return: User dictionary
+        """
+        return self._request("GET", f"{USERS_PATH}/{user_id}")["data"]
+
+    def find_user(self, username):
+        """
+        Look up a system user by name
+
+        :param username: Username
+        :return: User dictionary, or None if there is no such user
+        """
+        return next((user for user in self.list_users(username=username) if user["userName"] == username), None)
+
+    def create_user(self, username, password, role="ESS", emp_number=None, enabled=True):
+        """
+        Create a system user
+
+        :param username: Username of the new user
+        :param password: Password of the new user
+        :param role: "Admin" or "ESS"
+        :param emp_number: Employee the user belongs to (defaults to the first employee)
+        :param enabled: Whether the user may log in
+        :return: User dictionary
+        """
+        if emp_number is None:
+            emp_number = self._request("GET", EMPLOYEES_PATH, params={"limit": 1})["data"][0]["empNumber"]
+
+        user = self._request("POST", USERS_PATH, json={
+            "username": username,
+            "password": password,
+            "status": enabled,
+            "userRoleId": USER_ROLES[role],
+            "empNumber": emp_number,
+        })["data"]
+        logger.info(f"Created user {username} ({role}) through the API")
+        return user
+
+    def delete_users(self, user_ids):
+        """
+        Delete system users
+
+        :param user_ids: List of user IDs
+        :return: List of deleted IDs
+        """
+        deleted = self._request("DELETE", USERS_PATH, json={"ids": list(user_ids)})["data"]
+        logger.info(f"Deleted users {deleted} through the API")
+        return deleted
+
+    def driver_cookies(self):
+        """
+        Session cookies in the format accepted by driver.add_cookie()
+
+        :return: List of cookie dictionaries
+        """
+        return [{"name": cookie.name, "value": cookie.value, "path": cookie.path or "/"}
+                for cookie in self.session.cookies]
+
+    def authenticate_driver(self, driver):
+        """
+        Log a browser in with this client's session cookies
+
+        :param driver: WebDriver instance
+        :return: DashboardPage object
+        """
+        from utils.session_cache import SessionCache
+        return SessionCache.restore(driver, {"cookies": self.driver_cookies(), "local_storage": {}})
+
+    def close(self):
+        """
+        Close pooled connections
+        """
+        self.session.close()
+
+    def _new_session(self):
+        """
+        Create a session using this client's connection pool
+
+        :return: requests.Session object
+        """
+        session = requests.Session()
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        return session
+
+    def _submit_login(self, session, username, password):
+        """
+        Post credentials with a fresh CSRF token
+
+        :param session: Session to authenticate
+        :param username: Username
+        :param password: Password
+        :return: Boolean indicating if the application redirected away from the login page
+        """
+        login_page = session.get(f"{self.base_url}{LOGIN_PATH}", timeout=self.timeout)
+        login_page.raise_for_status()
+
+        token = next((match.group(1) for match in (pattern.search(login_page.text) for pattern in TOKEN_PATTERNS)
+                      if match), None)
+        if token is None:
+            raise RuntimeError("No CSRF token found on the login page")
+
+        response = session.post(
+            f"{self.base_url}{VALIDATE_PATH}",
+            data={"_token": html.unescape(token), "username": username, "password": password},
+            allow_redirects=False,
+            timeout=self.timeout,
+        )
+        return response.status_code in (301, 302, 303) and LOGIN_PATH not in response.headers.get("Location", "")
+
+    def _request(self, method, path, **kwargs):
+        """
+        Send an authenticated API request
+
+        :param method: HTTP method
+        :param path: Path below the base URL
+        :return: Decoded JSON response
+        """
+        response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,215 @@
+import hashlib
+import io
+import os
+import queue
+import threading
+
+from utils.config import Config
+from utils.logger import logger
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class ArtifactPipeline:
+    """
+    Background writer for screenshots and other binary test artifacts.
+
+    The test thread only grabs the raw bytes and hands them over; hashing
+    decides whether the content was already stored (identical images are
+    written once), a per-run byte budget caps disk usage, and a daemon thread
+    optionally downscales images and writes them to disk. Call flush() or
+    shutdown() to wait for pending writes.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, directory=None, budget_bytes=None, max_width=None):
+        """
+        Initialize the pipeline and start its writer thread
+
+        :param directory: Directory artifacts are written to (defaults to Config.SCREENSHOT_DIR)
+        :param budget_bytes: Maximum bytes written by this process (defaults to Config.ARTIFACT_BUDGET_MB,
+                             shared out evenly between xdist workers)
+        :param max_width: Downscale images wider than this, 0 to keep them as is
+                          (defaults to Config.SCREENSHOT_MAX_WIDTH, needs Pillow)
+        """
+        self.directory = directory or Config.SCREENSHOT_DIR
+        if budget_bytes is None:
+            # The budget is for the whole run, every xdist worker has its own pipeline
+            workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+            budget_bytes = Config.ARTIFACT_BUDGET_MB * 1024 * 1024 // workers
+        self.budget_bytes = budget_bytes
+        self.max_width = max_width if max_width is not None else Config.SCREENSHOT_MAX_WIDTH
+        if self.max_width and Image is None:
+            logger.warning("Pillow is not installed, screenshots are stored at full resolution")
+
+        self.bytes_reserved = 0
+        self.bytes_written = 0
+        self.deduplicated = 0
+        self.dropped = 0
+
+        self._paths_by_digest = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def instance(cls):
+        """
+        Get the pipeline shared by the whole process, creating it on first use
+
+        :return: ArtifactPipeline object
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Flush and stop the shared pipeline, if it was ever used
+        """
+        with cls._instance_lock:
+            pipeline, cls._instance = cls._instance, None
+        if pipeline:
+            pipeline.close()
+
+    def submit(self, data, name, extension="png"):
+        """
+        Queue an artifact for writing
+
+        :param data: Raw artifact bytes (e.g. driver.get_screenshot_as_png())
+        :param name: Base name of the file
+        :param extension: File extension
+        :return: Tuple (path, is_new): the path the content is (or will be) stored at and
+                 whether this submission stored new content; path is None if the budget is exhausted
+        """
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            existing = self._paths_by_digest.get(digest)
+            if existing:
+                self.deduplicated += 1
+                return existing, False
+
+            if self.bytes_reserved + len(data) > self.budget_bytes:
+                self.dropped += 1
+                logger.warning(f"Artifact budget of {self.budget_bytes} bytes exhausted, dropping {name}")
+                return None, False
+
+            path = os.path.join(self.directory, f"{name}_{digest[:12]}.{extension}")
+            self._paths_by_digest[digest] = path
+            self._pending[path] = threading.Event()
+            self.bytes_reserved += len(data)
+
+        self._queue.put((path, data, digest))
+        return path, True
+
+    def wait(self, path, timeout=None):
+        """
+        Block until one artifact is written
+
+        :param path: Path returned by submit()
+        :param timeout: Maximum seconds to wait, None to wait as long as it takes
+        :return: True if the file exists
+        """
+        with self._lock:
+            written = self._pending.get(path)
+        if written:
+            written.wait(timeout)
+        return os.path.exists(path)
+
+    def flush(self):
+        """
+        Block until every queued artifact is written
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Write remaining artifacts and stop the writer thread
+        """
+        self._queue.put(None)
+        self._thread.join()
+        logger.info(f"Artifacts: {self.bytes_written} bytes written, {self.deduplicated} duplicates skipped, "
+                    f"{self.dropped} dropped over budget")
+
+    def _run(self):
+        """
+        Writer thread loop
+        """
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item[:2])
+            except Exception as e:
+                logger.error(f"Failed to write artifact {item[0]}: {e}")
+                self._forget(*item)
+            finally:
+                if item is not None:
+                    with self._lock:
+                        self._pending.pop(item[0]).set()
+                self._queue.task_done()
+
+    def _forget(self, path, data, digest):
+        """
+        Undo the bookkeeping of an artifact that could not be written, so identical content is stored again later
+
+        :param path: Destination path
+        :param data: Raw bytes
+        :param digest: SHA-256 of the raw bytes
+        """
+        with self._lock:
+            if self._paths_by_digest.get(digest) == path:
+                del self._paths_by_digest[digest]
+            self.bytes_reserved -= len(data)
+        try:
+            # Do not leave a truncated file behind for wait() to find
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _write(self, path, data):
+        """
+        Optionally downscale an image and write it to disk
+
+        :param path: Destination path
+        :param data: Raw bytes
+        """
+        reserved = len(data)
+        if self.max_width and Image is not None and path.endswith(".png"):
+            data = self._downscale(data)
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(data)
+
+        with self._lock:
+            self.bytes_written += len(data)
+            # Recompression may have made the file smaller than reserved, give the difference back
+            self.bytes_reserved -= reserved - len(data)
+
+    def _downscale(self, data):
+        """
+        Shrink a PNG to max_width and recompress it
+
+        :param data: PNG bytes
+        :return: PNG bytes
+        """
+        image = Image.open(io.BytesIO(data))
+        if image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height))
+
+        output = io.BytesIO()
+        image.save(output, format="PNG", optimize=True)
+        return output.getvalue()
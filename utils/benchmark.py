@@ -0,0 +1,565 @@
+"""
+Micro-benchmarks for the framework's own hot paths.
+
+Each benchmark times one framework operation - BasePage helpers, DataReader
+reads, logger setup, driver setup/teardown, screenshot capture - against a
+FakeDriver that answers WebDriver commands in-process and loads pages from the
+local OrangeHRM stand-in. Every benchmark is repeated for a number of rounds and
+the fastest round counts, as with timeit.
+
+Results are compared with the baselines committed in benchmarks/baseline.json.
+A pure-Python calibration loop is timed right before every benchmark and times
+are normalized by it, so baselines recorded on one machine remain meaningful on
+another and a machine that is busy for a while slows both alike. A benchmark
+slower than its baseline by more than the threshold is re-run; if it is still
+slower after the retries, the run fails (exit code 1).
+
+    python -m utils.benchmark                      # compare with the baselines
+    python -m utils.benchmark --filter data_reader --threshold 0.3
+    python -m utils.benchmark --update-baseline    # after an intentional change
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import urllib.request
+from types import SimpleNamespace
+
+from pages.base_page import DOCUMENT_STATE_SCRIPT, SNAPSHOT_SCRIPT
+from pages.login_page import LoginPage
+from utils.artifacts import ArtifactPipeline
+from utils.config import Config
+from utils.data_reader import DataReader
+from utils.driver_factory import DriverFactory
+from utils.driver_pool import DriverPool
+from utils.local_server import LocalOrangeHRMServer
+from utils.logger import RUN_ID, Logger
+from utils.performance import PERFORMANCE_SCRIPT, PerformanceMonitor
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    Register a benchmark
+
+    The decorated function receives the environment dictionary (base_url, tmp_dir)
+    and yields the operation to time; code after the yield is the teardown.
+
+    :param name: Benchmark name, e.g. "base_page.find_element"
+    :return: Decorator
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class FakeElement:
+    """
+    Web element of a FakeDriver
+    """
+
+    text = "Dashboard"
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click(self):
+        self.driver.execute("clickElement")
+
+    def clear(self):
+        self.driver.execute("clearElement")
+
+    def send_keys(self, *value):
+        self.driver.execute("sendKeysToElement", {"text": "".join(value)})
+
+    def is_displayed(self):
+        return self.driver.execute("isElementDisplayed")["value"]
+
+    def get_attribute(self, name):
+        return None
+
+
+class FakeDriver:
+    """
+    WebDriver stand-in answering commands in-process, so only framework code is timed
+
+    Like Selenium's WebDriver every call goes through execute(), which CommandRecorder
+    instruments. get() fetches the page from a real HTTP server (the local stand-in).
+    """
+
+    def __init__(self, screenshot=b""):
+        """
+        Initialize a driver showing a blank page
+
+        :param screenshot: Bytes returned by get_screenshot_as_png (made unique per call)
+        """
+        self.session_id = f"fake-{id(self)}"
+        self.current_url = "about:blank"
+        self.page_source = ""
+        self.window_handles = ["main"]
+        self.switch_to = SimpleNamespace(window=lambda handle: None)
+        self.screenshot = screenshot
+        self.screenshots = 0
+        self.time_origin = time.time() * 1000
+
+    def execute(self, driver_command, params=None):
+        params = params or {}
+        if driver_command == "get":
+            self.page_source, self.current_url = "", params["url"]
+            if params["url"].startswith("http"):
+                with urllib.request.urlopen(params["url"]) as response:
+                    self.page_source = response.read().decode()
+                    self.current_url = response.geturl()
+            self.time_origin = time.time() * 1000
+        elif driver_command == "findElement":
+            return {"value": FakeElement(self)}
+        elif driver_command == "findElements":
+            return {"value": [FakeElement(self)]}
+        elif driver_command == "executeScript":
+            return {"value": self._script(params["script"], params["args"])}
+        elif driver_command == "isElementDisplayed":
+            return {"value": True}
+        elif driver_command == "screenshot":
+            self.screenshots += 1
+            return {"value": self.screenshot + self.screenshots.to_bytes(8, "big")}
+        return {"value": None}
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+
+    def find_element(self, by, value):
+        return self.execute("findElement", {"using": by, "value": value})["value"]
+
+    def find_elements(self, by, value):
+        return self.execute("findElements", {"using": by, "value": value})["value"]
+
+    def execute_script(self, script, *args):
+        return self.execute("executeScript", {"script": script, "args": list(args)})["value"]
+
+    def get_screenshot_as_png(self):
+        return self.execute("screenshot")["value"]
+
+    def implicitly_wait(self, seconds):
+        self.execute("setTimeouts", {"implicit": seconds * 1000})
+
+    def maximize_window(self):
+        self.execute("windowMaximize")
+
+    def delete_all_cookies(self):
+        self.execute("deleteAllCookies")
+
+    def close(self):
+        self.execute("closeWindow")
+
+    def quit(self):
+        self.execute("quit")
+
+    def _script(self, script, args):
+        """
+        Answer the framework's scripts with a loaded, idle page whose elements are all visible
+        """
+        if script == SNAPSHOT_SCRIPT:
+            locators, attribute_names = args
+            return [{"present": True, "visible": True, "text": "Dashboard", "value": "",
+                     "attributes": {name: None for name in attribute_names}} for _ in locators]
+        if script == DOCUMENT_STATE_SCRIPT:
+            return {"time_origin": self.time_origin, "parsed": True, "network_idle": True}
+        if script == PERFORMANCE_SCRIPT:
+            return {"ttfb": 5.0, "dom_content_loaded": 20.0, "load": 25.0, "first_paint": 15.0,
+                    "first_contentful_paint": 15.0, "resource_count": 3, "transfer_size": len(self.page_source),
+                    "slowest_resources": [], "time_origin": self.time_origin, "url": self.current_url}
+        if "timeOrigin" in script:
+            return self.time_origin
+        return None
+
+
+class FakeSpares:
+    """
+    WarmSpares stand-in handing out FakeDrivers, for timing DriverPool without launching browsers
+    """
+
+    @staticmethod
+    def take(browser):
+        return DriverFactory.prepare(FakeDriver())
+
+
+@benchmark("calibration")
+def calibration(env):
+    def workload():
+        data = {str(i): i * i for i in range(200)}
+        return sum(value for key, value in sorted(data.items()) if key.endswith("1"))
+    yield workload
+
+
+@benchmark("base_page.find_element")
+def find_element(env):
+    page = LoginPage(DriverFactory.prepare(FakeDriver()))
+    yield lambda: page.find_element(LoginPage.USERNAME_INPUT)
+
+
+@benchmark("base_page.input_text")
+def input_text(env):
+    page = LoginPage(DriverFactory.prepare(FakeDriver()))
+    yield lambda: page.input_text(LoginPage.USERNAME_INPUT, "Admin")
+
+
+@benchmark("base_page.snapshot")
+def snapshot(env):
+    page = LoginPage(DriverFactory.prepare(FakeDriver()))
+    locators = [LoginPage.USERNAME_INPUT, LoginPage.PASSWORD_INPUT, LoginPage.LOGIN_BUTTON,
+                LoginPage.FORGOT_PASSWORD_LINK, LoginPage.BRAND_LOGO]
+    yield lambda: page.snapshot(locators, ("disabled",))
+
+
+@benchmark("base_page.wait_for_state")
+def wait_for_state(env):
+    page = LoginPage(DriverFactory.prepare(FakeDriver()))
+    yield lambda: page.wait_for_state(LoginPage.USERNAME_INPUT)
+
+
+@benchmark("page.login_page_open")
+def login_page_open(env):
+    page = LoginPage(DriverFactory.prepare(FakeDriver()))
+    yield page.open
+    PerformanceMonitor.reset()
+
+
+@benchmark("data_reader.read_csv")
+def read_csv(env):
+    path = DataReader.get_test_data_path("login_credentials.csv")
+    yield lambda: DataReader.read_csv(path)
+
+
+@benchmark("data_reader.read_csv_uncached")
+def read_csv_uncached(env):
+    path = DataReader.get_test_data_path("login_credentials.csv")
+
+    def read():
+        DataReader.clear_cache()
+        return DataReader.read_csv(path)
+    yield read
+
+
+@benchmark("data_reader.read_json")
+def read_json(env):
+    path = DataReader.get_test_data_path("users.json")
+    yield lambda: DataReader.read_json(path)
+
+
+@benchmark("data_reader.read_json_uncached")
+def read_json_uncached(env):
+    path = DataReader.get_test_data_path("users.json")
+
+    def read():
+        DataReader.clear_cache()
+        return DataReader.read_json(path)
+    yield read
+
+
+@benchmark("logger.setup_teardown")
+def logger_setup(env):
+    log_dir, Config.LOG_DIR = Config.LOG_DIR, env["tmp_dir"]
+    counter = iter(range(sys.maxsize))
+
+    def setup_teardown():
+        benchmark_logger = Logger.get_logger(f"benchmark.{next(counter)}")
+        listener = Logger._listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        benchmark_logger.handlers.clear()
+    yield setup_teardown
+    Config.LOG_DIR = log_dir
+
+
+@benchmark("driver.function_scope")
+def driver_function_scope(env):
+
+    def setup_teardown():
+        DriverFactory.prepare(FakeDriver()).quit()
+    yield setup_teardown
+
+
+@benchmark("driver.worker_scope")
+def driver_worker_scope(env):
+    pool = DriverPool(spares=FakeSpares())
+
+    def acquire_release():
+        pool.release(pool.acquire("chrome"))
+    yield acquire_release
+    pool.close()
+
+
+@benchmark("screenshot.capture")
+def screenshot_capture(env):
+
+    screenshot_dir, Config.SCREENSHOT_DIR = Config.SCREENSHOT_DIR, env["tmp_dir"]
+    with urllib.request.urlopen(f"{env['base_url']}/web/images/ohrm_branding.png") as response:
+        png = response.read()
+    page = LoginPage(DriverFactory.prepare(FakeDriver(screenshot=png * 50)))
+    yield lambda: page.take_screenshot("benchmark")
+    ArtifactPipeline.shutdown()
+    Config.SCREENSHOT_DIR = screenshot_dir
+
+
+def measure(operation, rounds=None, min_round=None):
+    """
+    Time an operation timeit-style
+
+    :param operation: Callable without arguments
+    :param rounds: Number of timed rounds (defaults to Config.BENCHMARK_ROUNDS)
+    :param min_round: Minimum seconds per round; calls per round are scaled up to reach it
+                      (defaults to Config.BENCHMARK_MIN_ROUND)
+    :return: Dictionary with seconds per call of the fastest round and the median round, and calls per round
+    """
+    rounds = rounds or Config.BENCHMARK_ROUNDS
+    min_round = min_round or Config.BENCHMARK_MIN_ROUND
+
+    def timed(number):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        return time.perf_counter() - start
+
+    operation()
+    number = 1
+    elapsed = timed(number)
+    while elapsed < min_round:
+        number = max(number * 2, int(number * min_round / max(elapsed, 1e-9) * 1.1))
+        elapsed = timed(number)
+
+    per_call = [elapsed / number] + [timed(number) / number for _ in range(rounds - 1)]
+    return {"seconds": min(per_call), "median": statistics.median(per_call), "number": number}
+
+
+def run_benchmarks(names, base_url):
+    """
+    Run benchmarks, each right after a calibration loop
+
+    :param names: Benchmark names
+    :param base_url: URL of the local stand-in server
+    :return: Dictionary {name: measure() result with the seconds of its "calibration" loop}
+    """
+    results = {}
+    tmp_dir = tempfile.mkdtemp(prefix="benchmark_")
+    env = {"base_url": base_url, "tmp_dir": tmp_dir}
+
+    # Page objects build their URLs from Config.BASE_URL; log output would mostly time the console
+    base_url_before, Config.BASE_URL = Config.BASE_URL, base_url
+    logging.disable(logging.INFO)
+    try:
+        for name in ["calibration"] + [name for name in names if name != "calibration"]:
+            setup = BENCHMARKS[name](env)
+            operation = next(setup)
+            try:
+                calibration_seconds = _calibrate(env)
+                results[name] = measure(operation)
+                results[name]["calibration"] = calibration_seconds
+            finally:
+                next(setup, None)
+    finally:
+        logging.disable(logging.NOTSET)
+        Config.BASE_URL = base_url_before
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return results
+
+
+def _calibrate(env):
+    """
+    Time the calibration loop, so a benchmark can be compared with the machine's speed at that moment
+
+    :param env: Benchmark environment
+    :return: Seconds per call of the calibration loop, measured now
+    """
+    setup = BENCHMARKS["calibration"](env)
+    try:
+        return measure(next(setup), rounds=3)["seconds"]
+    finally:
+        next(setup, None)
+
+
+def _relative(result):
+    """
+    Express a benchmark time independently of the machine's speed
+
+    :param result: One entry of run_benchmarks()
+    :return: Time of the benchmark in calibration loops
+    """
+    return result["seconds"] / result["calibration"]
+
+
+def keep_fastest(results, retry):
+    """
+    Merge a repeated run into earlier results, keeping the fastest time of every benchmark
+
+    Interference from other processes only ever makes code slower, so the fastest of several
+    runs (relative to its calibration loop) is the best estimate of its real cost.
+
+    :param results: Dictionary returned by run_benchmarks(), updated in place
+    :param retry: Dictionary returned by a later run_benchmarks()
+    :return: results
+    """
+    for name, result in retry.items():
+        if name not in results or _relative(result) < _relative(results[name]):
+            results[name] = result
+    return results
+
+
+def confirm_regressions(results, baseline, base_url, threshold=None, retries=None):
+    """
+    Re-run the benchmarks that look regressed, so a noisy moment does not fail the gate
+
+    :param results: Dictionary returned by run_benchmarks(), updated with faster retries
+    :param baseline: Baseline dictionary
+    :param base_url: URL of the local stand-in server
+    :param threshold: Allowed slowdown (defaults to Config.BENCHMARK_THRESHOLD)
+    :param retries: Re-runs at most (defaults to Config.BENCHMARK_RETRIES)
+    :return: Rows returned by compare() for the final results
+    """
+    retries = Config.BENCHMARK_RETRIES if retries is None else retries
+    rows = compare(results, baseline, threshold)
+    for _ in range(retries):
+        regressed = [row["name"] for row in rows if row["status"] == "regressed"]
+        if not regressed:
+            break
+        keep_fastest(results, run_benchmarks(regressed, base_url))
+        rows = compare(results, baseline, threshold)
+    return rows
+
+
+def compare(results, baseline, threshold=None):
+    """
+    Compare results with baselines, both normalized by the calibration loop timed with them
+
+    :param results: Dictionary returned by run_benchmarks()
+    :param baseline: Dictionary {"calibration": seconds, "benchmarks": {name: seconds}}
+    :param threshold: Allowed slowdown, e.g. 0.5 for 50% (defaults to Config.BENCHMARK_THRESHOLD)
+    :return: List of dictionaries (name, seconds, expected, change, status), status being
+             "ok", "faster", "regressed" or "new"
+    """
+    threshold = Config.BENCHMARK_THRESHOLD if threshold is None else threshold
+
+    rows = []
+    for name, result in results.items():
+        if name == "calibration":
+            continue
+        recorded = baseline.get("benchmarks", {}).get(name)
+        if recorded is None:
+            rows.append({"name": name, "seconds": result["seconds"], "expected": None, "change": None,
+                         "status": "new"})
+            continue
+
+        expected = recorded * result["calibration"] / baseline["calibration"]
+        change = result["seconds"] / expected - 1
+        status = "regressed" if change > threshold else "faster" if change < -threshold else "ok"
+        rows.append({"name": name, "seconds": result["seconds"], "expected": expected, "change": change,
+                     "status": status})
+    return rows
+
+
+def format_rows(rows):
+    """
+    Render comparison rows as a fixed-width table
+
+    :param rows: List returned by compare()
+    :return: Multi-line string
+    """
+    lines = [f"{'benchmark':<34} {'us/call':>10} {'baseline':>10} {'change':>8}  status"]
+    for row in rows:
+        expected = f"{row['expected'] * 1e6:>10.1f}" if row["expected"] is not None else f"{'-':>10}"
+        change = f"{row['change']:>+8.0%}" if row["change"] is not None else f"{'-':>8}"
+        lines.append(f"{row['name']:<34} {row['seconds'] * 1e6:>10.1f} {expected} {change}  {row['status']}")
+    return "\n".join(lines)
+
+
+def baseline_path():
+    """
+    Locate the baseline the benchmarks are compared with
+
+    :return: Absolute path of the committed baseline file
+    """
+    return os.path.join(ROOT_DIR, Config.BENCHMARK_BASELINE)
+
+
+def load_baseline():
+    """
+    Read the committed baseline
+
+    :return: Baseline dictionary, empty if none was recorded yet
+    """
+    try:
+        with open(baseline_path(), 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results, names):
+    """
+    Store results as the new baselines, keeping the baselines of benchmarks that were not run
+
+    :param results: Dictionary returned by run_benchmarks()
+    :param names: Benchmarks that were run
+    """
+    baseline = load_baseline()
+    # Keep all baselines on the scale of one calibration time
+    baseline.setdefault("calibration", results["calibration"]["calibration"])
+
+    benchmarks = baseline.setdefault("benchmarks", {})
+    for name in names:
+        if name != "calibration":
+            benchmarks[name] = _relative(results[name]) * baseline["calibration"]
+    baseline["benchmarks"] = dict(sorted(benchmarks.items()))
+    baseline["recorded_with"] = f"Python {platform.python_version()} on {platform.system()} {platform.machine()}"
+
+    os.makedirs(os.path.dirname(baseline_path()), exist_ok=True)
+    with open(baseline_path(), 'w') as file:
+        json.dump(baseline, file, indent=2)
+        file.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the framework's hot paths and compare them with baselines")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--threshold", type=float, default=Config.BENCHMARK_THRESHOLD,
+                        help="Allowed slowdown before a benchmark fails, e.g. 0.5 for 50%%")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"Store the results as the new baselines in {Config.BENCHMARK_BASELINE}")
+    args = parser.parse_args()
+
+    selected = [name for name in BENCHMARKS if args.filter in name]
+    server = LocalOrangeHRMServer().start()
+    try:
+        benchmark_results = run_benchmarks(selected, server.url)
+        if args.update_baseline:
+            # Baselines are the fastest of several runs, like the retries they are compared with
+            for _ in range(Config.BENCHMARK_RETRIES):
+                keep_fastest(benchmark_results, run_benchmarks(selected, server.url))
+            save_baseline(benchmark_results, selected)
+            print(f"Baselines for {len(selected)} benchmarks written to {Config.BENCHMARK_BASELINE}")
+        comparison = confirm_regressions(benchmark_results, load_baseline(), server.url, args.threshold)
+    finally:
+        server.stop()
+
+    print(format_rows(comparison))
+
+    os.makedirs(Config.PERF_REPORT_DIR, exist_ok=True)
+    report_path = os.path.join(Config.PERF_REPORT_DIR, f"benchmarks_{RUN_ID}.json")
+    with open(report_path, 'w') as file:
+        json.dump({"results": benchmark_results, "comparison": comparison}, file, indent=2)
+
+    regressed = [row["name"] for row in comparison if row["status"] == "regressed"]
+    if regressed:
+        print(f"\n{len(regressed)} benchmarks regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+        sys.exit(1)
@@ -0,0 +1,350 @@
+"""
+Browser resource watchdog.
+
+Every browser handed to a test by the ``driver`` fixture is tracked: after each
+test the watchdog samples the resident memory and CPU time of the browser's
+process tree (driver, browser and renderer processes) and counts the tests it
+served. When a reused browser crosses one of the limits it is recycled - quit
+and replaced by the pool - between tests, never during one.
+
+The pytest plugin at the bottom of this module ships each worker's records to
+the xdist controller, prints recycle events and the memory curve of every
+browser in the session summary, and writes the full samples to
+reports/performance so workers per runner can be sized from data.
+
+RSS and CPU need psutil (in requirements.txt); without it only the test count
+and age limits apply, which is logged and repeated in the session summary.
+"""
+import json
+import os
+import time
+
+import pytest
+
+from utils.config import Config
+from utils.driver_pool import browser_processes
+from utils.logger import RUN_ID, WORKER_ID, logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# Points of a memory curve shown per browser in the terminal summary (the JSON report has every sample)
+CURVE_POINTS = 20
+
+
+class BrowserWatchdog:
+    """
+    Tracks the resources of the browsers of this process and decides when one must be recycled
+    """
+
+    _instance = None
+
+    def __init__(self, max_rss_mb=None, max_cpu_percent=None, max_tests=None, max_age=None):
+        """
+        Initialize the watchdog
+
+        :param max_rss_mb: Resident memory of a browser's process tree (defaults to Config.WATCHDOG_MAX_RSS_MB)
+        :param max_cpu_percent: Average CPU of a browser during its last test, in % of one core
+                                (defaults to Config.WATCHDOG_MAX_CPU_PERCENT)
+        :param max_tests: Tests served by one browser (defaults to Config.WATCHDOG_MAX_TESTS)
+        :param max_age: Seconds since the browser was handed to its first test (defaults to Config.WATCHDOG_MAX_AGE)
+        """
+        self.max_rss_mb = Config.WATCHDOG_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.max_cpu_percent = Config.WATCHDOG_MAX_CPU_PERCENT if max_cpu_percent is None else max_cpu_percent
+        self.max_tests = Config.WATCHDOG_MAX_TESTS if max_tests is None else max_tests
+        self.max_age = Config.WATCHDOG_MAX_AGE if max_age is None else max_age
+        self.started = time.monotonic()
+        self.peak_total_rss_mb = 0.0
+        self.records = []
+        self._live = {}
+        self._numbers = {}
+
+        if psutil is None and (self.max_rss_mb or self.max_cpu_percent):
+            logger.warning("psutil is not installed: the browser watchdog cannot enforce WATCHDOG_MAX_RSS_MB / "
+                           "WATCHDOG_MAX_CPU_PERCENT and only checks test counts and age "
+                           "(pip install -r requirements.txt)")
+
+    @staticmethod
+    def instance():
+        """
+        Get the watchdog of this process, creating it on first use
+
+        :return: The watchdog of this process
+        """
+        if BrowserWatchdog._instance is None:
+            BrowserWatchdog._instance = BrowserWatchdog()
+        return BrowserWatchdog._instance
+
+    def start(self, driver, browser):
+        """
+        Start tracking a browser (does nothing if it is tracked already)
+
+        :param driver: WebDriver instance
+        :param browser: Browser name
+        """
+        if id(driver) in self._live:
+            return
+        browser = browser.lower()
+        self._numbers[browser] = self._numbers.get(browser, 0) + 1
+        now = time.monotonic()
+        self._live[id(driver)] = {
+            "worker": WORKER_ID,
+            "browser": browser,
+            "number": self._numbers[browser],
+            "tests": 0,
+            "samples": [],
+            "recycled": None,
+            "_started": now,
+            "_cpu": (self._cpu_seconds(driver), now),
+        }
+
+    def after_test(self, driver):
+        """
+        Sample a browser after a test and check it against the limits
+
+        :param driver: WebDriver instance
+        :return: Why the browser should be recycled, or None if it may serve another test
+        """
+        record = self._live.get(id(driver))
+        if record is None:
+            return None
+
+        now = time.monotonic()
+        record["tests"] += 1
+        rss_mb = self._rss_mb(driver)
+        cpu_seconds = self._cpu_seconds(driver)
+        previous_cpu, previous_at = record["_cpu"]
+        cpu_percent = None
+        if cpu_seconds is not None and previous_cpu is not None and now > previous_at:
+            # Renderers that exited take their CPU time with them, so the total can shrink
+            cpu_percent = max(cpu_seconds - previous_cpu, 0.0) / (now - previous_at) * 100
+        record["_cpu"] = (cpu_seconds, now)
+
+        record["samples"].append({
+            "elapsed": round(now - self.started, 3),
+            "tests": record["tests"],
+            "rss_mb": None if rss_mb is None else round(rss_mb, 1),
+            "cpu_percent": None if cpu_percent is None else round(cpu_percent, 1),
+        })
+        if rss_mb is not None:
+            total = sum(r["samples"][-1]["rss_mb"] or 0 for r in self._live.values() if r["samples"])
+            self.peak_total_rss_mb = max(self.peak_total_rss_mb, total)
+
+        age = now - record["_started"]
+        if self.max_rss_mb and rss_mb is not None and rss_mb > self.max_rss_mb:
+            return f"memory {rss_mb:.0f} MB > {self.max_rss_mb} MB"
+        if self.max_cpu_percent and cpu_percent is not None and cpu_percent > self.max_cpu_percent:
+            return f"CPU {cpu_percent:.0f}% > {self.max_cpu_percent}%"
+        if self.max_tests and record["tests"] >= self.max_tests:
+            return f"served {record['tests']} tests"
+        if self.max_age and age > self.max_age:
+            return f"age {age:.0f}s > {self.max_age}s"
+        return None
+
+    def stop(self, driver, reason=None):
+        """
+        Stop tracking a browser that is being quit
+
+        :param driver: WebDriver instance
+        :param reason: Why it is recycled, or None if it simply reached the end of its use
+        """
+        record = self._live.pop(id(driver), None)
+        if record is None:
+            return
+        record["recycled"] = reason
+        if reason:
+            logger.info(f"Recycling {record['browser']} browser #{record['number']} after "
+                        f"{record['tests']} tests: {reason}")
+        self.records.append(self._public(record))
+
+    def close(self):
+        """
+        Stop tracking every browser still live (e.g. quit with the pool at the end of the session)
+        """
+        self.records.extend(self._public(record) for record in self._live.values())
+        self._live.clear()
+
+    def as_dict(self):
+        """
+        Serialize the records so they can be shipped from xdist workers
+
+        :return: Dictionary with the browser records and the peak memory of all browsers at once
+        """
+        return {"records": self.records, "peak_total_rss_mb": {WORKER_ID: round(self.peak_total_rss_mb, 1)}}
+
+    @staticmethod
+    def _public(record):
+        """
+        Strip the bookkeeping entries (keys starting with "_") from a browser record
+
+        :param record: Record of a tracked browser
+        :return: The record without its bookkeeping entries
+        """
+        return {key: value for key, value in record.items() if not key.startswith("_")}
+
+    @staticmethod
+    def _rss_mb(driver):
+        """
+        Measure the resident memory of a browser's process tree
+
+        :param driver: WebDriver instance
+        :return: Resident memory of the browser's process tree in MB, or None if it cannot be measured
+        """
+        processes = browser_processes(driver)
+        if not processes:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except Exception:
+                # Renderers come and go between listing and reading them
+                pass
+        return total / 1024 / 1024
+
+    @staticmethod
+    def _cpu_seconds(driver):
+        """
+        Add up the CPU time used so far by a browser's process tree
+
+        :param driver: WebDriver instance
+        :return: User and system CPU seconds used by the browser's live processes, or None
+        """
+        processes = browser_processes(driver)
+        if not processes:
+            return None
+        total = 0.0
+        for process in processes:
+            try:
+                times = process.cpu_times()
+                total += times.user + times.system
+            except Exception:
+                pass
+        return total
+
+
+def summary_lines(data):
+    """
+    Build the terminal summary from merged watchdog data
+
+    :param data: Dictionary {"records": [...], "peak_total_rss_mb": {worker: MB}}
+    :return: List of strings
+    """
+    records = data["records"]
+    recycled = [record for record in records if record["recycled"]]
+    per_browser = {}
+    for record in records:
+        per_browser[record["browser"]] = per_browser.get(record["browser"], 0) + 1
+
+    lines = [
+        f"Browsers tracked: {len(records)} ("
+        + ", ".join(f"{browser} {count}" for browser, count in sorted(per_browser.items()))
+        + f"), {sum(record['tests'] for record in records)} tests served, {len(recycled)} recycled",
+    ]
+    for record in recycled:
+        lines.append(f"Recycled {record['worker']} {record['browser']} #{record['number']} after "
+                     f"{record['tests']} tests: {record['recycled']}")
+
+    peaks = [sample["rss_mb"] for record in records for sample in record["samples"] if sample["rss_mb"] is not None]
+    if not peaks:
+        if psutil is None:
+            lines.append("Memory and CPU were not measured and their limits were not enforced: psutil is not "
+                         "installed (pip install -r requirements.txt)")
+        else:
+            lines.append("Memory was not measured (the browsers are remote)")
+        return lines
+
+    worker_peak = max(data["peak_total_rss_mb"].values())
+    lines.append(f"Peak memory: {max(peaks):.0f} MB for one browser, {worker_peak:.0f} MB for the browsers "
+                 f"of one worker")
+    if psutil is not None and worker_peak:
+        total_mb = psutil.virtual_memory().total / 1024 / 1024
+        lines.append(f"This machine has {total_mb:.0f} MB: about {int(total_mb // worker_peak)} workers "
+                     f"fit at that peak")
+
+    lines.append("Memory curve (MB after each test):")
+    for record in records:
+        curve = [sample["rss_mb"] for sample in record["samples"] if sample["rss_mb"] is not None]
+        if not curve:
+            continue
+        if len(curve) > CURVE_POINTS:
+            step = (len(curve) - 1) / (CURVE_POINTS - 1)
+            curve = [curve[round(index * step)] for index in range(CURVE_POINTS)]
+        suffix = f" [recycled: {record['recycled']}]" if record["recycled"] else ""
+        lines.append(f"  {record['worker']} {record['browser']} #{record['number']}: "
+                     + " ".join(f"{value:.0f}" for value in curve) + suffix)
+    return lines
+
+
+def pytest_configure(config):
+    """
+    Register the plugin object collecting the watchdog records
+    """
+    config.pluginmanager.register(WatchdogReport(config), "browser_watchdog")
+
+
+class WatchdogReport:
+    """
+    Plugin object collecting the watchdog records of all workers into the session summary
+    """
+
+    def __init__(self, config):
+        """
+        Initialize an empty report
+
+        :param config: pytest config
+        """
+        self.config = config
+        self.data = {"records": [], "peak_total_rss_mb": {}}
+
+    def pytest_sessionfinish(self, session):
+        """
+        Ship this process's records to the xdist controller
+        """
+        watchdog = BrowserWatchdog._instance
+        if watchdog is None:
+            return
+        watchdog.close()
+        if hasattr(self.config, "workeroutput"):
+            self.config.workeroutput["browser_watchdog"] = watchdog.as_dict()
+        else:
+            self._merge(watchdog.as_dict())
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        """
+        Collect the records sent back by an xdist worker
+        """
+        data = getattr(node, "workeroutput", {}).get("browser_watchdog")
+        if data:
+            self._merge(data)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """
+        Write the JSON report and print recycle events and memory curves
+        """
+        if not self.data["records"]:
+            return
+
+        os.makedirs(Config.PERF_REPORT_DIR, exist_ok=True)
+        path = os.path.join(Config.PERF_REPORT_DIR, f"browser_watchdog_{RUN_ID}.json")
+        with open(path, 'w') as file:
+            json.dump(self.data, file, indent=2)
+
+        terminalreporter.section("Browser resource watchdog")
+        for line in summary_lines(self.data):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Samples written to {path}")
+
+    def _merge(self, data):
+        """
+        Add the records of one process (this one or an xdist worker) to the report
+
+        :param data: Dictionary produced by BrowserWatchdog.as_dict()
+        """
+        self.data["records"].extend(data["records"])
+        for worker, peak in data["peak_total_rss_mb"].items():
+            self.data["peak_total_rss_mb"][worker] = max(self.data["peak_total_rss_mb"].get(worker, 0), peak)
@@ -10,16 +10,130 @@ class Config:
     # Base URL for the application
     BASE_URL = os.getenv("BASE_URL", "https://opensource-demo.orangehrmlive.com")
 
+    # Application under test: "remote" uses BASE_URL, "local" starts the bundled stand-in server
+    TARGET = os.getenv("TARGET", "remote")
+
     # Browser configuration
     BROWSER = os.getenv("BROWSER", "chrome")
     HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
 
     # Test timeouts
     DEFAULT_TIMEOUT = int(os.getenv("DEFAULT_TIMEOUT", "10"))
-    IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", "5"))
+
+    # Page-object action retries: clicks and text inputs failing with a transient error (stale, intercepted or
+    # not interactable element) are retried on a re-located element, ACTION_RETRY_DELAY seconds apart (doubling)
+    ACTION_RETRIES = int(os.getenv("ACTION_RETRIES", "2"))
+    ACTION_RETRY_DELAY = float(os.getenv("ACTION_RETRY_DELAY", "0.1"))
+
+    # Explicit wait polling (implicit waits are always disabled, BasePage.wait_until is the only wait)
+    WAIT_POLL_INITIAL = float(os.getenv("WAIT_POLL_INITIAL", "0.005"))
+    WAIT_POLL_MAX = float(os.getenv("WAIT_POLL_MAX", "0.25"))
+    SLOW_WAIT_THRESHOLD = float(os.getenv("SLOW_WAIT_THRESHOLD", "2"))
+
+    # Page-load strategy ("normal", "eager" or "none"); page objects wait for their READY_CONDITIONS either way
+    PAGE_LOAD_STRATEGY = os.getenv("PAGE_LOAD_STRATEGY", "normal")
+    NETWORK_IDLE_MS = int(os.getenv("NETWORK_IDLE_MS", "500"))
+
+    # Driver lifecycle settings ("function" launches a browser per test, "worker" reuses pooled browsers)
+    DRIVER_SCOPE = os.getenv("DRIVER_SCOPE", "function")
+    DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "1"))
+    DRIVER_HEALTH_CHECK_TIMEOUT = int(os.getenv("DRIVER_HEALTH_CHECK_TIMEOUT", "5"))
+
+    # Warm spares (opt-in): browsers launched in the background before tests need them. With a memory cap or
+    # minimum free memory set, no spare is launched unless psutil can check them
+    WARM_SPARES = int(os.getenv("WARM_SPARES", "0"))
+    SPARE_IDLE_TIMEOUT = float(os.getenv("SPARE_IDLE_TIMEOUT", "120"))
+    SPARE_MEMORY_CAP_MB = int(os.getenv("SPARE_MEMORY_CAP_MB", "1024"))
+    SPARE_MIN_FREE_MB = int(os.getenv("SPARE_MIN_FREE_MB", "512"))
+
+    # Browser resource watchdog: a reused browser is recycled between tests once its process tree uses more than
+    # WATCHDOG_MAX_RSS_MB, used more than WATCHDOG_MAX_CPU_PERCENT of a core during its last test, served
+    # WATCHDOG_MAX_TESTS tests or lived WATCHDOG_MAX_AGE seconds (0 disables a limit; memory and CPU need psutil)
+    WATCHDOG_MAX_RSS_MB = int(os.getenv("WATCHDOG_MAX_RSS_MB", "1536"))
+    WATCHDOG_MAX_CPU_PERCENT = int(os.getenv("WATCHDOG_MAX_CPU_PERCENT", "0"))
+    WATCHDOG_MAX_TESTS = int(os.getenv("WATCHDOG_MAX_TESTS", "0"))
+    WATCHDOG_MAX_AGE = int(os.getenv("WATCHDOG_MAX_AGE", "1800"))
+
+    # Driver binary resolution cache (shared by all xdist workers and reused across runs)
+    DRIVER_CACHE_DIR = os.getenv("DRIVER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "orangehrm-automation"))
+    DRIVER_OFFLINE = os.getenv("DRIVER_OFFLINE", "false").lower() == "true"
+    DRIVER_RESOLVE_LOCK_TIMEOUT = int(os.getenv("DRIVER_RESOLVE_LOCK_TIMEOUT", "120"))
+
+    # HTTP API client (browserless setup and verification)
+    API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+    API_RETRIES = int(os.getenv("API_RETRIES", "3"))
+    API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+
+    # How cached sessions are created: "api" posts the login form over HTTP, "ui" uses the login page
+    SESSION_LOGIN = os.getenv("SESSION_LOGIN", "api")
+
+    # Lightweight page on the application origin used to inject cached session cookies
+    SESSION_RESTORE_PATH = os.getenv("SESSION_RESTORE_PATH", "/robots.txt")
+
+    # Credentials file used by data driven login tests (defaults to data/login_credentials.csv)
+    CREDENTIALS_FILE = os.getenv("CREDENTIALS_FILE", "")
+
+    # Test data caching (in-process cache budget and optional pre-parsed binary cache shared by workers)
+    DATA_CACHE_MAX_BYTES = int(os.getenv("DATA_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    DATA_BINARY_CACHE = os.getenv("DATA_BINARY_CACHE", "false").lower() == "true"
+    DATA_CACHE_DIR = os.getenv("DATA_CACHE_DIR", ".data_cache")
+
+    # Lean browser profile: URL patterns (fnmatch style) blocked in the browser, and exceptions that must still load
+    LEAN_PROFILE = os.getenv("LEAN_PROFILE", "false").lower() == "true"
+    BLOCKED_RESOURCES = [pattern for pattern in os.getenv(
+        "BLOCKED_RESOURCES",
+        "*.png*,*.jpg*,*.jpeg*,*.gif*,*.svg*,*.webp*,*.ico*,*.woff*,*.ttf*,*.otf*,*.eot*,"
+        "*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*,*fonts.googleapis.com*,*fonts.gstatic.com*"
+    ).split(",") if pattern]
+    ALLOWED_RESOURCES = [pattern for pattern in os.getenv(
+        "ALLOWED_RESOURCES", "*/web/images/ohrm_branding.png*"
+    ).split(",") if pattern]
 
     # Screenshot settings
     SCREENSHOT_DIR = os.getenv("SCREENSHOT_DIR", "reports/screenshots")
+    # Downscale wider screenshots to this many pixels, 0 keeps them as is (needs Pillow,
+    # from requirements.txt; without it screenshots are stored at full resolution)
+    SCREENSHOT_MAX_WIDTH = int(os.getenv("SCREENSHOT_MAX_WIDTH", "0"))
+    # Bytes of artifacts written per run, split evenly between xdist workers
+    ARTIFACT_BUDGET_MB = int(os.getenv("ARTIFACT_BUDGET_MB", "500"))
+
+    # Log settings (one JSON lines file per xdist worker, rotated by size)
+    LOG_DIR = os.getenv("LOG_DIR", "reports/logs")
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+
+    # Page-load performance budgets declared on page objects (scale > 1 loosens every budget, e.g. on slow CI)
+    PERFORMANCE_BUDGETS = os.getenv("PERFORMANCE_BUDGETS", "true").lower() == "true"
+    PERFORMANCE_BUDGET_SCALE = float(os.getenv("PERFORMANCE_BUDGET_SCALE", "1.0"))
+
+    # Performance reports (WebDriver command latency percentiles per test and session)
+    LATENCY_REPORT = os.getenv("LATENCY_REPORT", "false").lower() == "true"
+    PERF_REPORT_DIR = os.getenv("PERF_REPORT_DIR", "reports/performance")
+
+    # Load generation (utils/load_generator.py): virtual users, seconds to start them all, seconds at full load,
+    # "http" or "browser" users, headless browsers shared by browser users, pause between iterations, and
+    # the width of the report's timeline buckets in seconds
+    LOAD_USERS = int(os.getenv("LOAD_USERS", "10"))
+    LOAD_RAMP_UP = float(os.getenv("LOAD_RAMP_UP", "10"))
+    LOAD_DURATION = float(os.getenv("LOAD_DURATION", "30"))
+    LOAD_MODE = os.getenv("LOAD_MODE", "http")
+    LOAD_BROWSER_POOL = int(os.getenv("LOAD_BROWSER_POOL", "4"))
+    LOAD_THINK_TIME = float(os.getenv("LOAD_THINK_TIME", "0"))
+    LOAD_REPORT_INTERVAL = float(os.getenv("LOAD_REPORT_INTERVAL", "5"))
+
+    # Micro-benchmarks (utils/benchmark.py): committed baselines, allowed slowdown before a benchmark fails,
+    # timed rounds per benchmark, minimum seconds per round, and re-runs confirming a regression
+    BENCHMARK_BASELINE = os.getenv("BENCHMARK_BASELINE", "benchmarks/baseline.json")
+    BENCHMARK_THRESHOLD = float(os.getenv("BENCHMARK_THRESHOLD", "0.5"))
+    BENCHMARK_ROUNDS = int(os.getenv("BENCHMARK_ROUNDS", "7"))
+    BENCHMARK_MIN_ROUND = float(os.getenv("BENCHMARK_MIN_ROUND", "0.05"))
+    BENCHMARK_RETRIES = int(os.getenv("BENCHMARK_RETRIES", "3"))
+
+    # Test impact analysis (--impacted): branch to diff against, how many commits a dependency map may lag
+    # behind HEAD before the full suite runs instead, and changed files that never affect tests
+    IMPACT_BASE_REF = os.getenv("IMPACT_BASE_REF", "origin/main")
+    IMPACT_MAP_MAX_AGE = int(os.getenv("IMPACT_MAP_MAX_AGE", "50"))
+    IMPACT_IGNORE = ["*.md", ".gitignore", ".github/*", "reports/*"]
 
     # Allure report settings
     ALLURE_RESULTS_DIR = os.getenv("ALLURE_RESULTS_DIR", "reports/allure-results")
@@ -39,6 +153,7 @@ class Config:
         if browser_name.lower() == "chrome":
             from selenium.webdriver.chrome.options import Options
             options = Options()
+            options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
 
             if Config.HEADLESS:
                 options.add_argument("--headless")
@@ -47,20 +162,44 @@ class Config:
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument("--window-size=1920,1080")
 
+            if Config.LEAN_PROFILE:
+                from utils.resource_filter import ResourceFilter
+                ResourceFilter.apply_preferences(options, "chrome")
+
             return options
 
         elif browser_name.lower() == "firefox":
             from selenium.webdriver.firefox.options import Options
             options = Options()
+            options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
 
             if Config.HEADLESS:
                 options.add_argument("--headless")
 
+            if Config.LEAN_PROFILE:
+                from utils.resource_filter import ResourceFilter
+                ResourceFilter.apply_preferences(options, "firefox")
+
             return options
 
         else:
             raise ValueError(f"Unsupported browser: {browser_name}")
 
+    @staticmethod
+    def parse_browsers(value):
+        """
+        Split a --browser value into browser names
+
+        :param value: Browser name or comma separated names, e.g. "chrome,firefox"
+        :return: List of lower-case browser names without duplicates, in the given order
+        """
+        browsers = []
+        for name in value.split(","):
+            name = name.strip().lower()
+            if name and name not in browsers:
+                browsers.append(name)
+        return browsers
+
     @staticmethod
     def load_test_data(file_path):
         """
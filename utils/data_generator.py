@@ -0,0 +1,220 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+from collections import deque
+
+from faker import Faker
+
+from utils.config import Config
+from utils.logger import logger
+
+
+FIELDS = ["username", "password", "expected_result", "expected_error", "kind"]
+
+# Credentials that must be rejected regardless of the account database
+EDGE_CASES = [
+    ("", "", "Required"),
+    ("", "{password}", "Required"),
+    ("{username}", "", "Required"),
+    ("   ", "{password}", "Invalid credentials"),
+    ("{username}", "   ", "Invalid credentials"),
+    ("' OR '1'='1", "' OR '1'='1", "Invalid credentials"),
+    ("<script>alert(1)</script>", "{password}", "Invalid credentials"),
+    ("{long}", "{password}", "Invalid credentials"),
+    ("{username}", "{long}", "Invalid credentials"),
+    ("{unicode}", "{password}", "Invalid credentials"),
+]
+
+# Locales used for non-ASCII usernames
+UNICODE_LOCALES = ["de_DE", "ja_JP", "ru_RU"]
+
+# Faker instances are expensive to build, so each process creates them once and reseeds per chunk
+_fakers = {}
+
+
+def _seeded_faker(locale, seed):
+    """
+    Get this process's Faker instance for a locale, reseeded
+
+    :param locale: Faker locale
+    :param seed: Seed for the instance
+    :return: Faker instance
+    """
+    if locale not in _fakers:
+        _fakers[locale] = Faker(locale)
+    _fakers[locale].seed_instance(seed)
+    return _fakers[locale]
+
+
+class DataGenerator:
+    """
+    Deterministic, streaming generator of login credential records.
+
+    Records are produced in fixed-size chunks, each seeded from the run seed and
+    the chunk number, so the output is identical for a given seed no matter how
+    many processes generate it. Only a bounded number of chunks is held in memory
+    at any time.
+    """
+
+    def __init__(self, seed=0, chunk_size=10000, valid_ratio=0.2, edge_ratio=0.1):
+        """
+        Initialize the generator
+
+        :param seed: Seed making the output reproducible
+        :param chunk_size: Number of records generated per work unit
+        :param valid_ratio: Share of records with valid credentials
+        :param edge_ratio: Share of records with edge-case credentials
+        """
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.valid_ratio = valid_ratio
+        self.edge_ratio = edge_ratio
+
+    def generate_chunk(self, chunk_index, count=None):
+        """
+        Generate the records of one chunk
+
+        :param chunk_index: Number of the chunk (part of its seed)
+        :param count: Number of records (defaults to chunk_size)
+        :return: List of record dictionaries
+        """
+        chunk_seed = self.seed * 1000003 + chunk_index
+        rng = random.Random(chunk_seed)
+        fake = _seeded_faker("en_US", chunk_seed)
+        unicode_fakers = [_seeded_faker(locale, chunk_seed) for locale in UNICODE_LOCALES]
+
+        records = []
+        for _ in range(count or self.chunk_size):
+            roll = rng.random()
+            if roll < self.valid_ratio:
+                records.append(self._valid_record(rng))
+            elif roll < self.valid_ratio + self.edge_ratio:
+                records.append(self._edge_case_record(rng, fake, unicode_fakers))
+            else:
+                records.append(self._invalid_record(fake))
+        return records
+
+    def stream(self, count, workers=None):
+        """
+        Generate records in order using all cores, holding only a few chunks in memory
+
+        :param count: Total number of records
+        :param workers: Number of processes (defaults to the number of CPUs)
+        :return: Iterator of record dictionaries
+        """
+        workers = workers or os.cpu_count() or 1
+        chunks = [(index, min(self.chunk_size, count - index * self.chunk_size))
+                  for index in range((count + self.chunk_size - 1) // self.chunk_size)]
+
+        if workers == 1:
+            for index, size in chunks:
+                yield from self.generate_chunk(index, size)
+            return
+
+        with multiprocessing.Pool(workers) as pool:
+            pending = deque()
+            chunk_iter = iter(chunks)
+            for index, size in chunk_iter:
+                pending.append(pool.apply_async(self.generate_chunk, (index, size)))
+                if len(pending) >= workers * 2:
+                    break
+
+            while pending:
+                records = pending.popleft().get()
+                next_chunk = next(chunk_iter, None)
+                if next_chunk:
+                    pending.append(pool.apply_async(self.generate_chunk, next_chunk))
+                yield from records
+
+    def write(self, file_path, count, file_format=None, workers=None):
+        """
+        Stream generated records to a CSV or JSONL file
+
+        :param file_path: Output path
+        :param count: Total number of records
+        :param file_format: "csv" or "jsonl" (defaults to the file extension)
+        :param workers: Number of processes (defaults to the number of CPUs)
+        :return: Number of records written
+        """
+        file_format = file_format or ("jsonl" if file_path.endswith(".jsonl") else "csv")
+        written = 0
+
+        with open(file_path, 'w', newline='') as file:
+            if file_format == "csv":
+                writer = csv.DictWriter(file, fieldnames=FIELDS)
+                writer.writeheader()
+                for record in self.stream(count, workers):
+                    writer.writerow(record)
+                    written += 1
+            elif file_format == "jsonl":
+                for record in self.stream(count, workers):
+                    file.write(json.dumps(record) + "\n")
+                    written += 1
+            else:
+                raise ValueError(f"Unsupported format: {file_format}")
+
+        logger.info(f"Generated {written} records into {file_path}")
+        return written
+
+    @staticmethod
+    def _valid_record(rng):
+        """
+        Build a record for the known account
+
+        :param rng: Random generator of the chunk
+        :return: Record expected to log in
+        """
+        # Usernames are case-insensitive, so vary the case of the known account
+        username = "".join(c.upper() if rng.random() < 0.5 else c.lower() for c in Config.DEFAULT_USERNAME)
+        return {"username": username, "password": Config.DEFAULT_PASSWORD,
+                "expected_result": "success", "expected_error": "", "kind": "valid"}
+
+    @staticmethod
+    def _invalid_record(fake):
+        """
+        Build a record with random unknown credentials
+
+        :param fake: Faker instance of the chunk
+        :return: Record expected to be rejected
+        """
+        return {"username": fake.user_name(), "password": fake.password(),
+                "expected_result": "failure", "expected_error": "Invalid credentials", "kind": "invalid"}
+
+    @staticmethod
+    def _edge_case_record(rng, fake, unicode_fakers):
+        """
+        Build a record from one of the edge-case templates
+
+        :param rng: Random generator of the chunk
+        :param fake: Faker instance of the chunk
+        :param unicode_fakers: Faker instances for non-Latin locales
+        :return: Record expected to fail with the template's error
+        """
+        username, password, expected_error = rng.choice(EDGE_CASES)
+        values = {
+            "username": fake.user_name(),
+            "password": fake.password(),
+            "long": fake.pystr(min_chars=256, max_chars=1024),
+            "unicode": rng.choice(unicode_fakers).name(),
+        }
+        return {"username": username.format(**values), "password": password.format(**values),
+                "expected_result": "failure", "expected_error": expected_error, "kind": "edge"}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic login credentials for scale runs")
+    parser.add_argument("--count", type=int, required=True, help="Number of records to generate")
+    parser.add_argument("--output", required=True, help="Output file (.csv or .jsonl)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Output format (defaults to the extension)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed making the output reproducible")
+    parser.add_argument("--workers", type=int, help="Number of processes (defaults to all cores)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Records per work unit")
+    parser.add_argument("--valid-ratio", type=float, default=0.2, help="Share of valid credentials")
+    parser.add_argument("--edge-ratio", type=float, default=0.1, help="Share of edge-case credentials")
+    args = parser.parse_args()
+
+    generator = DataGenerator(args.seed, args.chunk_size, args.valid_ratio, args.edge_ratio)
+    generator.write(args.output, args.count, args.format, args.workers)
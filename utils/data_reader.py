@@ -1,14 +1,28 @@
 import json
 import csv
+import hashlib
 import os
+import pickle
+from collections import OrderedDict
+from utils.config import Config
+from utils.impact_analysis import DependencyRecorder
 from utils.logger import logger
 
 
 class DataReader:
     """
     Utility class to read test data from various file formats
+
+    Parsed files are memoized per process, keyed on path and modification time,
+    in a cache bounded by Config.DATA_CACHE_MAX_BYTES. Returned data is shared
+    between callers and must be treated as read-only. With Config.DATA_BINARY_CACHE
+    enabled, parsed data is also pickled to Config.DATA_CACHE_DIR so that other
+    xdist workers and later runs skip parsing altogether.
     """
 
+    _cache = OrderedDict()
+    _cache_bytes = 0
+
     @staticmethod
     def read_json(file_path):
         """
@@ -18,8 +32,7 @@ class DataReader:
         :return: Dictionary containing the JSON data
         """
         try:
-            with open(file_path, 'r') as file:
-                return json.load(file)
+            return DataReader._cached("json", file_path, DataReader._parse_json)
         except Exception as e:
             logger.error(f"Error reading JSON file {file_path}: {e}")
             return None
@@ -33,16 +46,168 @@ class DataReader:
         :return: List of dictionaries containing the CSV data
         """
         try:
-            data_list = []
-            with open(file_path, 'r') as file:
-                csv_reader = csv.DictReader(file)
-                for row in csv_reader:
-                    data_list.append(row)
-            return data_list
+            return DataReader._cached("csv", file_path, lambda path: list(DataReader.iter_csv(path)))
         except Exception as e:
             logger.error(f"Error reading CSV file {file_path}: {e}")
             return None
 
+    @staticmethod
+    def iter_csv(file_path):
+        """
+        Stream rows from a CSV file without loading the whole file
+
+        :param file_path: Path to the CSV file
+        :return: Iterator of dictionaries, one per row
+        """
+        DependencyRecorder.record_file(file_path)
+        with open(file_path, 'r', newline='') as file:
+            yield from csv.DictReader(file)
+
+    @staticmethod
+    def iter_jsonl(file_path):
+        """
+        Stream records from a JSON Lines file without loading the whole file
+
+        :param file_path: Path to the JSONL file
+        :return: Iterator of parsed records, one per non-empty line
+        """
+        DependencyRecorder.record_file(file_path)
+        with open(file_path, 'r') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+    @staticmethod
+    def clear_cache():
+        """
+        Drop every memoized file from the in-process cache
+        """
+        DataReader._cache.clear()
+        DataReader._cache_bytes = 0
+
+    @staticmethod
+    def _parse_json(file_path):
+        """
+        Parse a JSON file
+
+        :param file_path: Path to the JSON file
+        :return: Parsed data
+        """
+        with open(file_path, 'r') as file:
+            return json.load(file)
+
+    @staticmethod
+    def _cached(kind, file_path, parse):
+        """
+        Return parsed file content from the in-process or binary cache, parsing on a miss
+
+        :param kind: Format of the file ("json" or "csv")
+        :param file_path: Path to the file
+        :param parse: Callable parsing the file path into data
+        :return: Parsed data
+        """
+        file_path = os.path.abspath(file_path)
+        DependencyRecorder.record_file(file_path)
+        stat = os.stat(file_path)
+        key = (kind, file_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        entry = DataReader._cache.get(key)
+        if entry and entry[0] == version:
+            DataReader._cache.move_to_end(key)
+            return entry[1]
+
+        data = DataReader._load_binary(kind, file_path, version) if Config.DATA_BINARY_CACHE else None
+        if data is None:
+            data = parse(file_path)
+            if Config.DATA_BINARY_CACHE:
+                DataReader._store_binary(kind, file_path, version, data)
+
+        DataReader._remember(key, version, data, stat.st_size)
+        return data
+
+    @staticmethod
+    def _remember(key, version, data, size):
+        """
+        Put parsed data in the in-process cache and evict least recently used files over budget
+
+        :param key: Cache key (kind, absolute path)
+        :param version: (mtime_ns, size) of the parsed file
+        :param data: Parsed data
+        :param size: File size used as the cost of the entry
+        """
+        previous = DataReader._cache.pop(key, None)
+        if previous:
+            DataReader._cache_bytes -= previous[2]
+
+        if size > Config.DATA_CACHE_MAX_BYTES:
+            return
+
+        DataReader._cache[key] = (version, data, size)
+        DataReader._cache_bytes += size
+
+        while DataReader._cache_bytes > Config.DATA_CACHE_MAX_BYTES:
+            _, (_, _, evicted_size) = DataReader._cache.popitem(last=False)
+            DataReader._cache_bytes -= evicted_size
+
+    @staticmethod
+    def _binary_path(kind, file_path, version):
+        """
+        Location of the pre-parsed binary copy of a file
+
+        :param kind: Format of the file
+        :param file_path: Absolute path to the file
+        :param version: (mtime_ns, size) of the file
+        :return: Path of the pickle file
+        """
+        digest = hashlib.sha1(f"{kind}:{file_path}:{version[0]}:{version[1]}".encode()).hexdigest()
+        return os.path.join(Config.DATA_CACHE_DIR, f"{os.path.basename(file_path)}.{digest}.pickle")
+
+    @staticmethod
+    def _load_binary(kind, file_path, version):
+        """
+        Load pre-parsed data written by an earlier process, deleting a copy that cannot be read
+
+        :param kind: Format of the file
+        :param file_path: Absolute path to the file
+        :param version: (mtime_ns, size) of the file
+        :return: Parsed data, or None if no valid binary copy exists
+        """
+        binary_path = DataReader._binary_path(kind, file_path, version)
+        try:
+            with open(binary_path, 'rb') as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Truncated or written by an incompatible version: unpickling may fail with almost any error
+            logger.warning(f"Discarding unreadable binary data cache {binary_path}: {e}")
+            try:
+                os.remove(binary_path)
+            except OSError:
+                pass
+            return None
+
+    @staticmethod
+    def _store_binary(kind, file_path, version, data):
+        """
+        Atomically write pre-parsed data for other processes
+
+        :param kind: Format of the file
+        :param file_path: Absolute path to the file
+        :param version: (mtime_ns, size) of the file
+        :param data: Parsed data
+        """
+        binary_path = DataReader._binary_path(kind, file_path, version)
+        tmp_path = f"{binary_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(Config.DATA_CACHE_DIR, exist_ok=True)
+            with open(tmp_path, 'wb') as file:
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, binary_path)
+        except OSError as e:
+            logger.warning(f"Could not write binary data cache {binary_path}: {e}")
+
     @staticmethod
     def get_test_data_path(file_name):
         """
@@ -64,6 +229,18 @@ class DataReader:
         file_path = DataReader.get_test_data_path("login_credentials.csv")
         return DataReader.read_csv(file_path)
 
+    @staticmethod
+    def iter_login_credentials(file_path):
+        """
+        Stream login credentials from a CSV or JSONL file (e.g. output of utils.data_generator)
+
+        :param file_path: Path to a .csv or .jsonl file with username, password and expected_result
+        :return: Iterator of dictionaries
+        """
+        if file_path.endswith(".jsonl"):
+            return DataReader.iter_jsonl(file_path)
+        return DataReader.iter_csv(file_path)
+
     @staticmethod
     def get_user_data():
         """
@@ -72,4 +249,17 @@ class DataReader:
         :return: Dictionary containing user data
         """
         file_path = DataReader.get_test_data_path("users.json")
-        return DataReader.read_json(file_path)
\ No newline at end of file
+        return DataReader.read_json(file_path)
+
+    @staticmethod
+    def get_valid_user(role="Admin"):
+        """
+        Get the first valid user with the given role from the JSON file
+
+        :param role: Role of the user (as listed in users.json)
+        :return: Dictionary containing the user data
+        """
+        for user in DataReader.get_user_data()["valid_users"]:
+            if user.get("role") == role:
+                return user
+        raise ValueError(f"No valid user with role '{role}' in users.json")
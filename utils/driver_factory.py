@@ -0,0 +1,85 @@
+import platform
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+from utils.config import Config
+from utils.driver_resolver import DriverResolver
+from utils.instrumentation import CommandRecorder
+from utils.logger import logger
+from utils.resource_filter import ResourceFilter
+
+
+class DriverFactory:
+    """
+    Factory class responsible for launching WebDriver sessions
+    """
+
+    @staticmethod
+    def create_driver(browser):
+        """
+        Launch a new WebDriver session for the given browser
+
+        :param browser: Browser to use (chrome or firefox)
+        :return: WebDriver instance
+        """
+        try:
+            if browser.lower() == "chrome":
+                options = Config.get_browser_options("chrome")
+
+                # On Windows, we need to handle WebDriver initialization differently
+                if platform.system() == "Windows":
+                    driver = webdriver.Chrome(options=options)
+                else:
+                    driver = webdriver.Chrome(service=ChromeService(DriverResolver.resolve("chrome")), options=options)
+
+            elif browser.lower() == "firefox":
+                options = Config.get_browser_options("firefox")
+
+                # On Windows, we need to handle WebDriver initialization differently
+                if platform.system() == "Windows":
+                    driver = webdriver.Firefox(options=options)
+                else:
+                    driver = webdriver.Firefox(service=FirefoxService(DriverResolver.resolve("firefox")), options=options)
+            else:
+                raise ValueError(f"Unsupported browser: {browser}")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize WebDriver: {str(e)}")
+
+            # The fallback lets Selenium Manager download drivers, which is not allowed offline
+            if Config.DRIVER_OFFLINE:
+                raise
+
+            # Try alternative initialization method as fallback
+            if browser.lower() == "chrome":
+                driver = webdriver.Chrome()
+            elif browser.lower() == "firefox":
+                driver = webdriver.Firefox()
+            else:
+                raise ValueError(f"Unsupported browser: {browser}")
+
+        return DriverFactory.prepare(driver)
+
+    @staticmethod
+    def prepare(driver):
+        """
+        Apply the framework's session settings to a freshly launched driver
+
+        :param driver: WebDriver instance
+        :return: The same WebDriver instance
+        """
+        # Block resources no test asserts on
+        if Config.LEAN_PROFILE:
+            logger.info(f"Lean profile active using {ResourceFilter.install(driver)} request blocking")
+
+        # Time every WebDriver command (a no-op unless --latency-report is enabled)
+        CommandRecorder.instance().instrument(driver)
+
+        # Disable implicit waits so they never stack with BasePage.wait_until
+        driver.implicitly_wait(0)
+
+        # Maximize window
+        driver.maximize_window()
+
+        return driver
@@ -0,0 +1,516 @@
+import threading
+import time
+
+from utils.config import Config
+from utils.driver_factory import DriverFactory
+from utils.logger import logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def browser_processes(driver):
+    """
+    Processes of a local browser: its driver process and every process it started
+
+    :param driver: WebDriver instance
+    :return: List of psutil.Process objects (empty without psutil or when the processes cannot be inspected)
+    """
+    if psutil is None:
+        return []
+    try:
+        process = psutil.Process(driver.service.process.pid)
+        return [process] + process.children(recursive=True)
+    except Exception:
+        return []
+
+
+class DriverPoolStats:
+    """
+    Counters describing how much browser start-up time the pool avoided
+    """
+
+    def __init__(self):
+        """
+        Initialize all counters to zero
+        """
+        self.launches = 0
+        self.launch_seconds = 0.0
+        self.reuses = 0
+        self.reset_seconds = 0.0
+        self.replacements = 0
+        self.recycles = 0
+        self.spares_used = 0
+        self.spare_wait_seconds = 0.0
+        self.spares_expired = 0
+        self.spares_skipped = 0
+
+    @property
+    def average_launch_seconds(self):
+        """
+        Average time it took to launch a fresh browser
+
+        :return: Seconds per launch (0.0 if nothing was launched)
+        """
+        return self.launch_seconds / self.launches if self.launches else 0.0
+
+    @property
+    def seconds_saved(self):
+        """
+        Estimated wall-clock time saved by reusing browsers instead of relaunching them
+
+        :return: Seconds saved (launch cost avoided minus the cost of state resets)
+        """
+        return self.reuses * self.average_launch_seconds - self.reset_seconds
+
+    @property
+    def spare_seconds_saved(self):
+        """
+        Estimated wall-clock time saved by handing out pre-launched browsers
+
+        :return: Seconds saved (launch cost avoided minus the time tests still waited for a spare)
+        """
+        return self.spares_used * self.average_launch_seconds - self.spare_wait_seconds
+
+    def as_dict(self):
+        """
+        Serialize the counters so they can be shipped from xdist workers
+
+        :return: Dictionary of counters
+        """
+        return {
+            "launches": self.launches,
+            "launch_seconds": self.launch_seconds,
+            "reuses": self.reuses,
+            "reset_seconds": self.reset_seconds,
+            "replacements": self.replacements,
+            "recycles": self.recycles,
+            "spares_used": self.spares_used,
+            "spare_wait_seconds": self.spare_wait_seconds,
+            "spares_expired": self.spares_expired,
+            "spares_skipped": self.spares_skipped,
+        }
+
+    def merge(self, data):
+        """
+        Add counters reported by another pool (e.g. an xdist worker)
+
+        :param data: Dictionary produced by as_dict()
+        """
+        for key, value in data.items():
+            setattr(self, key, getattr(self, key) + value)
+
+    def summary_lines(self):
+        """
+        Build human readable summary lines for the terminal report
+
+        :return: List of strings
+        """
+        lines = [
+            f"Browsers launched: {self.launches} (avg {self.average_launch_seconds:.2f}s per launch)",
+            f"Browser reuses: {self.reuses} (state resets took {self.reset_seconds:.2f}s in total)",
+            f"Dead or wedged sessions replaced: {self.replacements}",
+            f"Browsers recycled by the resource watchdog: {self.recycles}",
+            f"Estimated time saved by reuse: {self.seconds_saved:.2f}s",
+        ]
+        if self.spares_used or self.spares_expired or self.spares_skipped:
+            lines += [
+                f"Warm spares handed out: {self.spares_used} (tests waited {self.spare_wait_seconds:.2f}s in total), "
+                f"{self.spares_expired} expired idle, {self.spares_skipped} launches skipped by the memory cap",
+                f"Estimated time saved by warm spares: {self.spare_seconds_saved:.2f}s",
+            ]
+        return lines
+
+
+class DriverPool:
+    """
+    Keeps WebDriver sessions alive for the lifetime of a pytest worker and hands
+    them out to tests after a cheap state reset.
+    """
+
+    def __init__(self, max_size=None, health_check_timeout=None, spares=None, watchdog=None):
+        """
+        Initialize the pool
+
+        :param max_size: Maximum number of idle browsers kept per browser type
+        :param health_check_timeout: Seconds a session may take to answer a health probe
+        :param spares: WarmSpares object new browsers are taken from, or None to launch them directly
+        :param watchdog: BrowserWatchdog deciding when a browser is recycled, or None to reuse browsers until they die
+        """
+        self.max_size = max_size or Config.DRIVER_POOL_SIZE
+        self.spares = spares
+        self.watchdog = watchdog
+        self.health_check_timeout = health_check_timeout or Config.DRIVER_HEALTH_CHECK_TIMEOUT
+        self.stats = DriverPoolStats()
+        self._idle = {}
+        self._owners = {}
+
+    def acquire(self, browser):
+        """
+        Get a ready-to-use WebDriver, reusing an idle one when possible
+
+        :param browser: Browser to use (chrome or firefox)
+        :return: WebDriver instance
+        """
+        idle = self._idle.setdefault(browser.lower(), [])
+        while idle:
+            driver = idle.pop()
+            if self.is_alive(driver):
+                self.stats.reuses += 1
+                self._owners[id(driver)] = browser.lower()
+                logger.info(f"Reusing pooled {browser} WebDriver session")
+                return driver
+
+            logger.warning(f"Pooled {browser} WebDriver session is dead or unresponsive, replacing it")
+            self.stats.replacements += 1
+            self._retire(driver)
+
+        return self._launch(browser)
+
+    def release(self, driver):
+        """
+        Return a WebDriver to the pool after a test
+
+        :param driver: WebDriver instance previously returned by acquire()
+        """
+        browser = self._owners.pop(id(driver), None)
+        idle = self._idle.setdefault(browser, []) if browser else None
+
+        # Checked between tests only: the browser is not in use again until it is acquired
+        reason = self.watchdog.after_test(driver) if self.watchdog else None
+        if reason:
+            self.stats.recycles += 1
+            self._retire(driver, reason)
+            return
+
+        if idle is None or len(idle) >= self.max_size:
+            self._retire(driver)
+            return
+
+        start = time.perf_counter()
+        try:
+            self.reset_state(driver)
+        except Exception as e:
+            logger.warning(f"Failed to reset pooled WebDriver session, discarding it: {e}")
+            self._retire(driver)
+            return
+        finally:
+            self.stats.reset_seconds += time.perf_counter() - start
+
+        idle.append(driver)
+
+    def close(self):
+        """
+        Quit every browser still held by the pool
+        """
+        for idle in self._idle.values():
+            while idle:
+                self._retire(idle.pop(), wait=self.health_check_timeout)
+
+        logger.info("Driver pool closed: " + "; ".join(self.stats.summary_lines()))
+
+    @staticmethod
+    def reset_state(driver):
+        """
+        Bring a browser back to a clean state without relaunching it
+
+        :param driver: WebDriver instance
+        """
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # Storage is not accessible on pages such as about:blank
+            pass
+
+        # delete_all_cookies() only covers the current domain, Chrome can drop every cookie at once
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.delete_all_cookies()
+
+        driver.get("about:blank")
+
+        # Import locally, pages depend on utils and not the other way round
+        from pages.module_page import ModulePage
+        ModulePage.invalidate_menu_index(driver)
+
+    def is_alive(self, driver):
+        """
+        Check that a session still answers commands within the health check timeout
+
+        :param driver: WebDriver instance
+        :return: Boolean indicating if the session is usable
+        """
+        result = {}
+
+        def probe():
+            try:
+                result["url"] = driver.current_url
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=probe, daemon=True)
+        thread.start()
+        thread.join(self.health_check_timeout)
+        return "url" in result
+
+    def _launch(self, browser):
+        """
+        Launch a brand new browser and record its start-up cost
+
+        :param browser: Browser to use
+        :return: WebDriver instance
+        """
+        if self.spares:
+            # Launch costs are accounted for by the spares, which start browsers in the background
+            driver = self.spares.take(browser)
+        else:
+            start = time.perf_counter()
+            driver = DriverFactory.create_driver(browser)
+            self.stats.launch_seconds += time.perf_counter() - start
+            self.stats.launches += 1
+            logger.info(f"Starting pooled WebDriver session with {browser} browser")
+
+        self._owners[id(driver)] = browser.lower()
+        if self.watchdog:
+            self.watchdog.start(driver, browser)
+        return driver
+
+    def _retire(self, driver, reason=None, wait=0):
+        """
+        Stop watching a browser and quit it
+
+        :param driver: WebDriver instance
+        :param reason: Why the watchdog recycles it, if it does
+        :param wait: Seconds to wait for the browser to exit (0 to return immediately)
+        """
+        if self.watchdog:
+            self.watchdog.stop(driver, reason)
+        self._discard(driver, wait)
+
+    @staticmethod
+    def _discard(driver, wait=0):
+        """
+        Quit a browser in the background so a wedged session cannot block the test run
+
+        :param driver: WebDriver instance
+        :param wait: Seconds to wait for the browser to exit (0 to return immediately)
+        """
+        def quit_driver():
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.warning(f"Failed to quit WebDriver session: {e}")
+
+        thread = threading.Thread(target=quit_driver, daemon=True)
+        thread.start()
+        if wait:
+            thread.join(wait)
+
+
+class WarmSpares:
+    """
+    Keeps browsers launched ahead of time so tests rarely wait for a browser start.
+
+    Every spare handed out by take() triggers a replacement launch on a background
+    thread. Spares idle for longer than the idle timeout are quit, and no new spare
+    is started while the spares already use more than the memory cap or the machine
+    is short on memory. Memory checks need psutil: with a cap or minimum free memory
+    configured and psutil missing, no spare is launched at all.
+    """
+
+    def __init__(self, count=None, idle_timeout=None, memory_cap_mb=None, min_free_mb=None):
+        """
+        Initialize the spares (call prime() to start launching)
+
+        :param count: Number of browsers kept ready per browser type (defaults to Config.WARM_SPARES)
+        :param idle_timeout: Seconds a spare may stay unused (defaults to Config.SPARE_IDLE_TIMEOUT)
+        :param memory_cap_mb: Maximum resident memory of all ready spares (defaults to Config.SPARE_MEMORY_CAP_MB)
+        :param min_free_mb: Minimum free system memory to launch a spare (defaults to Config.SPARE_MIN_FREE_MB)
+        """
+        self.count = Config.WARM_SPARES if count is None else count
+        self.idle_timeout = idle_timeout or Config.SPARE_IDLE_TIMEOUT
+        self.memory_cap_mb = Config.SPARE_MEMORY_CAP_MB if memory_cap_mb is None else memory_cap_mb
+        self.min_free_mb = Config.SPARE_MIN_FREE_MB if min_free_mb is None else min_free_mb
+        self.stats = DriverPoolStats()
+
+        if psutil is None and (self.memory_cap_mb or self.min_free_mb):
+            logger.warning("psutil is not installed: warm spares are disabled because their memory limits "
+                           "cannot be checked (install psutil, or set SPARE_MEMORY_CAP_MB=0 and SPARE_MIN_FREE_MB=0)")
+
+        self._ready = {}
+        self._pending = {}
+        self._closed = False
+        self._condition = threading.Condition()
+        self._reaper = threading.Thread(target=self._reap, name="warm-spare-reaper", daemon=True)
+        self._reaper.start()
+
+    def prime(self, browser):
+        """
+        Start launching spares for a browser in the background
+
+        :param browser: Browser to keep ready
+        """
+        with self._condition:
+            self._fill(browser.lower())
+
+    def take(self, browser):
+        """
+        Hand out a ready browser and start launching its replacement
+
+        :param browser: Browser to use (chrome or firefox)
+        :return: WebDriver instance
+        """
+        browser = browser.lower()
+        start = time.perf_counter()
+        driver = None
+
+        with self._condition:
+            self._fill(browser)
+            while True:
+                ready = self._ready.get(browser)
+                if ready:
+                    driver, _ = ready.pop(0)
+                    break
+                if not self._pending.get(browser):
+                    break
+                # A launch is already under way, waiting for it beats starting another one
+                self._condition.wait()
+            self._fill(browser)
+
+        if driver is None:
+            logger.info(f"No warm {browser} spare available, launching one in the foreground")
+            driver = self._launch_driver(browser)
+        else:
+            self.stats.spares_used += 1
+
+        self.stats.spare_wait_seconds += time.perf_counter() - start
+        return driver
+
+    def close(self):
+        """
+        Quit every ready spare; launches still in flight quit their browser when done
+        """
+        with self._condition:
+            self._closed = True
+            spares = [driver for ready in self._ready.values() for driver, _ in ready]
+            self._ready.clear()
+            self._condition.notify_all()
+
+        for driver in spares:
+            DriverPool._discard(driver, wait=Config.DRIVER_HEALTH_CHECK_TIMEOUT)
+
+    def _fill(self, browser):
+        """
+        Launch as many spares as are missing (call with the condition held)
+
+        :param browser: Browser name
+        """
+        missing = self.count - len(self._ready.get(browser, [])) - self._pending.get(browser, 0)
+        for _ in range(max(missing, 0)):
+            if self._closed:
+                return
+            if not self._memory_allows():
+                self.stats.spares_skipped += 1
+                return
+            self._pending[browser] = self._pending.get(browser, 0) + 1
+            threading.Thread(target=self._launch_spare, args=(browser,), name=f"warm-spare-{browser}",
+                             daemon=True).start()
+
+    def _launch_spare(self, browser):
+        """
+        Background thread launching one spare
+
+        :param browser: Browser name
+        """
+        try:
+            driver = self._launch_driver(browser)
+        except Exception as e:
+            logger.warning(f"Failed to launch a warm {browser} spare: {e}")
+            driver = None
+
+        with self._condition:
+            self._pending[browser] -= 1
+            if driver is not None and not self._closed:
+                self._ready.setdefault(browser, []).append((driver, time.monotonic()))
+                driver = None
+            self._condition.notify_all()
+
+        if driver is not None:
+            DriverPool._discard(driver)
+
+    def _launch_driver(self, browser):
+        """
+        Launch a browser and record its start-up cost
+
+        :param browser: Browser name
+        :return: WebDriver instance
+        """
+        start = time.perf_counter()
+        driver = DriverFactory.create_driver(browser)
+        with self._condition:
+            self.stats.launches += 1
+            self.stats.launch_seconds += time.perf_counter() - start
+        return driver
+
+    def _reap(self):
+        """
+        Background thread quitting spares that stayed idle for too long
+        """
+        while True:
+            expired = []
+            with self._condition:
+                self._condition.wait(min(self.idle_timeout / 2, 5))
+                if self._closed:
+                    return
+                now = time.monotonic()
+                for ready in self._ready.values():
+                    expired += [driver for driver, ready_at in ready if now - ready_at > self.idle_timeout]
+                    ready[:] = [(driver, ready_at) for driver, ready_at in ready if now - ready_at <= self.idle_timeout]
+                self.stats.spares_expired += len(expired)
+
+            for driver in expired:
+                logger.info("Quitting warm spare browser after its idle timeout")
+                DriverPool._discard(driver)
+
+    def _memory_allows(self):
+        """
+        Check the memory cap and the free memory before launching a spare
+
+        :return: Boolean indicating if another spare may be launched
+        """
+        if psutil is None:
+            # Without psutil the limits cannot be checked, so only unlimited spares are launched
+            return not (self.memory_cap_mb or self.min_free_mb)
+
+        if self.min_free_mb and psutil.virtual_memory().available < self.min_free_mb * 1024 * 1024:
+            logger.info("Not launching a warm spare: system memory is low")
+            return False
+
+        if self.memory_cap_mb:
+            used = sum(self._resident_bytes(driver) for ready in self._ready.values() for driver, _ in ready)
+            if used > self.memory_cap_mb * 1024 * 1024:
+                logger.info(f"Not launching a warm spare: spares already use {used / 1024 / 1024:.0f} MB")
+                return False
+
+        return True
+
+    @staticmethod
+    def _resident_bytes(driver):
+        """
+        Resident memory of a browser: its driver process and every process it started
+
+        :param driver: WebDriver instance
+        :return: Bytes (0 if the processes cannot be inspected)
+        """
+        try:
+            return sum(process.memory_info().rss for process in browser_processes(driver))
+        except Exception:
+            return 0
@@ -0,0 +1,226 @@
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+from utils.config import Config
+from utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: fall back to an exclusively created lock file
+    fcntl = None
+
+
+class DriverResolver:
+    """
+    Resolve WebDriver binaries once per session and remember them on disk.
+
+    Resolved paths are kept in memory for the current process and in a JSON cache
+    keyed by browser name and installed browser version, so xdist workers and later
+    runs skip webdriver-manager entirely. A file lock serializes the first resolution
+    across workers.
+    """
+
+    DRIVER_BINARIES = {
+        "chrome": "chromedriver",
+        "firefox": "geckodriver",
+    }
+
+    _resolved = {}
+
+    @staticmethod
+    def resolve(browser, offline=None):
+        """
+        Get the path of the WebDriver binary for a browser
+
+        :param browser: Browser name (chrome or firefox)
+        :param offline: Never touch the network (defaults to Config.DRIVER_OFFLINE)
+        :return: Absolute path to the driver binary
+        """
+        browser = browser.lower()
+        path = DriverResolver._resolved.get(browser)
+        if path:
+            return path
+
+        if browser not in DriverResolver.DRIVER_BINARIES:
+            raise ValueError(f"Unsupported browser: {browser}")
+
+        offline = Config.DRIVER_OFFLINE if offline is None else offline
+        cache_key = f"{browser}-{DriverResolver.get_browser_version(browser)}"
+
+        with DriverResolver._cache_lock():
+            cache = DriverResolver._read_cache()
+            path = cache.get(cache_key)
+
+            if not (path and os.path.isfile(path)):
+                path = DriverResolver._locate(browser, offline)
+                cache[cache_key] = path
+                DriverResolver._write_cache(cache)
+                logger.info(f"Resolved {browser} driver for cache key {cache_key}: {path}")
+
+        DriverResolver._resolved[browser] = path
+        return path
+
+    @staticmethod
+    def get_browser_version(browser):
+        """
+        Read the locally installed browser version without any network access
+
+        :param browser: Browser name (chrome or firefox)
+        :return: Version string, or "unknown" if it cannot be determined
+        """
+        from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+        browser_type = ChromeType.GOOGLE if browser == "chrome" else browser
+        try:
+            version = OperationSystemManager().get_browser_version_from_os(browser_type)
+        except Exception as e:
+            logger.warning(f"Could not detect installed {browser} version: {e}")
+            version = None
+        return version or "unknown"
+
+    @staticmethod
+    def clear():
+        """
+        Forget the paths resolved by the current process (the on-disk cache is kept)
+        """
+        DriverResolver._resolved.clear()
+
+    @staticmethod
+    def _locate(browser, offline):
+        """
+        Find a driver binary on a cache miss
+
+        :param browser: Browser name
+        :param offline: Whether network downloads are forbidden
+        :return: Absolute path to the driver binary
+        """
+        binary = shutil.which(DriverResolver.DRIVER_BINARIES[browser])
+
+        if offline:
+            if not binary:
+                raise RuntimeError(
+                    f"Offline driver resolution failed: no cached {browser} driver in "
+                    f"{DriverResolver._cache_file()} and {DriverResolver.DRIVER_BINARIES[browser]} is not on PATH"
+                )
+            return os.path.abspath(binary)
+
+        try:
+            if browser == "chrome":
+                from webdriver_manager.chrome import ChromeDriverManager
+                return ChromeDriverManager().install()
+
+            from webdriver_manager.firefox import GeckoDriverManager
+            return GeckoDriverManager().install()
+        except Exception as e:
+            if not binary:
+                raise
+            logger.warning(f"webdriver-manager failed ({e}), using {binary} from PATH")
+            return os.path.abspath(binary)
+
+    @staticmethod
+    def _cache_file():
+        """
+        Get the location of the persistent resolution cache
+
+        :return: Path to the JSON cache file
+        """
+        return os.path.join(Config.DRIVER_CACHE_DIR, "drivers.json")
+
+    @staticmethod
+    def _read_cache():
+        """
+        Load the persistent resolution cache
+
+        :return: Dictionary mapping cache keys to driver paths
+        """
+        try:
+            with open(DriverResolver._cache_file(), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_cache(cache):
+        """
+        Atomically replace the persistent resolution cache
+
+        :param cache: Dictionary mapping cache keys to driver paths
+        """
+        file_path = DriverResolver._cache_file()
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(cache, file, indent=2)
+        os.replace(tmp_path, file_path)
+
+    @staticmethod
+    @contextmanager
+    def _cache_lock():
+        """
+        Cross-process lock guarding the resolution cache (shared by all xdist workers)
+
+        Uses flock where available: the kernel releases it when its holder dies, so a
+        crashed worker never leaves a stale lock behind.
+        """
+        os.makedirs(Config.DRIVER_CACHE_DIR, exist_ok=True)
+        lock_path = DriverResolver._cache_file() + ".lock"
+        if fcntl is None:
+            with DriverResolver._lock_file(lock_path):
+                yield
+            return
+
+        deadline = time.monotonic() + Config.DRIVER_RESOLVE_LOCK_TIMEOUT
+        with open(lock_path, 'a') as file:
+            while True:
+                try:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() > deadline:
+                        # The holder is alive but hangs, resolving twice is better than waiting forever
+                        logger.warning(f"Driver cache lock {lock_path} held for over "
+                                       f"{Config.DRIVER_RESOLVE_LOCK_TIMEOUT}s, resolving without it")
+                        break
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    @contextmanager
+    def _lock_file(lock_path):
+        """
+        Lock held by exclusively creating a file, for platforms without flock
+
+        :param lock_path: Path of the lock file
+        """
+        deadline = time.monotonic() + Config.DRIVER_RESOLVE_LOCK_TIMEOUT
+
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    # The holder died without cleaning up, take the lock over
+                    logger.warning(f"Removing stale driver cache lock {lock_path}")
+                    try:
+                        os.remove(lock_path)
+                    except FileNotFoundError:
+                        pass
+                    deadline = time.monotonic() + Config.DRIVER_RESOLVE_LOCK_TIMEOUT
+                time.sleep(0.05)
+
+        try:
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            yield
+        finally:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
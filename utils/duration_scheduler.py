@@ -0,0 +1,319 @@
+"""
+Pytest plugin scheduling xdist tests longest-expected-first from recorded durations.
+
+Durations are stored per browser in the pytest cache (.pytest_cache). With
+``-n``/``--dist load`` the plugin replaces xdist's load scheduler, which sends
+each worker batches of consecutive tests, by one that hands out the longest
+expected test still pending whenever a worker frees up (greedy longest-first),
+so the slowest tests start early and the tail of the run stays short. Unknown
+tests are estimated from the average of their parametrized siblings, class or
+module. Without xdist the collection order is kept, so module and class
+fixtures are set up once.
+"""
+import heapq
+import time
+
+import pytest
+from xdist.scheduler import LoadScheduling
+
+from utils.config import Config
+from utils.logger import logger
+
+
+CACHE_KEY = "orangehrm/durations"
+
+# Weight of the latest run when updating a recorded duration
+SMOOTHING = 0.5
+
+# Estimate used when nothing is known about a test or its neighbours
+DEFAULT_ESTIMATE = 5.0
+
+
+class DurationStore:
+    """
+    Recorded per-test durations, keyed by browser and test node ID
+    """
+
+    def __init__(self, data=None):
+        """
+        Initialize the store
+
+        :param data: Dictionary {browser: {nodeid: seconds}} loaded from the cache
+        """
+        self.data = data or {}
+        self._averages = {}
+
+    def record(self, browser, nodeid, seconds):
+        """
+        Update the recorded duration of a test
+
+        :param browser: Browser the test ran on
+        :param nodeid: Test node ID
+        :param seconds: Measured duration (setup + call + teardown)
+        """
+        durations = self.data.setdefault(browser, {})
+        previous = durations.get(nodeid)
+        durations[nodeid] = seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous
+        self._averages.pop(browser, None)
+
+    def estimate(self, browser, nodeid):
+        """
+        Expected duration of a test
+
+        :param browser: Browser the test will run on
+        :param nodeid: Test node ID
+        :return: Seconds (recorded value, else the average of the closest known group)
+        """
+        durations = self.data.get(browser, {})
+        if nodeid in durations:
+            return durations[nodeid]
+
+        averages = self._group_averages(browser)
+        for group in self.groups(nodeid):
+            if group in averages:
+                return averages[group]
+        return averages.get("", DEFAULT_ESTIMATE)
+
+    @staticmethod
+    def groups(nodeid):
+        """
+        Groups a test belongs to, from the most to the least specific
+
+        :param nodeid: Test node ID, e.g. tests/test_login.py::TestLogin::test_x[param]
+        :return: List of group keys (function, class, module)
+        """
+        function = nodeid.split("[", 1)[0]
+        parts = function.split("::")
+        return ["::".join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+    def _group_averages(self, browser):
+        """
+        Average recorded duration of every group (memoized per browser)
+
+        :param browser: Browser name
+        :return: Dictionary {group: seconds}, "" holds the overall average
+        """
+        if browser not in self._averages:
+            totals = {}
+            for nodeid, seconds in self.data.get(browser, {}).items():
+                for group in self.groups(nodeid) + [""]:
+                    total, count = totals.get(group, (0.0, 0))
+                    totals[group] = (total + seconds, count + 1)
+            self._averages[browser] = {group: total / count for group, (total, count) in totals.items()}
+        return self._averages[browser]
+
+
+def predict_makespan(durations, workers):
+    """
+    Simulate longest-first greedy scheduling of tests onto workers (what LongestFirstScheduling does)
+
+    :param durations: Iterable of expected test durations in seconds
+    :param workers: Number of workers
+    :return: Expected wall-clock seconds until the last worker finishes
+    """
+    loads = [0.0] * max(workers, 1)
+    for seconds in sorted(durations, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + seconds)
+    return max(loads)
+
+
+class LongestFirstScheduling(LoadScheduling):
+    """
+    xdist load scheduler sending every worker the longest expected pending test as soon as it has room
+
+    Each worker is kept two tests ahead (a worker only starts a test once it knows the one
+    after it, to decide which fixtures to tear down) and refilled one test at a time.
+    """
+
+    # Tests queued on a worker: the running one and the one after it
+    QUEUED_PER_WORKER = 2
+
+    def __init__(self, config, log=None, expected=None):
+        """
+        Initialize the scheduler
+
+        :param config: pytest config
+        :param log: xdist log producer
+        :param expected: Callable returning the expected seconds of a test node ID
+        """
+        super().__init__(config, log)
+        self.expected = expected
+
+    def schedule(self):
+        """
+        Order the collection by expected duration and fill every worker
+        """
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        self.pending[:] = sorted(range(len(self.collection)),
+                                 key=lambda index: self.expected(self.collection[index]), reverse=True)
+        for _ in range(self.QUEUED_PER_WORKER):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+
+    def check_schedule(self, node, duration=0):
+        """
+        Send a worker the next longest test once it has room, or shut it down when nothing is left
+
+        :param node: xdist worker node
+        :param duration: Duration of the test the worker just finished (unused)
+        """
+        if node.shutting_down:
+            return
+        if self.pending:
+            if len(self.node2pending[node]) < self.QUEUED_PER_WORKER:
+                self._send_tests(node, 1)
+        else:
+            node.shutdown()
+
+
+def pytest_addoption(parser):
+    """
+    Add the option disabling duration-aware scheduling
+    """
+    parser.addoption("--no-duration-schedule", action="store_true", default=False,
+                     help="Use xdist's own load scheduling instead of running the longest-expected tests first")
+
+
+def pytest_configure(config):
+    """
+    Register the plugin object ordering the tests
+    """
+    config.pluginmanager.register(DurationScheduler(config), "duration_scheduler")
+
+
+class DurationScheduler:
+    """
+    Plugin object ordering the collection and recording durations for the next run
+    """
+
+    def __init__(self, config):
+        """
+        Load recorded durations from the pytest cache
+
+        :param config: pytest config
+        """
+        self.config = config
+        self.cache = getattr(config, "cache", None)
+        self.store = DurationStore(self.cache.get(CACHE_KEY, {}) if self.cache else {})
+        self.predicted = None
+        self.test_seconds = {}
+        self.worker_busy = {}
+        self.started = time.monotonic()
+
+    def browser_of(self, nodeid):
+        """
+        Browser a test runs on
+
+        With several browsers in --browser the test ID carries the browser as one of its
+        parameters (the xdist controller only knows node IDs, not items).
+
+        :param nodeid: Test node ID
+        :return: Browser name
+        """
+        browsers = Config.parse_browsers(self.config.getoption("--browser"))
+        params = nodeid.partition("[")[2].rpartition("]")[0]
+        return next((token for token in params.split("-") if token in browsers), browsers[0])
+
+    def predict(self, nodeids):
+        """
+        Remember the predicted makespan for the collected tests
+
+        :param nodeids: Collected test node IDs
+        """
+        durations = [self.expected(nodeid) for nodeid in nodeids]
+        workers = getattr(self.config.option, "numprocesses", None) or 1
+        self.predicted = {"workers": workers, "durations": durations,
+                          "makespan": predict_makespan(durations, workers)}
+
+    def expected(self, nodeid):
+        """
+        Expected duration of a test on its browser
+
+        :param nodeid: Test node ID
+        :return: Seconds
+        """
+        return self.store.estimate(self.browser_of(nodeid), nodeid)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items):
+        """
+        Predict the makespan of a run without xdist (xdist runs predict once a worker has collected)
+        """
+        if not hasattr(self.config, "workerinput"):
+            self.predict([item.nodeid for item in items])
+
+    @pytest.hookimpl(optionalhook=True, tryfirst=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        """
+        Replace xdist's load scheduler by the longest-first one (other --dist modes are left alone)
+        """
+        if config.getoption("--no-duration-schedule") or config.getvalue("dist") != "load":
+            return None
+        return LongestFirstScheduling(config, log, self.expected)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        """
+        Predict the makespan on the xdist controller once the first worker has collected
+        """
+        if self.predicted is None:
+            self.predict(ids)
+
+    def pytest_runtest_logreport(self, report):
+        """
+        Add up setup, call and teardown time per test and per worker
+        """
+        if hasattr(self.config, "workerinput"):
+            return
+
+        self.test_seconds[report.nodeid] = self.test_seconds.get(report.nodeid, 0.0) + report.duration
+
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else "main"
+        self.worker_busy[worker] = self.worker_busy.get(worker, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        """
+        Persist the measured durations for the next run (controller only)
+        """
+        if hasattr(self.config, "workerinput") or self.cache is None:
+            return
+
+        for nodeid, seconds in self.test_seconds.items():
+            self.store.record(self.browser_of(nodeid), nodeid, seconds)
+        self.cache.set(CACHE_KEY, self.store.data)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """
+        Print predicted vs. actual makespan and what more or fewer workers would give
+        """
+        if self.predicted is None or not self.test_seconds:
+            return
+
+        workers = self.predicted["workers"]
+        actual = max(self.worker_busy.values())
+        wall_clock = time.monotonic() - self.started
+
+        terminalreporter.section("Duration-aware scheduling")
+        terminalreporter.write_line(f"Workers: {workers}")
+        terminalreporter.write_line(f"Predicted makespan: {self.predicted['makespan']:.1f}s")
+        terminalreporter.write_line(f"Actual makespan (busiest worker): {actual:.1f}s, "
+                                    f"wall clock {wall_clock:.1f}s")
+
+        predictions = ", ".join(
+            f"{count} workers: {predict_makespan(self.predicted['durations'], count):.1f}s"
+            for count in sorted({max(workers // 2, 1), workers * 2, workers * 4})
+        )
+        terminalreporter.write_line(f"Predicted makespan with {predictions}")
+        logger.info(f"Predicted makespan {self.predicted['makespan']:.1f}s, actual {actual:.1f}s")
@@ -0,0 +1,482 @@
+"""
+Test impact analysis: run only the tests affected by a change.
+
+DependencyRecorder notes, while tests (and their collection) run, which page
+object classes, locator constants and DataReader files they touch; static
+top-level imports add the utils modules of each test module and of conftest.py.
+The map is kept in the pytest cache. With --impacted[=BASE] the files changed
+since BASE (git diff plus uncommitted and untracked files) select the tests
+that depend on them; a change to only locator lines of a page object selects
+just the tests that used those locators. Anything the map cannot vouch for (no
+map, a map older than Config.IMPACT_MAP_MAX_AGE commits, git failures, changed
+files no test is known to depend on) falls back to the full run.
+"""
+import ast
+import fnmatch
+import inspect
+import os
+import re
+import subprocess
+
+import pytest
+
+from utils.config import Config
+from utils.logger import logger
+
+
+CACHE_KEY = "orangehrm/impact_map"
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Locator constants are UPPER_CASE class attributes, e.g. USERNAME_INPUT = (By.NAME, "username")
+LOCATOR_NAME = re.compile(r"^[A-Z][A-Z0-9_]*$")
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def relative_path(path):
+    """
+    Path relative to the repository root with forward slashes
+
+    :param path: Absolute or relative path
+    :return: Relative path string
+    """
+    return os.path.relpath(os.path.abspath(path), ROOT_DIR).replace(os.sep, "/")
+
+
+class DependencyRecorder:
+    """
+    Dependencies touched by the test (or collector) currently running in this process
+    """
+
+    current = None
+    dependencies = {}
+    _locator_symbols = {}
+
+    @staticmethod
+    def record_file(path):
+        """
+        Record that the current test read a file
+
+        :param path: File path
+        """
+        if DependencyRecorder.current is not None:
+            DependencyRecorder._entry()["files"].add(relative_path(path))
+
+    @staticmethod
+    def record_page(page_class):
+        """
+        Record that the current test used a page object class (and its base classes)
+
+        :param page_class: Page object class
+        """
+        if DependencyRecorder.current is None:
+            return
+        files = DependencyRecorder._entry()["files"]
+        for cls in page_class.__mro__[:-1]:
+            source = inspect.getsourcefile(cls)
+            if source:
+                files.add(relative_path(source))
+
+    @staticmethod
+    def record_locators(page_class, locators):
+        """
+        Record the locator constants the current test used
+
+        :param page_class: Page object class the locators were used through
+        :param locators: Iterable of locator tuples
+        """
+        if DependencyRecorder.current is None:
+            return
+        symbols = DependencyRecorder._entry()["symbols"]
+        for locator in locators:
+            key = (page_class, tuple(locator))
+            if key not in DependencyRecorder._locator_symbols:
+                DependencyRecorder._locator_symbols[key] = DependencyRecorder._locator_symbol(*key)
+            if DependencyRecorder._locator_symbols[key]:
+                symbols.add(DependencyRecorder._locator_symbols[key])
+
+    @staticmethod
+    def _locator_symbol(page_class, locator):
+        """
+        Find the class attribute a locator tuple comes from
+
+        :param page_class: Page object class
+        :param locator: Locator tuple
+        :return: Symbol such as "pages/login_page.py::LoginPage.USERNAME_INPUT", or None for ad-hoc locators
+        """
+        for cls in page_class.__mro__[:-1]:
+            for name, value in vars(cls).items():
+                if LOCATOR_NAME.match(name) and value == locator:
+                    return f"{relative_path(inspect.getsourcefile(cls))}::{cls.__name__}.{name}"
+        return None
+
+    @staticmethod
+    def _entry():
+        """
+        Get the dependencies of the current test or collector, creating them on first use
+
+        :return: Dictionary {"files": set, "symbols": set}
+        """
+        return DependencyRecorder.dependencies.setdefault(DependencyRecorder.current,
+                                                          {"files": set(), "symbols": set()})
+
+
+def static_dependencies(path, seen=None):
+    """
+    Repository modules imported at module level by a file, transitively
+
+    :param path: Path of a Python file in the repository
+    :param seen: Set of relative paths already visited
+    :return: Set of relative paths, including the file itself
+    """
+    seen = set() if seen is None else seen
+    relative = relative_path(path)
+    if relative in seen or not os.path.exists(path):
+        return seen
+    seen.add(relative)
+
+    with open(path, 'r') as file:
+        tree = ast.parse(file.read(), path)
+
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules = [node.module]
+        else:
+            continue
+        for module in modules:
+            candidate = os.path.join(ROOT_DIR, *module.split(".")) + ".py"
+            if os.path.exists(candidate):
+                static_dependencies(candidate, seen)
+    return seen
+
+
+def locator_ranges(path):
+    """
+    Line ranges of the locator constants defined in a page object file
+
+    :param path: Path of the page object file
+    :return: Dictionary {symbol: (first line, last line)}
+    """
+    with open(path, 'r') as file:
+        tree = ast.parse(file.read(), path)
+
+    ranges = {}
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for statement in node.body:
+            if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                    and isinstance(statement.targets[0], ast.Name) and LOCATOR_NAME.match(statement.targets[0].id)
+                    and isinstance(statement.value, ast.Tuple)):
+                symbol = f"{relative_path(path)}::{node.name}.{statement.targets[0].id}"
+                ranges[symbol] = (statement.lineno, statement.end_lineno)
+    return ranges
+
+
+def git(*args):
+    """
+    Run a git command in the repository
+
+    :return: Standard output
+    """
+    return subprocess.run(["git", *args], cwd=ROOT_DIR, check=True, capture_output=True, text=True).stdout
+
+
+def changed_lines(base):
+    """
+    Files changed since a base revision (committed, uncommitted and untracked)
+
+    :param base: Git revision to compare against
+    :return: Dictionary {relative path: set of changed line numbers, empty when unknown (new or deleted file)}
+    """
+    merge_base = git("merge-base", base, "HEAD").strip()
+    changes = {}
+    path = None
+    for line in git("diff", "-U0", "--no-color", merge_base).splitlines():
+        if line.startswith("--- "):
+            path = line[6:] if line.startswith("--- a/") else None
+        elif line.startswith("+++ "):
+            path = line[6:] if line.startswith("+++ b/") else path
+            changes.setdefault(path, set())
+        elif path and HUNK_HEADER.match(line):
+            start, count = HUNK_HEADER.match(line).groups()
+            start, count = int(start), int(count) if count is not None else 1
+            # A pure deletion touches the lines around the position it happened at
+            changes[path].update(range(start, start + count) if count else (start, start + 1))
+
+    for path in git("ls-files", "--others", "--exclude-standard").splitlines():
+        changes.setdefault(path, set())
+    return changes
+
+
+class ImpactSelector:
+    """
+    Decides which collected tests are affected by the changed files
+    """
+
+    def __init__(self, impact_map, changes):
+        """
+        Index the changed files and symbols that have to be matched against the dependency map
+
+        :param impact_map: Dictionary {nodeid: {"files": [...], "symbols": [...]}} (collectors and tests)
+        :param changes: Dictionary produced by changed_lines()
+        """
+        self.impact_map = impact_map
+        self.changes = {path: lines for path, lines in changes.items()
+                        if not any(fnmatch.fnmatch(path, pattern) for pattern in Config.IMPACT_IGNORE)}
+        self.changed_files = set()
+        self.changed_symbols = set()
+        self.unmapped = []
+        self._classify()
+
+    def is_affected(self, nodeid):
+        """
+        Check whether a test depends on anything that changed
+
+        :param nodeid: Test node ID
+        :return: Boolean (True for tests missing from the map)
+        """
+        if nodeid not in self.impact_map:
+            return True
+
+        files, symbols = set(), set()
+        for key in self._prefixes(nodeid):
+            entry = self.impact_map.get(key, {})
+            files.update(entry.get("files", []))
+            symbols.update(entry.get("symbols", []))
+
+        return bool(files & self.changed_files or symbols & self.changed_symbols)
+
+    def _classify(self):
+        """
+        Split the changes into whole-file changes, locator-only changes and unmapped files
+        """
+        known_files = {path for entry in self.impact_map.values() for path in entry.get("files", [])}
+
+        for path, lines in self.changes.items():
+            absolute = os.path.join(ROOT_DIR, path)
+            if path.startswith("pages/") and path.endswith(".py") and lines and os.path.exists(absolute):
+                ranges = locator_ranges(absolute)
+                touched = {symbol for symbol, (first, last) in ranges.items()
+                           if any(first <= line <= last for line in lines)}
+                covered = {line for first, last in ranges.values() for line in range(first, last + 1)}
+                if touched and lines <= covered:
+                    self.changed_symbols.update(touched)
+                    continue
+
+            if path in known_files or path.startswith("tests/"):
+                self.changed_files.add(path)
+            elif path.startswith("data/"):
+                # No test read this file, so nothing depends on it
+                continue
+            else:
+                self.unmapped.append(path)
+
+    @staticmethod
+    def _prefixes(nodeid):
+        """
+        The test and the collectors (module, class) it was collected by
+
+        :param nodeid: Test node ID
+        :return: List of node IDs
+        """
+        parts = nodeid.split("::")
+        return ["::".join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+
+def pytest_addoption(parser):
+    """
+    Add the option selecting only the tests affected by a change
+    """
+    parser.addoption("--impacted", action="store", nargs="?", const=Config.IMPACT_BASE_REF, default=None,
+                     metavar="BASE",
+                     help="Only run tests affected by changes since BASE (default %(const)s), "
+                          "falling back to a full run when the dependency map cannot decide")
+
+
+def pytest_configure(config):
+    """
+    Register the plugin object recording dependencies and selecting tests
+    """
+    config.pluginmanager.register(ImpactAnalysis(config), "impact_analysis")
+
+
+class ImpactAnalysis:
+    """
+    Plugin object recording dependencies and deselecting unaffected tests
+    """
+
+    def __init__(self, config):
+        """
+        Plan the test selection when --impacted is given
+
+        :param config: pytest config
+        """
+        self.config = config
+        self.cache = getattr(config, "cache", None)
+        self.base = config.getoption("--impacted")
+        self.selector = None
+        self.fallback_reason = None
+        self.deselected = 0
+        self.selected = None
+
+        if self.base:
+            self.selector, self.fallback_reason = self._plan()
+
+    def _plan(self):
+        """
+        Build the selector, or explain why the full suite has to run
+
+        :return: Tuple (ImpactSelector or None, fallback reason or None)
+        """
+        stored = self.cache.get(CACHE_KEY, None) if self.cache else None
+        if not stored or not stored.get("commit"):
+            return None, "no dependency map recorded yet"
+
+        try:
+            if subprocess.run(["git", "merge-base", "--is-ancestor", stored["commit"], "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True).returncode != 0:
+                return None, f"dependency map was recorded on {stored['commit'][:10]}, not an ancestor of HEAD"
+            age = int(git("rev-list", "--count", f"{stored['commit']}..HEAD").strip())
+            if age > Config.IMPACT_MAP_MAX_AGE:
+                return None, f"dependency map is {age} commits old (limit {Config.IMPACT_MAP_MAX_AGE})"
+            changes = changed_lines(self.base)
+        except (subprocess.CalledProcessError, OSError) as e:
+            return None, f"git failed: {e}"
+
+        selector = ImpactSelector(stored["tests"], changes)
+        if selector.unmapped:
+            return None, f"changes outside the dependency map: {', '.join(sorted(selector.unmapped)[:5])}"
+        return selector, None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector):
+        """
+        Attribute data read while collecting (e.g. parametrization) to the collector
+        """
+        previous, DependencyRecorder.current = DependencyRecorder.current, collector.nodeid or None
+        if isinstance(collector, pytest.Module):
+            # Page objects are recorded precisely at runtime, an import alone does not make a test depend on them
+            imported = static_dependencies(str(collector.path))
+            imported |= static_dependencies(os.path.join(ROOT_DIR, "conftest.py"))
+            DependencyRecorder._entry()["files"].update(path for path in imported if not path.startswith("pages/"))
+        yield
+        DependencyRecorder.current = previous
+
+    def pytest_collection_modifyitems(self, config, items):
+        """
+        Drop the tests no changed file can affect
+        """
+        if self.selector is None:
+            return
+
+        selected, deselected = [], []
+        for item in items:
+            (selected if self.selector.is_affected(item.nodeid) else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        self.selected = len(selected)
+
+    def pytest_deselected(self, items):
+        """
+        Count the tests deselected by this or any other plugin
+        """
+        self.deselected += len(items)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        """
+        Attribute the dependencies recorded while a test runs to it
+        """
+        DependencyRecorder.current = item.nodeid
+        yield
+        DependencyRecorder.current = None
+
+    def pytest_sessionfinish(self, session):
+        """
+        Ship recorded dependencies to the controller, or merge them into the stored map
+        """
+        recorded = {nodeid: {"files": sorted(entry["files"]), "symbols": sorted(entry["symbols"])}
+                    for nodeid, entry in DependencyRecorder.dependencies.items()}
+
+        if hasattr(self.config, "workeroutput"):
+            self.config.workeroutput["impact_map"] = recorded
+            self.config.workeroutput["impact_deselected"] = self.deselected
+            return
+
+        self._store(recorded, full_run=self._is_full_run(session))
+
+        if self.selector is not None and self.deselected and session.exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED:
+            # Nothing affected by the change is a successful run, not an empty one
+            session.exitstatus = pytest.ExitCode.OK
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        """
+        Merge the dependencies recorded by an xdist worker
+        """
+        output = getattr(node, "workeroutput", {})
+        # Every worker collects and deselects the same tests
+        self.deselected = max(self.deselected, output.get("impact_deselected", 0))
+        recorded = output.get("impact_map", {})
+        for nodeid, entry in recorded.items():
+            merged = DependencyRecorder.dependencies.setdefault(nodeid, {"files": set(), "symbols": set()})
+            merged["files"].update(entry["files"])
+            merged["symbols"].update(entry["symbols"])
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        """
+        Count the selected tests as collected by an xdist worker
+        """
+        self.selected = len(ids)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """
+        Explain which tests were selected and why, or why the full suite ran
+        """
+        if not self.base or hasattr(self.config, "workerinput"):
+            return
+
+        terminalreporter.section("Test impact analysis")
+        if self.selector is None:
+            terminalreporter.write_line(f"Running the full suite: {self.fallback_reason}")
+            return
+
+        changed = sorted(self.selector.changed_files | self.selector.changed_symbols)
+        terminalreporter.write_line(f"Changes since {self.base}: {', '.join(changed) or 'none affecting tests'}")
+        terminalreporter.write_line(f"Selected {self.selected or 0} tests, deselected {self.deselected}")
+
+    def _is_full_run(self, session):
+        """
+        Whether this run collected and ran the whole suite (which refreshes the map's age)
+
+        :param session: pytest session
+        :return: Boolean
+        """
+        return (not self.base and not self.deselected and not self.config.option.collectonly
+                and self.config.args == [str(self.config.invocation_params.dir)]
+                and not session.shouldfail and not session.shouldstop)
+
+    def _store(self, recorded, full_run):
+        """
+        Merge recorded dependencies into the map in the pytest cache
+
+        :param recorded: Dictionary {nodeid: {"files": [...], "symbols": [...]}}
+        :param full_run: Whether to stamp the map with the current commit
+        """
+        if self.cache is None or not recorded:
+            return
+
+        stored = self.cache.get(CACHE_KEY, None) or {"commit": None, "tests": {}}
+        stored["tests"].update(recorded)
+        if full_run:
+            try:
+                stored["commit"] = git("rev-parse", "HEAD").strip()
+            except (subprocess.CalledProcessError, OSError) as e:
+                logger.warning(f"Could not stamp the test impact map with the current commit: {e}")
+        self.cache.set(CACHE_KEY, stored)
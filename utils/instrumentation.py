@@ -0,0 +1,374 @@
+"""
+WebDriver command latency instrumentation.
+
+CommandRecorder wraps a driver's execute() method so every WebDriver command is
+timed, and the `instrumented` decorator marks page-object methods so each command
+is attributed to the page-object call chain that issued it. The pytest plugin at
+the bottom of this module turns the samples into per-test and per-session
+p50/p95/p99 tables, attaches a folded-stack ("flame") breakdown to Allure and
+writes JSON files that can be compared across runs.
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import allure
+import pytest
+
+from utils.config import Config
+from utils.logger import RUN_ID, WORKER_ID
+
+
+def percentile(values, pct):
+    """
+    Percentile of a list of numbers using linear interpolation
+
+    :param values: List of numbers
+    :param pct: Percentile between 0 and 100
+    :return: Percentile value (0.0 for an empty list)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def latency_table(samples):
+    """
+    Summarize latency samples per key
+
+    :param samples: Dictionary {key: [seconds, ...]}
+    :return: Dictionary {key: {count, total, p50, p95, p99}} with times in milliseconds
+    """
+    return {
+        key: {
+            "count": len(values),
+            "total": sum(values) * 1000,
+            "p50": percentile(values, 50) * 1000,
+            "p95": percentile(values, 95) * 1000,
+            "p99": percentile(values, 99) * 1000,
+        }
+        for key, values in samples.items()
+    }
+
+
+def format_table(title, table):
+    """
+    Render a latency table as fixed-width text, slowest total first
+
+    :param title: Name of the first column
+    :param table: Dictionary produced by latency_table()
+    :return: Multi-line string
+    """
+    lines = [f"{title:<50} {'count':>7} {'total ms':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    for key, row in sorted(table.items(), key=lambda item: item[1]["total"], reverse=True):
+        lines.append(f"{key[:50]:<50} {row['count']:>7} {row['total']:>10.1f} "
+                     f"{row['p50']:>9.1f} {row['p95']:>9.1f} {row['p99']:>9.1f}")
+    return "\n".join(lines)
+
+
+class CommandRecorder:
+    """
+    Collects WebDriver command and page-object action timings for the current process
+    """
+
+    _instance = None
+
+    def __init__(self):
+        """
+        Initialize an empty, disabled recorder
+        """
+        self.enabled = False
+        self.commands = {}
+        self.actions = {}
+        self.stacks = {}
+        self._local = threading.local()
+        # Browsers are driven from several threads (health checks, warm spares, load generator users)
+        self._lock = threading.Lock()
+
+    @property
+    def current_test(self):
+        """
+        Node ID of the test running on the calling thread
+
+        Commands sent by other threads (e.g. load generator virtual users) are recorded
+        under "" so they count in the session totals but not in the running test.
+        """
+        return getattr(self._local, "test", "")
+
+    @current_test.setter
+    def current_test(self, nodeid):
+        self._local.test = nodeid
+
+    @classmethod
+    def instance(cls):
+        """
+        Get the recorder shared by the whole process
+
+        :return: CommandRecorder object
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def instrument(self, driver):
+        """
+        Time every command sent through a driver
+
+        :param driver: WebDriver instance
+        :return: The same driver
+        """
+        if getattr(driver, "_latency_instrumented", False):
+            return driver
+
+        execute = driver.execute
+
+        @functools.wraps(execute)
+        def timed_execute(driver_command, params=None):
+            if not self.enabled:
+                return execute(driver_command, params)
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.record_command(driver_command, time.perf_counter() - start)
+
+        driver.execute = timed_execute
+        driver._latency_instrumented = True
+        return driver
+
+    @contextmanager
+    def action(self, name):
+        """
+        Mark a page-object method as the issuer of the commands sent inside it
+
+        :param name: Name of the action, e.g. "LoginPage.login"
+        """
+        stack = self._stack()
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(self.actions, name, time.perf_counter() - start)
+            stack.pop()
+
+    def record_command(self, command, seconds):
+        """
+        Record one WebDriver command
+
+        :param command: Selenium command name, e.g. "clickElement"
+        :param seconds: Round-trip time
+        """
+        self._add(self.commands, command, seconds)
+        path = ";".join(self._stack() + [command])
+        with self._lock:
+            tests = self.stacks.setdefault(self.current_test, {})
+            tests[path] = tests.get(path, 0.0) + seconds
+
+    def samples(self, nodeid=None):
+        """
+        Copy the samples recorded so far, safe to read while other threads keep recording
+
+        :param nodeid: Test node ID, or None for every test
+        :return: Tuple of dictionaries (commands, actions, stacks): {nodeid: {key: samples}} for every test,
+                 or {key: samples} for the given test
+        """
+        def copy(per_test):
+            # Sample lists are copied, stack totals are plain numbers
+            return {key: list(values) if isinstance(values, list) else values for key, values in per_test.items()}
+
+        with self._lock:
+            stores = (self.commands, self.actions, self.stacks)
+            if nodeid is not None:
+                return tuple(copy(store.get(nodeid, {})) for store in stores)
+            return tuple({test: copy(per_test) for test, per_test in store.items()} for store in stores)
+
+    def _add(self, store, key, seconds):
+        """
+        Append a sample to a per-test store
+
+        :param store: Dictionary {nodeid: {key: [seconds]}}
+        :param key: Command or action name
+        :param seconds: Duration
+        """
+        with self._lock:
+            store.setdefault(self.current_test, {}).setdefault(key, []).append(seconds)
+
+    def _stack(self):
+        """
+        Page-object actions being executed by the calling thread, outermost first
+
+        :return: List of action names
+        """
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+
+def instrumented(method):
+    """
+    Decorator attributing the WebDriver commands issued by a page-object method to it
+
+    :param method: Page-object method
+    :return: Wrapped method
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        recorder = CommandRecorder.instance()
+        if not recorder.enabled:
+            return method(self, *args, **kwargs)
+        with recorder.action(f"{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def pytest_addoption(parser):
+    """
+    Add the option enabling the latency report
+    """
+    parser.addoption("--latency-report", action="store_true", default=Config.LATENCY_REPORT,
+                     help="Record WebDriver command latencies and report p50/p95/p99 per test and session")
+
+
+def pytest_configure(config):
+    """
+    Start recording and register the report plugin when the latency report is enabled
+    """
+    if config.getoption("--latency-report"):
+        CommandRecorder.instance().enabled = True
+        config.pluginmanager.register(LatencyReport(config), "latency_report")
+
+
+class LatencyReport:
+    """
+    Plugin object turning recorded samples into reports
+    """
+
+    def __init__(self, config):
+        """
+        Initialize an empty report
+
+        :param config: pytest config
+        """
+        self.config = config
+        self.recorder = CommandRecorder.instance()
+        self.session_commands = {}
+        self.session_actions = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        """
+        Attribute the commands sent by the test's thread to the test
+        """
+        self.recorder.current_test = item.nodeid
+        yield
+        self.recorder.current_test = ""
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        """
+        Attach the latency tables and folded stacks of a test to Allure
+        """
+        yield
+        if call.when != "call":
+            return
+
+        commands, actions, stacks = self.recorder.samples(item.nodeid)
+        if not commands:
+            return
+
+        report = (format_table("WebDriver command", latency_table(commands)) + "\n\n"
+                  + format_table("Page-object action", latency_table(actions)))
+        allure.attach(report, name="Command latency", attachment_type=allure.attachment_type.TEXT)
+
+        flame = "\n".join(f"{path} {round(seconds * 1000)}" for path, seconds in sorted(stacks.items()))
+        allure.attach(flame, name="Command latency flame (folded stacks, ms)",
+                      attachment_type=allure.attachment_type.TEXT)
+
+    def pytest_sessionfinish(self, session):
+        """
+        Write this process's samples to JSON and ship them to the xdist controller
+        """
+        all_commands, all_actions, all_stacks = self.recorder.samples()
+        data = {
+            "run_id": RUN_ID,
+            "worker": WORKER_ID,
+            "tests": {
+                nodeid: {
+                    "commands": latency_table(commands),
+                    "actions": latency_table(all_actions.get(nodeid, {})),
+                    "stacks": all_stacks.get(nodeid, {}),
+                }
+                for nodeid, commands in all_commands.items()
+            },
+        }
+        self._merge_raw(all_commands, all_actions)
+        if data["tests"]:
+            self._write_json(f"command_latency_{RUN_ID}_{WORKER_ID}.json", data)
+
+        if hasattr(self.config, "workeroutput"):
+            self.config.workeroutput["command_latency"] = {"commands": self.session_commands,
+                                                           "actions": self.session_actions}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        """
+        Collect the samples sent back by an xdist worker
+        """
+        data = getattr(node, "workeroutput", {}).get("command_latency")
+        if data:
+            for key, values in data["commands"].items():
+                self.session_commands.setdefault(key, []).extend(values)
+            for key, values in data["actions"].items():
+                self.session_actions.setdefault(key, []).extend(values)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """
+        Write the session JSON report and print the session latency tables
+        """
+        if not self.session_commands:
+            return
+
+        commands = latency_table(self.session_commands)
+        actions = latency_table(self.session_actions)
+        self._write_json(f"command_latency_{RUN_ID}.json", {"run_id": RUN_ID, "commands": commands,
+                                                           "actions": actions})
+
+        terminalreporter.section("WebDriver command latency")
+        terminalreporter.write_line(format_table("WebDriver command", commands))
+        terminalreporter.write_line("")
+        terminalreporter.write_line(format_table("Page-object action", actions))
+
+    def _merge_raw(self, commands, actions):
+        """
+        Fold per-test samples into session-wide samples
+
+        :param commands: Dictionary {nodeid: {command: [seconds]}}
+        :param actions: Dictionary {nodeid: {action: [seconds]}}
+        """
+        for per_test in commands.values():
+            for key, values in per_test.items():
+                self.session_commands.setdefault(key, []).extend(values)
+        for per_test in actions.values():
+            for key, values in per_test.items():
+                self.session_actions.setdefault(key, []).extend(values)
+
+    @staticmethod
+    def _write_json(file_name, data):
+        """
+        Write a report file to Config.PERF_REPORT_DIR
+
+        :param file_name: File name
+        :param data: JSON serializable data
+        """
+        os.makedirs(Config.PERF_REPORT_DIR, exist_ok=True)
+        with open(os.path.join(Config.PERF_REPORT_DIR, file_name), 'w') as file:
+            json.dump(data, file, indent=2)
@@ -0,0 +1,528 @@
+"""
+Load generation: many virtual users going through the login flow at the same time.
+
+Each virtual user repeats login and logout until the run is over: LoginPage.login
+and DashboardPage.logout in "browser" mode, or the same requests through ApiClient
+in the lightweight "http" mode. Users start evenly spread over the ramp-up period
+and then keep going for the configured duration, so the timeline shows how
+latency and errors change as concurrency grows. In browser mode the users share
+a bounded pool of headless browsers and wait for a free one.
+
+Run it from the command line
+(``python -m utils.load_generator --target local --users 50 --mode http``), or
+from tests marked ``@pytest.mark.load(...)`` through the ``load_result`` fixture.
+Load tests are skipped unless pytest gets ``--load``.
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+
+from utils.api_client import ApiClient
+from utils.config import Config
+from utils.driver_factory import DriverFactory
+from utils.driver_pool import DriverPool
+from utils.instrumentation import format_table, latency_table, percentile
+from utils.logger import RUN_ID, WORKER_ID, logger
+
+
+class RunStopped(Exception):
+    """
+    Raised when the run ends before an iteration could start, so it is not recorded
+    """
+
+
+class LoadResult:
+    """
+    Samples of a load run and the reports built from them
+    """
+
+    def __init__(self, settings, samples, user_spans, elapsed):
+        """
+        Initialize the result of a finished run
+
+        :param settings: Dictionary describing the run (mode, users, ramp_up, duration, ...)
+        :param samples: List of (seconds since start at completion, step, seconds, error or None)
+        :param user_spans: List of (start, end) seconds since start, one per virtual user
+        :param elapsed: Wall-clock length of the run in seconds
+        """
+        self.settings = settings
+        self.samples = samples
+        self.user_spans = user_spans
+        self.elapsed = elapsed
+
+    @property
+    def iterations(self):
+        """
+        Samples of complete login/logout iterations, successful or not
+        """
+        return [sample for sample in self.samples if sample[1] == "iteration"]
+
+    @property
+    def errors(self):
+        """
+        Samples of iterations that failed
+        """
+        return [sample for sample in self.iterations if sample[3]]
+
+    @property
+    def throughput(self):
+        """
+        Completed iterations per second
+        """
+        return len(self.iterations) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self):
+        """
+        Share of iterations that failed (0.0 - 1.0)
+        """
+        return len(self.errors) / len(self.iterations) if self.iterations else 0.0
+
+    def steps(self):
+        """
+        Latency percentiles of successful steps
+
+        :return: Dictionary produced by latency_table()
+        """
+        samples = {}
+        for _, step, seconds, error in self.samples:
+            if not error:
+                samples.setdefault(step, []).append(seconds)
+        return latency_table(samples)
+
+    def error_counts(self):
+        """
+        Count the failed steps per error
+
+        :return: Dictionary {error description: count}
+        """
+        counts = {}
+        for _, _, _, error in self.errors:
+            counts[error] = counts.get(error, 0) + 1
+        return counts
+
+    def timeline(self, interval=None):
+        """
+        Throughput, errors and login latency per time bucket
+
+        :param interval: Bucket width in seconds (defaults to Config.LOAD_REPORT_INTERVAL)
+        :return: List of dictionaries, one per bucket
+        """
+        interval = interval or Config.LOAD_REPORT_INTERVAL
+        buckets = []
+        start = 0.0
+        while start < self.elapsed:
+            end = start + interval
+            in_bucket = [sample for sample in self.samples if start <= sample[0] < end]
+            iterations = [sample for sample in in_bucket if sample[1] == "iteration"]
+            logins = [sample[2] for sample in in_bucket if sample[1] == "login" and not sample[3]]
+            errors = sum(1 for sample in iterations if sample[3])
+            buckets.append({
+                "start": start,
+                "end": min(end, self.elapsed),
+                "users": sum(1 for user_start, user_end in self.user_spans if user_start < end and user_end > start),
+                "iterations": len(iterations),
+                "throughput": len(iterations) / (min(end, self.elapsed) - start),
+                "errors": errors,
+                "error_rate": errors / len(iterations) if iterations else 0.0,
+                "login_p50": percentile(logins, 50) * 1000,
+                "login_p95": percentile(logins, 95) * 1000,
+            })
+            start = end
+        return buckets
+
+    def summary_line(self):
+        """
+        One-line summary for logs and the terminal
+        """
+        login = self.steps().get("login", {})
+        return (f"{self.settings['mode']} mode, {self.settings['users']} users: {len(self.iterations)} iterations "
+                f"({self.throughput:.1f}/s), {self.error_rate:.1%} errors, "
+                f"login p95 {login.get('p95', 0.0):.0f} ms")
+
+    def report(self):
+        """
+        Human readable report
+
+        :return: Multi-line string
+        """
+        settings = self.settings
+        lines = [
+            f"Load run: {settings['mode']} mode against {settings['base_url']}, {settings['users']} users, "
+            f"{settings['ramp_up']:.0f}s ramp-up, {settings['duration']:.0f}s at full load",
+            f"Iterations: {len(self.iterations)} in {self.elapsed:.1f}s ({self.throughput:.1f}/s), "
+            f"errors: {len(self.errors)} ({self.error_rate:.1%})",
+            "",
+            format_table("Step", self.steps()),
+        ]
+
+        if self.errors:
+            lines += ["", "Errors:"]
+            lines += [f"  {count:>5} x {error}" for error, count in
+                      sorted(self.error_counts().items(), key=lambda item: item[1], reverse=True)]
+
+        lines += ["", f"{'time':>11} {'users':>6} {'iter/s':>8} {'errors':>7} {'login p50 ms':>13} {'login p95 ms':>13}"]
+        for bucket in self.timeline():
+            span = f"{bucket['start']:.1f}-{bucket['end']:.1f}s"
+            lines.append(f"{span:>11} {bucket['users']:>6} "
+                         f"{bucket['throughput']:>8.1f} {bucket['error_rate']:>7.1%} "
+                         f"{bucket['login_p50']:>13.1f} {bucket['login_p95']:>13.1f}")
+        return "\n".join(lines)
+
+    def as_dict(self):
+        """
+        Serialize the report
+
+        :return: JSON serializable dictionary with the settings, totals, step latencies and timeline
+        """
+        return {
+            "settings": self.settings,
+            "elapsed": self.elapsed,
+            "iterations": len(self.iterations),
+            "throughput": self.throughput,
+            "error_rate": self.error_rate,
+            "errors": self.error_counts(),
+            "steps": self.steps(),
+            "timeline": self.timeline(),
+        }
+
+    def write_json(self, name="load"):
+        """
+        Write the report as JSON to Config.PERF_REPORT_DIR
+
+        :param name: File name prefix
+        :return: Path of the written file
+        """
+        os.makedirs(Config.PERF_REPORT_DIR, exist_ok=True)
+        path = os.path.join(Config.PERF_REPORT_DIR, f"{name}_{RUN_ID}_{WORKER_ID}.json")
+        with open(path, 'w') as file:
+            json.dump(self.as_dict(), file, indent=2)
+        return path
+
+
+class BrowserPool:
+    """
+    Fixed number of headless browsers shared by browser-mode virtual users
+    """
+
+    def __init__(self, browser, size):
+        """
+        Initialize an empty pool (browsers are launched by start())
+
+        :param browser: Browser to launch
+        :param size: Number of browsers
+        """
+        self.browser = browser
+        self.size = size
+        self._idle = queue.Queue()
+
+    def start(self):
+        """
+        Launch all browsers in parallel before the load starts
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            for driver in executor.map(lambda _: DriverFactory.create_driver(self.browser), range(self.size)):
+                self._idle.put(driver)
+
+    def get(self, stop):
+        """
+        Wait for a free browser
+
+        :param stop: Event ending the wait early
+        :return: WebDriver instance, or None if the run stopped first
+        """
+        while not stop.is_set():
+            try:
+                driver = self._idle.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            # A browser lost after an error is replaced by the user that needs it next
+            return driver or DriverFactory.create_driver(self.browser)
+        return None
+
+    def put(self, driver):
+        """
+        Hand a browser back after a successful iteration
+        """
+        self._idle.put(driver)
+
+    def replace(self, driver):
+        """
+        Quit a browser left in an unknown state; a new one is launched when next needed
+        """
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Failed to quit load test browser: {e}")
+        self._idle.put(None)
+
+    def close(self):
+        """
+        Quit every idle browser (all of them once the users have finished)
+        """
+        while not self._idle.empty():
+            driver = self._idle.get()
+            if driver:
+                driver.quit()
+
+
+class LoadGenerator:
+    """
+    Drives virtual users through the login flow and collects timings
+    """
+
+    def __init__(self, base_url=None, mode=None, users=None, ramp_up=None, duration=None, browser=None,
+                 pool_size=None, think_time=None, credentials=None):
+        """
+        Initialize the load generator
+
+        :param base_url: Application URL (defaults to Config.BASE_URL)
+        :param mode: "http" or "browser" (defaults to Config.LOAD_MODE)
+        :param users: Number of virtual users (defaults to Config.LOAD_USERS)
+        :param ramp_up: Seconds over which users start (defaults to Config.LOAD_RAMP_UP)
+        :param duration: Seconds to keep going once all users have started (defaults to Config.LOAD_DURATION)
+        :param browser: Browser of browser-mode users (defaults to Config.BROWSER)
+        :param pool_size: Browsers shared by browser-mode users (defaults to Config.LOAD_BROWSER_POOL)
+        :param think_time: Pause between iterations of a user in seconds (defaults to Config.LOAD_THINK_TIME)
+        :param credentials: List of (username, password) handed out to users in turn
+                            (defaults to Config.DEFAULT_USERNAME / Config.DEFAULT_PASSWORD)
+        """
+        self.base_url = (base_url or Config.BASE_URL).rstrip("/")
+        self.mode = mode or Config.LOAD_MODE
+        self.users = users or Config.LOAD_USERS
+        self.ramp_up = Config.LOAD_RAMP_UP if ramp_up is None else ramp_up
+        self.duration = Config.LOAD_DURATION if duration is None else duration
+        self.browser = browser or Config.BROWSER
+        self.pool_size = min(pool_size or Config.LOAD_BROWSER_POOL, self.users)
+        self.think_time = Config.LOAD_THINK_TIME if think_time is None else think_time
+        self.credentials = credentials or [(Config.DEFAULT_USERNAME, Config.DEFAULT_PASSWORD)]
+
+        if self.mode not in ("http", "browser"):
+            raise ValueError(f"Unsupported load mode: {self.mode}")
+
+        self._samples = []
+        self._user_spans = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = None
+        self._pool = None
+
+    def run(self):
+        """
+        Run the load and wait for every user to finish its last iteration
+
+        :return: LoadResult object
+        """
+        logger.info(f"Starting {self.mode} load: {self.users} users, {self.ramp_up}s ramp-up, "
+                    f"{self.duration}s at full load against {self.base_url}")
+
+        original_headless, original_base_url = Config.HEADLESS, Config.BASE_URL
+        if self.mode == "browser":
+            Config.HEADLESS = True
+            # Page objects build their URLs from Config.BASE_URL
+            Config.BASE_URL = self.base_url
+            self._pool = BrowserPool(self.browser, self.pool_size)
+            self._pool.start()
+
+        try:
+            self._started = time.monotonic()
+            deadline = self._started + self.ramp_up + self.duration
+            threads = [threading.Thread(target=self._virtual_user, args=(index, deadline), name=f"load-user-{index}",
+                                        daemon=True) for index in range(self.users)]
+            for thread in threads:
+                thread.start()
+            try:
+                for thread in threads:
+                    thread.join()
+            except KeyboardInterrupt:
+                self._stop.set()
+                for thread in threads:
+                    thread.join()
+            elapsed = time.monotonic() - self._started
+        finally:
+            if self._pool:
+                self._pool.close()
+            Config.HEADLESS, Config.BASE_URL = original_headless, original_base_url
+
+        result = LoadResult({
+            "mode": self.mode,
+            "base_url": self.base_url,
+            "users": self.users,
+            "ramp_up": self.ramp_up,
+            "duration": self.duration,
+            "browser": self.browser if self.mode == "browser" else None,
+            "pool_size": self.pool_size if self.mode == "browser" else None,
+            "think_time": self.think_time,
+        }, self._samples, self._user_spans, elapsed)
+        logger.info(f"Load run finished: {result.summary_line()}")
+        return result
+
+    def _virtual_user(self, index, deadline):
+        """
+        Wait for this user's start time, then repeat the login flow until the deadline
+
+        :param index: User number
+        :param deadline: time.monotonic() value after which no new iteration starts
+        """
+        if self._stop.wait(index * self.ramp_up / self.users):
+            return
+
+        username, password = self.credentials[index % len(self.credentials)]
+        client = ApiClient(self.base_url, pool_size=1, retries=0) if self.mode == "http" else None
+        user_start = time.monotonic() - self._started
+        try:
+            while not self._stop.is_set() and time.monotonic() < deadline:
+                try:
+                    with self._measure("iteration"):
+                        if client:
+                            self._http_iteration(client, username, password)
+                        else:
+                            self._browser_iteration(username, password)
+                except Exception:
+                    # Counted in the samples, the user carries on with its next iteration
+                    pass
+                if self.think_time:
+                    self._stop.wait(self.think_time)
+        finally:
+            if client:
+                client.close()
+            with self._lock:
+                self._user_spans.append((user_start, time.monotonic() - self._started))
+
+    def _http_iteration(self, client, username, password):
+        """
+        The requests LoginPage.login and DashboardPage.logout make, without a browser
+        """
+        with self._measure("login"):
+            if not client.login(username, password):
+                raise AssertionError(f"Login rejected for {username}")
+        with self._measure("dashboard"):
+            if not client.is_session_valid():
+                raise AssertionError("Dashboard redirected to the login page")
+        with self._measure("logout"):
+            client.logout()
+
+    def _browser_iteration(self, username, password):
+        """
+        Log in and out through the page objects on a browser from the pool
+        """
+        from pages.login_page import LoginPage
+
+        with self._measure("browser wait"):
+            driver = self._pool.get(self._stop)
+        if driver is None:
+            raise RunStopped()
+
+        try:
+            with self._measure("login"):
+                dashboard_page = LoginPage(driver).open().login(username, password)
+                if not dashboard_page.is_session_valid():
+                    raise AssertionError(f"Dashboard not displayed after logging in as {username}")
+            with self._measure("logout"):
+                dashboard_page.logout().wait_until_ready()
+            DriverPool.reset_state(driver)
+        except Exception:
+            self._pool.replace(driver)
+            raise
+
+        self._pool.put(driver)
+
+    @contextmanager
+    def _measure(self, step):
+        """
+        Time a step and record it, with the error if it raised (nothing is recorded for RunStopped)
+        """
+        start = time.monotonic()
+        error = None
+        stopped = False
+        try:
+            yield
+        except RunStopped:
+            stopped = True
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e).splitlines()[0][:120] if str(e) else ''}".rstrip(": ")
+            raise
+        finally:
+            end = time.monotonic()
+            if not stopped:
+                with self._lock:
+                    self._samples.append((end - self._started, step, end - start, error))
+
+
+def pytest_addoption(parser):
+    """
+    Add the option enabling the load tests
+    """
+    parser.addoption("--load", action="store_true", default=False,
+                     help="Run the load tests (marked load), which are skipped by default")
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip load tests unless --load is given
+    """
+    if config.getoption("--load"):
+        return
+    skip = pytest.mark.skip(reason="load test, run with --load")
+    for item in items:
+        if item.get_closest_marker("load"):
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    List the load test results (reported through the load_result fixture's user properties)
+    """
+    lines = [f"{report.nodeid}: {dict(report.user_properties)['load']}"
+             for report in terminalreporter.stats.get("passed", []) + terminalreporter.stats.get("failed", [])
+             if report.when == "call" and "load" in dict(getattr(report, "user_properties", ()))]
+    if lines:
+        terminalreporter.section("Load tests")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive concurrent virtual users through the login flow")
+    parser.add_argument("--target", choices=("remote", "local"), default="local",
+                        help="Load the bundled local stand-in (default) or BASE_URL")
+    parser.add_argument("--mode", choices=("http", "browser"), default=Config.LOAD_MODE)
+    parser.add_argument("--users", type=int, default=Config.LOAD_USERS, help="Number of virtual users")
+    parser.add_argument("--ramp-up", type=float, default=Config.LOAD_RAMP_UP, help="Seconds to start all users")
+    parser.add_argument("--duration", type=float, default=Config.LOAD_DURATION,
+                        help="Seconds to keep going once all users have started")
+    parser.add_argument("--browser", default=Config.BROWSER, help="Browser of browser-mode users")
+    parser.add_argument("--pool-size", type=int, default=Config.LOAD_BROWSER_POOL,
+                        help="Headless browsers shared by browser-mode users")
+    parser.add_argument("--think-time", type=float, default=Config.LOAD_THINK_TIME,
+                        help="Pause between iterations of a user in seconds")
+    parser.add_argument("--interval", type=float, default=Config.LOAD_REPORT_INTERVAL,
+                        help="Width of the report's timeline buckets in seconds")
+    parser.add_argument("--json", default="load", help="Name prefix of the JSON report in PERF_REPORT_DIR")
+    args = parser.parse_args()
+
+    Config.LOAD_REPORT_INTERVAL = args.interval
+    server = None
+    if args.target == "local":
+        from utils.local_server import LocalOrangeHRMServer
+        server = LocalOrangeHRMServer().start()
+        Config.BASE_URL = server.url
+
+    try:
+        load_result = LoadGenerator(mode=args.mode, users=args.users, ramp_up=args.ramp_up, duration=args.duration,
+                                    browser=args.browser, pool_size=args.pool_size,
+                                    think_time=args.think_time).run()
+    finally:
+        if server:
+            server.stop()
+
+    print(load_result.report())
+    print(f"\nJSON report written to {load_result.write_json(args.json)}")
@@ -0,0 +1,458 @@
+import argparse
+import html
+import itertools
+import json
+import secrets
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from utils.config import Config
+from utils.data_reader import DataReader
+from utils.logger import logger
+
+
+LOGIN_PATH = "/web/index.php/auth/login"
+VALIDATE_PATH = "/web/index.php/auth/validate"
+LOGOUT_PATH = "/web/index.php/auth/logout"
+FORGOT_PASSWORD_PATH = "/web/index.php/auth/requestPasswordResetCode"
+DASHBOARD_PATH = "/web/index.php/dashboard/index"
+LOGO_PATH = "/web/images/ohrm_branding.png"
+USERS_API_PATH = "/web/index.php/api/v2/admin/users"
+EMPLOYEES_API_PATH = "/web/index.php/api/v2/pim/employees"
+SESSION_COOKIE = "orangehrm"
+
+# Unused CSRF tokens kept per server; the oldest are dropped first (forms opened and never submitted)
+CSRF_TOKEN_LIMIT = 10000
+
+# Employees system users can be attached to
+EMPLOYEES = [
+    {"empNumber": 1, "employeeId": "0001", "firstName": "Paul", "lastName": "Collings"},
+    {"empNumber": 2, "employeeId": "0002", "firstName": "Linda", "lastName": "Anderson"},
+]
+USER_ROLES = {1: "Admin", 2: "ESS"}
+
+# Side menu entries of the real application: (name, path)
+MENU_ITEMS = [
+    ("Admin", "/web/index.php/admin/viewAdminModule"),
+    ("PIM", "/web/index.php/pim/viewPimModule"),
+    ("Leave", "/web/index.php/leave/viewLeaveModule"),
+    ("Time", "/web/index.php/time/viewTimeModule"),
+    ("Recruitment", "/web/index.php/recruitment/viewRecruitmentModule"),
+    ("My Info", "/web/index.php/pim/viewMyDetails"),
+    ("Performance", "/web/index.php/performance/viewPerformanceModule"),
+    ("Dashboard", DASHBOARD_PATH),
+    ("Directory", "/web/index.php/directory/viewDirectory"),
+    ("Maintenance", "/web/index.php/maintenance/viewMaintenanceModule"),
+    ("Claim", "/web/index.php/claim/viewClaimModule"),
+    ("Buzz", "/web/index.php/buzz/viewBuzz"),
+]
+MODULE_TITLES = {path: name for name, path in MENU_ITEMS}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>OrangeHRM</title>
+<style>
+body {{ font-family: sans-serif; margin: 0; }}
+.orangehrm-login-branding img {{ width: 200px; height: 50px; }}
+.oxd-input-field-error-message {{ color: #eb0910; font-size: 12px; }}
+.oxd-alert-content-text {{ color: #eb0910; }}
+.oxd-main-menu {{ float: left; width: 200px; list-style: none; padding: 0; }}
+.oxd-main-menu-item {{ display: block; padding: 6px; }}
+.oxd-dropdown-menu {{ display: none; list-style: none; }}
+.oxd-dropdown-menu.--active {{ display: block; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>"""
+
+LOGIN_BODY = """<div class="orangehrm-login-layout">
+  <div class="orangehrm-login-branding"><img src="{logo}" alt="company-branding"></div>
+  <h5 class="orangehrm-login-title">Login</h5>
+  {alert}
+  <form class="oxd-form" method="post" action="{action}">
+    <input type="hidden" name="_token" value="{token}">
+    <div class="oxd-input-group">
+      <label>Username</label>
+      <input class="oxd-input" name="username" placeholder="Username" value="{username}">
+      {username_error}
+    </div>
+    <div class="oxd-input-group">
+      <label>Password</label>
+      <input class="oxd-input" type="password" name="password" placeholder="Password">
+      {password_error}
+    </div>
+    <button type="submit" class="oxd-button orangehrm-login-button">Login</button>
+    <div class="orangehrm-login-forgot" onclick="window.location='{forgot}'">
+      <p class="oxd-text orangehrm-login-forgot-header">Forgot your password?</p>
+    </div>
+  </form>
+</div>"""
+
+ALERT_HTML = """<div class="oxd-alert oxd-alert--error" role="alert">
+    <p class="oxd-text oxd-alert-content-text">{message}</p>
+  </div>"""
+
+FIELD_ERROR_HTML = """<span class="oxd-text oxd-input-field-error-message">Required</span>"""
+
+APP_BODY = """<aside class="oxd-sidepanel">
+  <ul class="oxd-main-menu">
+    {menu}
+  </ul>
+</aside>
+<header class="oxd-topbar">
+  <div class="oxd-topbar-header-breadcrumb"><h6 class="oxd-text oxd-topbar-header-breadcrumb-module">{title}</h6></div>
+  <ul>
+    <li class="oxd-userdropdown">
+      <span class="oxd-userdropdown-tab"
+            onclick="document.querySelector('.oxd-dropdown-menu').classList.toggle('--active')">
+        <p class="oxd-userdropdown-name">{username}</p>
+      </span>
+      <ul class="oxd-dropdown-menu" role="menu">
+        <li><a href="#" role="menuitem" class="oxd-userdropdown-link">About</a></li>
+        <li><a href="{logout}" role="menuitem" class="oxd-userdropdown-link">Logout</a></li>
+      </ul>
+    </li>
+  </ul>
+</header>
+<main class="oxd-layout-context"><p class="oxd-text">{title}</p></main>"""
+
+MENU_ITEM_HTML = """<li class="oxd-main-menu-item-wrapper"><a class="oxd-main-menu-item" href="{href}"><span class="oxd-text oxd-main-menu-item--name">{name}</span></a></li>"""
+
+
+def _build_logo_png(width=200, height=50):
+    """
+    Build a small solid-colour PNG used as the branding logo
+
+    :param width: Image width in pixels
+    :param height: Image height in pixels
+    :return: PNG bytes
+    """
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+    row = b"\x00" + b"\xf2\x80\x22" * width
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b""))
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler serving the subset of OrangeHRM used by the page objects
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately: with Nagle's algorithm every reused
+    # (keep-alive) connection would wait for the client's delayed ACK, ~40 ms per request
+    disable_nagle_algorithm = True
+    logo_png = _build_logo_png()
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+
+        if path == LOGIN_PATH:
+            self._send_html(self._render_login())
+        elif path == LOGOUT_PATH:
+            self.server.sessions.pop(self._session_token(), None)
+            self._redirect(LOGIN_PATH, clear_session=True)
+        elif path == FORGOT_PASSWORD_PATH:
+            self._send_html(PAGE_TEMPLATE.format(body='<h6 class="oxd-text">Reset Password</h6>'))
+        elif path == LOGO_PATH:
+            self._send(200, "image/png", self.logo_png)
+        elif path == "/robots.txt":
+            self._send(200, "text/plain", b"User-agent: *\nDisallow: /\n")
+        elif path in MODULE_TITLES:
+            username = self.server.sessions.get(self._session_token())
+            if username is None:
+                self._redirect(LOGIN_PATH)
+            else:
+                self._send_html(self._render_app(MODULE_TITLES[path], username))
+        elif path == EMPLOYEES_API_PATH:
+            self._api(lambda: {"data": EMPLOYEES[:int(self._query().get("limit", len(EMPLOYEES)))]})
+        elif path == USERS_API_PATH:
+            self._api(lambda: {"data": self.server.list_accounts(self._query().get("username"))})
+        elif path.startswith(USERS_API_PATH + "/"):
+            self._api(lambda: {"data": self.server.public_account(int(path.rsplit("/", 1)[1]))})
+        elif path in ("/", "/web/index.php", "/web/index.php/"):
+            self._redirect(DASHBOARD_PATH if self._session_token() in self.server.sessions else LOGIN_PATH)
+        else:
+            self._send(404, "text/plain", b"Not Found")
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path == USERS_API_PATH:
+            # Read the body before authenticating so a rejected request leaves the connection usable
+            body = self._read_body()
+            self._api(lambda: {"data": self.server.create_account(json.loads(body or b"{}"))})
+            return
+        if path != VALIDATE_PATH:
+            self._send(404, "text/plain", b"Not Found")
+            return
+
+        form = parse_qs(self._read_body().decode(), keep_blank_values=True)
+        username = form.get("username", [""])[0]
+        password = form.get("password", [""])[0]
+
+        if not self.server.consume_csrf_token(form.get("_token", [""])[0]):
+            self._redirect(f"{LOGIN_PATH}?error=csrf")
+        elif not username or not password:
+            self._send_html(self._render_login(username=username, required=True))
+        elif self.server.check_credentials(username, password):
+            token = secrets.token_hex(16)
+            self.server.sessions[token] = username
+            self._redirect(DASHBOARD_PATH, session_token=token)
+        else:
+            self._redirect(f"{LOGIN_PATH}?error=invalid")
+
+    def do_DELETE(self):
+        if urlparse(self.path).path == USERS_API_PATH:
+            body = self._read_body()
+            self._api(lambda: {"data": self.server.delete_accounts(json.loads(body or b"{}")["ids"])})
+        else:
+            self._send(404, "text/plain", b"Not Found")
+
+    def log_message(self, format, *args):
+        logger.debug(f"Local server: {format % args}")
+
+    def _render_login(self, username="", required=False):
+        invalid = "error=invalid" in urlparse(self.path).query
+        # Like the real application, empty fields are only reported under the fields themselves
+        alert = ""
+        if invalid:
+            alert = ALERT_HTML.format(message="Invalid credentials")
+        elif "error=csrf" in urlparse(self.path).query:
+            alert = ALERT_HTML.format(message="CSRF token validation failed")
+
+        body = LOGIN_BODY.format(
+            logo=LOGO_PATH,
+            alert=alert,
+            action=VALIDATE_PATH,
+            token=self.server.issue_csrf_token(),
+            username=html.escape(username),
+            username_error=FIELD_ERROR_HTML if required and not username else "",
+            password_error=FIELD_ERROR_HTML if required else "",
+            forgot=FORGOT_PASSWORD_PATH,
+        )
+        return PAGE_TEMPLATE.format(body=body)
+
+    @staticmethod
+    def _render_app(title, username):
+        menu = "\n    ".join(MENU_ITEM_HTML.format(href=href, name=name) for name, href in MENU_ITEMS)
+        body = APP_BODY.format(menu=menu, title=title, username=html.escape(username), logout=LOGOUT_PATH)
+        return PAGE_TEMPLATE.format(body=body)
+
+    def _api(self, handler):
+        """
+        Answer an API request with JSON, requiring an authenticated session
+
+        :param handler: Callable returning the response document
+        """
+        if self._session_token() not in self.server.sessions:
+            self._send_json(401, {"error": {"status": "401", "message": "Session expired"}})
+            return
+        try:
+            self._send_json(200, dict(handler(), meta=[], rels=[]))
+        except KeyError as e:
+            self._send_json(404, {"error": {"status": "404", "message": f"Record not found: {e}"}})
+        except ValueError as e:
+            self._send_json(422, {"error": {"status": "422", "message": str(e)}})
+
+    def _query(self):
+        return {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _session_token(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+
+    def _send_json(self, status, document):
+        self._send(status, "application/json", json.dumps(document).encode())
+
+    def _send_html(self, document):
+        self._send(200, "text/html; charset=utf-8", document.encode())
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, location, session_token=None, clear_session=False):
+        headers = {"Location": location}
+        if session_token:
+            headers["Set-Cookie"] = f"{SESSION_COOKIE}={session_token}; Path=/; HttpOnly"
+        elif clear_session:
+            headers["Set-Cookie"] = f"{SESSION_COOKIE}=; Path=/; Max-Age=0"
+        self._send(302, "text/plain", b"", headers)
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding the stand-in application state
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, users):
+        super().__init__(address, _StandInRequestHandler)
+        self.sessions = {}
+        self.csrf_tokens = OrderedDict()
+        self.accounts = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        for username, password in users.items():
+            if self._find_account(username) is None:
+                self.create_account({"username": username, "password": password, "userRoleId": 1,
+                                     "empNumber": 1})
+
+    def issue_csrf_token(self):
+        token = secrets.token_hex(16)
+        with self._lock:
+            self.csrf_tokens[token] = None
+            if len(self.csrf_tokens) > CSRF_TOKEN_LIMIT:
+                self.csrf_tokens.popitem(last=False)
+        return token
+
+    def consume_csrf_token(self, token):
+        # Tokens are single use (every rendered login form gets its own)
+        with self._lock:
+            return self.csrf_tokens.pop(token, False) is None
+
+    def check_credentials(self, username, password):
+        # Usernames are case-insensitive in OrangeHRM, passwords are not
+        account = self._find_account(username)
+        return account is not None and account["status"] and account["password"] == password
+
+    def list_accounts(self, username=None):
+        return [self.public_account(account_id) for account_id, account in sorted(self.accounts.items())
+                if username is None or account["userName"].lower() == username.lower()]
+
+    def public_account(self, account_id):
+        account = self.accounts[account_id]
+        employee = next(employee for employee in EMPLOYEES if employee["empNumber"] == account["empNumber"])
+        role = USER_ROLES[account["userRoleId"]]
+        return {"id": account_id, "userName": account["userName"], "deleted": False, "status": account["status"],
+                "employee": employee, "userRole": {"id": account["userRoleId"], "name": role, "displayName": role}}
+
+    def create_account(self, fields):
+        with self._lock:
+            if self._find_account(fields.get("username", "")) is not None:
+                raise ValueError("Username already exists")
+            if fields.get("userRoleId") not in USER_ROLES or not fields.get("password"):
+                raise ValueError("Invalid parameter")
+            account_id = next(self._ids)
+            self.accounts[account_id] = {"userName": fields["username"], "password": fields["password"],
+                                         "status": fields.get("status", True), "userRoleId": fields["userRoleId"],
+                                         "empNumber": fields.get("empNumber", 1)}
+        return self.public_account(account_id)
+
+    def delete_accounts(self, account_ids):
+        with self._lock:
+            deleted = [account_id for account_id in account_ids if self.accounts.pop(account_id, None)]
+        return deleted
+
+    def _find_account(self, username):
+        return next((account for account in self.accounts.values()
+                     if account["userName"].lower() == username.lower()), None)
+
+
+class LocalOrangeHRMServer:
+    """
+    Hermetic in-process stand-in for the OrangeHRM demo site.
+
+    Serves the login page (with a CSRF token), dashboard, side menu modules,
+    logout and the "Invalid credentials" / "Required" errors with the same DOM
+    selectors the page objects use, plus the admin users and employees API used
+    by ApiClient, so test runs need no network access.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, users=None):
+        """
+        Initialize the server (call start() to begin serving)
+
+        :param host: Interface to bind to
+        :param port: Port to bind to (0 picks a free port)
+        :param users: Dictionary mapping usernames to passwords (defaults to the
+                      configured default user and the valid users from users.json)
+        """
+        self.host = host
+        self.port = port
+        self.users = users if users is not None else self.default_users()
+        self._server = None
+        self._thread = None
+
+    @staticmethod
+    def default_users():
+        """
+        Build the accepted credentials from Config and users.json
+
+        :return: Dictionary mapping usernames to passwords
+        """
+        users = {Config.DEFAULT_USERNAME: Config.DEFAULT_PASSWORD}
+        for user in DataReader.get_user_data()["valid_users"]:
+            users[user["username"]] = user["password"]
+        return users
+
+    @property
+    def url(self):
+        """
+        Base URL of the running server, usable as Config.BASE_URL
+
+        :return: URL string
+        """
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def start(self):
+        """
+        Start serving on a background thread
+
+        :return: The server itself
+        """
+        self._server = _StandInHTTPServer((self.host, self.port), self.users)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Local OrangeHRM stand-in serving on {self.url}")
+        return self
+
+    def stop(self):
+        """
+        Stop serving and release the port
+        """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def serve_forever(self):
+        """
+        Start serving and block until interrupted
+        """
+        self.start()
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the local OrangeHRM stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    LocalOrangeHRMServer(args.host, args.port).serve_forever()
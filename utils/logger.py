@@ -1,13 +1,64 @@
+import atexit
+import glob
+import heapq
+import json
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
 
+from utils.config import Config
+
+
+# xdist worker running this process ("main" outside xdist)
+WORKER_ID = os.getenv("PYTEST_XDIST_WORKER", "main")
+
+# Shared by the xdist controller and its workers (workers inherit the environment)
+RUN_ID = os.environ.setdefault("LOG_RUN_ID", f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}")
+
+
+class ContextFilter(logging.Filter):
+    """
+    Tag records with the xdist worker and the test currently running
+    """
+
+    def filter(self, record):
+        record.worker = WORKER_ID
+        record.nodeid = os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0]
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as single-line JSON objects
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": record.created,
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "worker": getattr(record, "worker", WORKER_ID),
+            "nodeid": getattr(record, "nodeid", ""),
+            "message": record.getMessage(),
+        }
+        return json.dumps(entry)
+
 
 class Logger:
     """
     Custom logger for test execution
+
+    Log calls only put the record on an in-memory queue; a QueueListener thread
+    writes it to the console and to a size-rotated JSON lines file owned by the
+    current xdist worker. merge_worker_logs() combines the worker files of a run
+    into a single time-ordered stream.
     """
 
+    _listeners = []
+
     @staticmethod
     def get_logger(name):
         """
@@ -16,35 +67,113 @@ class Logger:
         :param name: Name for the logger
         :return: Configured logger instance
         """
-        # Create logs directory if it doesn't exist
-        log_dir = "reports/logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-
         # Configure logger
         logger = logging.getLogger(name)
         logger.setLevel(logging.INFO)
 
-        # Create formatter
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        if any(isinstance(handler, logging.handlers.QueueHandler) for handler in logger.handlers):
+            return logger
+
+        # Create logs directory if it doesn't exist
+        os.makedirs(Config.LOG_DIR, exist_ok=True)
 
         # Create console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(formatter)
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 
-        # Create file handler
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_handler = logging.FileHandler(f"{log_dir}/test_run_{timestamp}.log")
+        # Create per-worker rotating file handler
+        file_handler = logging.handlers.RotatingFileHandler(
+            Logger.worker_log_path(),
+            maxBytes=Config.LOG_MAX_BYTES,
+            backupCount=Config.LOG_BACKUP_COUNT,
+        )
         file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(JsonFormatter())
+
+        # Hand records to a background thread so logging never blocks on I/O
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler,
+                                                  respect_handler_level=True)
+        listener.start()
+        Logger._listeners.append(listener)
 
-        # Add handlers to logger
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(ContextFilter())
+        logger.addHandler(queue_handler)
 
         return logger
 
+    @staticmethod
+    def worker_log_path(worker=WORKER_ID):
+        """
+        Path of the JSON log file of a worker for the current run
+
+        :param worker: xdist worker ID
+        :return: File path
+        """
+        return os.path.join(Config.LOG_DIR, f"test_run_{RUN_ID}_{worker}.jsonl")
+
+    @staticmethod
+    def flush():
+        """
+        Wait until every queued record has been written
+        """
+        for listener in Logger._listeners:
+            listener.stop()
+            listener.start()
+
+    @staticmethod
+    def shutdown():
+        """
+        Write remaining records and stop the listener threads
+        """
+        listeners, Logger._listeners = Logger._listeners, []
+        for listener in listeners:
+            listener.stop()
+
+    @staticmethod
+    def merge_worker_logs():
+        """
+        Merge the JSON log files of all workers of this run into one time-ordered file
+
+        :return: Path of the merged file, or None if there was nothing to merge
+        """
+        Logger.flush()
+
+        streams = []
+        for base_path in sorted(glob.glob(os.path.join(Config.LOG_DIR, f"test_run_{RUN_ID}_*.jsonl"))):
+            # Rotated files (.jsonl.N) hold older records, highest N first
+            rotated = sorted(glob.glob(f"{base_path}.*"), key=lambda path: int(path.rsplit(".", 1)[1]), reverse=True)
+            streams.append(Logger._read_entries(rotated + [base_path]))
+
+        if not streams:
+            return None
+
+        merged_path = os.path.join(Config.LOG_DIR, f"test_run_{RUN_ID}.jsonl")
+        with open(merged_path, 'w') as merged_file:
+            for ts, line in heapq.merge(*streams):
+                merged_file.write(line)
+        return merged_path
+
+    @staticmethod
+    def _read_entries(file_paths):
+        """
+        Stream (timestamp, line) pairs from a worker's log files in order
+
+        :param file_paths: Files of one worker, oldest first
+        :return: Iterator of tuples
+        """
+        for file_path in file_paths:
+            with open(file_path, 'r') as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)["ts"], line
+                    except (ValueError, KeyError):
+                        continue
+
+
+atexit.register(Logger.shutdown)
 
 # Initialize global logger
-logger = Logger.get_logger("OrangeHRM_Automation")
\ No newline at end of file
+logger = Logger.get_logger("OrangeHRM_Automation")
@@ -0,0 +1,207 @@
+"""
+Page-load performance budgets.
+
+Page objects declare a PERFORMANCE_BUDGET (milliseconds for timings, bytes for
+transfer sizes). BasePage collects Navigation Timing, Resource Timing and paint
+metrics after navigations and hands them to PerformanceMonitor, which compares
+them with the budget. The pytest plugin at the bottom of this module attaches the
+metrics to Allure and turns a test that passed functionally but blew a budget
+into a distinct "performance budget exceeded" failure.
+"""
+import json
+import threading
+
+import allure
+import pytest
+
+from utils.config import Config
+from utils.logger import logger
+
+
+# Reads the metrics of the current document in one round-trip. Returns null until the load event
+# has finished, or only until DOMContentLoaded when called with false (eager/none page-load strategies)
+PERFORMANCE_SCRIPT = """
+const waitForLoad = arguments[0];
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav || (waitForLoad ? nav.loadEventEnd : nav.domContentLoadedEventEnd) === 0) {
+    return null;
+}
+const paints = {};
+for (const entry of performance.getEntriesByType('paint')) {
+    paints[entry.name] = entry.startTime;
+}
+const resources = performance.getEntriesByType('resource');
+return {
+    url: nav.name,
+    time_origin: performance.timeOrigin,
+    ttfb: nav.responseStart - nav.startTime,
+    dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+    load: nav.loadEventEnd === 0 ? null : nav.loadEventEnd - nav.startTime,
+    first_paint: paints['first-paint'] === undefined ? null : paints['first-paint'],
+    first_contentful_paint: paints['first-contentful-paint'] === undefined ? null : paints['first-contentful-paint'],
+    resource_count: resources.length,
+    transfer_size: resources.reduce((total, entry) => total + (entry.transferSize || 0), nav.transferSize || 0),
+    slowest_resources: resources
+        .slice()
+        .sort((a, b) => b.duration - a.duration)
+        .slice(0, 5)
+        .map(entry => ({name: entry.name, initiator: entry.initiatorType,
+                        duration: entry.duration, transfer_size: entry.transferSize || 0})),
+};
+"""
+
+
+class PerformanceMonitor:
+    """
+    Budget checks and metrics collected per test
+
+    Only page loads made by the thread running the test count towards its budgets and the
+    session totals; page objects driven by other threads (e.g. load generator virtual users)
+    are still checked and logged, but not attributed to the test.
+    """
+
+    enabled = Config.PERFORMANCE_BUDGETS
+
+    # Session totals per page: {page: {"count": n, "load": ms, "transfer_size": bytes}}
+    page_loads = {}
+
+    # Measurements per test node ID, and the node ID and thread ident of the running test
+    _measurements = {}
+    _current = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def start(nodeid):
+        """
+        Attribute the page loads of the calling thread to a test
+
+        :param nodeid: Node ID of the test starting on this thread
+        """
+        with PerformanceMonitor._lock:
+            PerformanceMonitor._current = (nodeid, threading.get_ident())
+            PerformanceMonitor._measurements[nodeid] = []
+
+    @staticmethod
+    def finish(nodeid):
+        """
+        Stop attributing page loads to a test and forget its measurements
+
+        :param nodeid: Node ID of the finished test
+        """
+        with PerformanceMonitor._lock:
+            if PerformanceMonitor._current and PerformanceMonitor._current[0] == nodeid:
+                PerformanceMonitor._current = None
+            PerformanceMonitor._measurements.pop(nodeid, None)
+
+    @staticmethod
+    def check(page_name, metrics, budget):
+        """
+        Compare page-load metrics with a budget and remember the result
+
+        :param page_name: Name of the page object class
+        :param metrics: Dictionary returned by PERFORMANCE_SCRIPT
+        :param budget: Dictionary {metric: limit}, scaled by Config.PERFORMANCE_BUDGET_SCALE
+        :return: List of violation messages
+        """
+        violations = []
+        for metric, limit in budget.items():
+            value = metrics.get(metric)
+            limit = limit * Config.PERFORMANCE_BUDGET_SCALE
+            if value is not None and value > limit:
+                violations.append(f"{page_name} {metric}: {value:.0f} > budget {limit:.0f}")
+
+        for violation in violations:
+            logger.warning(f"Performance budget exceeded on {violation}")
+
+        with PerformanceMonitor._lock:
+            current = PerformanceMonitor._current
+            if current is None or current[1] != threading.get_ident():
+                return violations
+
+            PerformanceMonitor._measurements[current[0]].append(
+                {"page": page_name, "metrics": metrics, "violations": violations})
+
+            totals = PerformanceMonitor.page_loads.setdefault(page_name, {"count": 0, "load": 0.0, "transfer_size": 0})
+            totals["count"] += 1
+            totals["load"] += metrics.get("load") or 0.0
+            totals["transfer_size"] += metrics.get("transfer_size") or 0
+        return violations
+
+    @staticmethod
+    def measurements(nodeid):
+        """
+        Measurements recorded during a test
+
+        :param nodeid: Node ID of the test
+        :return: List of dictionaries {"page": ..., "metrics": ..., "violations": [...]}
+        """
+        with PerformanceMonitor._lock:
+            return list(PerformanceMonitor._measurements.get(nodeid, ()))
+
+    @staticmethod
+    def violations(nodeid):
+        """
+        Violations recorded during a test
+
+        :param nodeid: Node ID of the test
+        :return: List of violation messages
+        """
+        return [violation for measurement in PerformanceMonitor.measurements(nodeid)
+                for violation in measurement["violations"]]
+
+    @staticmethod
+    def reset():
+        """
+        Forget the measurements of every test
+        """
+        with PerformanceMonitor._lock:
+            PerformanceMonitor._current = None
+            PerformanceMonitor._measurements.clear()
+
+
+def pytest_addoption(parser):
+    """
+    Add the option disabling performance budgets
+    """
+    parser.addoption("--no-performance-budgets", action="store_true", default=not Config.PERFORMANCE_BUDGETS,
+                     help="Do not collect page-load metrics or check page performance budgets")
+
+
+def pytest_configure(config):
+    """
+    Enable or disable page-load metrics for the session
+    """
+    PerformanceMonitor.enabled = not config.getoption("--no-performance-budgets")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    """
+    Collect the page loads of one test, from its setup to its teardown
+    """
+    PerformanceMonitor.start(item.nodeid)
+    yield
+    PerformanceMonitor.finish(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Attach the metrics of a test to Allure and fail it when it passed but exceeded a budget
+    """
+    outcome = yield
+    report = outcome.get_result()
+    if call.when != "call":
+        return
+    measurements = PerformanceMonitor.measurements(item.nodeid)
+    if not measurements:
+        return
+
+    allure.attach(json.dumps(measurements, indent=2), name="Page-load metrics",
+                  attachment_type=allure.attachment_type.JSON)
+
+    violations = PerformanceMonitor.violations(item.nodeid)
+    if violations and report.passed:
+        report.outcome = "failed"
+        report.longrepr = "Performance budget exceeded:\n" + "\n".join(violations)
+        report.user_properties.append(("performance_budget_exceeded", violations))
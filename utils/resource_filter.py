@@ -0,0 +1,223 @@
+"""
+Lean browser profile: block resources no test asserts on.
+
+With --lean-profile (or LEAN_PROFILE=true) requests whose URL matches
+Config.BLOCKED_RESOURCES are failed before they leave the browser, unless they
+also match Config.ALLOWED_RESOURCES (assets tests do check, such as the branding
+logo behind LoginPage.BRAND_LOGO). Blocking uses WebDriver BiDi network
+interception where the driver supports it, Chrome DevTools Network.setBlockedURLs
+otherwise, and finally browser preferences. The run summary compares page loads
+with the last run without the lean profile to report the bytes and time saved.
+"""
+import threading
+from fnmatch import fnmatch
+
+import pytest
+
+from utils.config import Config
+from utils.logger import logger
+from utils.performance import PerformanceMonitor
+
+
+BASELINE_CACHE_KEY = "orangehrm/page_load_baseline"
+
+
+class ResourceFilter:
+    """
+    Installs request blocking on drivers and counts what was blocked
+    """
+
+    blocked = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def is_blocked(url):
+        """
+        Decide whether a request should be blocked
+
+        :param url: Request URL
+        :return: Matching block pattern, or None if the request may proceed
+        """
+        if any(fnmatch(url, pattern) for pattern in Config.ALLOWED_RESOURCES):
+            return None
+        return next((pattern for pattern in Config.BLOCKED_RESOURCES if fnmatch(url, pattern)), None)
+
+    @staticmethod
+    def apply_preferences(options, browser):
+        """
+        Configure browser options for the lean profile
+
+        :param options: Chrome or Firefox options object
+        :param browser: Browser name
+        """
+        # BiDi gives per-request control, preferences below only cover what it cannot
+        options.enable_bidi = True
+
+        if browser == "firefox" and ResourceFilter._prunable("*.woff2"):
+            options.set_preference("browser.display.use_document_fonts", 0)
+        if not Config.ALLOWED_RESOURCES and ResourceFilter._prunable("*.png"):
+            # Blanket image blocking cannot make exceptions, so it is only used without an allow-list
+            if browser == "firefox":
+                options.set_preference("permissions.default.image", 2)
+            else:
+                options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    @staticmethod
+    def install(driver):
+        """
+        Start blocking requests in a driver session
+
+        :param driver: WebDriver instance
+        :return: Mechanism used ("bidi", "cdp" or "preferences")
+        """
+        try:
+            driver.network.add_request_handler("before_request", ResourceFilter._handle)
+            return "bidi"
+        except Exception as e:
+            logger.info(f"BiDi request interception unavailable ({e}), falling back")
+
+        if hasattr(driver, "execute_cdp_cmd"):
+            # setBlockedURLs has no exceptions, so never block a pattern an allow-listed URL could match
+            patterns = [pattern for pattern in Config.BLOCKED_RESOURCES
+                        if not any(fnmatch(allowed, pattern) for allowed in Config.ALLOWED_RESOURCES)]
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+                return "cdp"
+            except Exception as e:
+                logger.warning(f"DevTools request blocking failed: {e}")
+
+        return "preferences"
+
+    @staticmethod
+    def _handle(request):
+        """
+        BiDi request handler (runs on the driver's websocket thread)
+
+        :param request: Intercepted request
+        """
+        pattern = ResourceFilter.is_blocked(request.url or "")
+        if pattern is None:
+            request.continue_request()
+            return
+
+        with ResourceFilter._lock:
+            ResourceFilter.blocked[pattern] = ResourceFilter.blocked.get(pattern, 0) + 1
+        request.fail_request()
+
+    @staticmethod
+    def _prunable(example):
+        """
+        Check whether a resource kind is blocked and nothing of that kind is allow-listed
+
+        :param example: Example URL pattern of the resource kind, e.g. "*.png"
+        :return: Boolean
+        """
+        blocked = any(fnmatch(example, pattern) for pattern in Config.BLOCKED_RESOURCES)
+        allowed = any(fnmatch(allowed, example + "*") for allowed in Config.ALLOWED_RESOURCES)
+        return blocked and not allowed
+
+
+def pytest_addoption(parser):
+    """
+    Add the option enabling the lean browser profile
+    """
+    parser.addoption("--lean-profile", action="store_true", default=Config.LEAN_PROFILE,
+                     help="Block images, fonts and third-party scripts that tests do not assert on")
+
+
+def pytest_configure(config):
+    """
+    Apply the lean profile setting and register the plugin object reporting on it
+    """
+    Config.LEAN_PROFILE = config.getoption("--lean-profile")
+    config.pluginmanager.register(LeanProfileReport(config), "lean_profile_report")
+
+
+class LeanProfileReport:
+    """
+    Plugin object comparing page loads with and without the lean profile
+    """
+
+    def __init__(self, config):
+        """
+        Initialize an empty report
+
+        :param config: pytest config
+        """
+        self.config = config
+        self.page_loads = {}
+        self.blocked = {}
+
+    def pytest_sessionfinish(self, session):
+        """
+        Collect this process's page loads and ship them to the xdist controller
+        """
+        self._merge(PerformanceMonitor.page_loads, ResourceFilter.blocked)
+        if hasattr(self.config, "workeroutput"):
+            self.config.workeroutput["lean_profile"] = {"page_loads": self.page_loads, "blocked": self.blocked}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        """
+        Collect the page loads sent back by an xdist worker
+        """
+        data = getattr(node, "workeroutput", {}).get("lean_profile")
+        if data:
+            self._merge(data["page_loads"], data["blocked"])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """
+        Report savings on lean runs, record the baseline on full runs
+        """
+        cache = getattr(self.config, "cache", None)
+        if not self.page_loads or hasattr(self.config, "workerinput"):
+            return
+
+        browser = self.config.getoption("--browser")
+        baselines = cache.get(BASELINE_CACHE_KEY, {}) if cache else {}
+
+        if not Config.LEAN_PROFILE:
+            baselines[browser] = {page: {"load": totals["load"] / totals["count"],
+                                         "transfer_size": totals["transfer_size"] / totals["count"]}
+                                  for page, totals in self.page_loads.items()}
+            if cache:
+                cache.set(BASELINE_CACHE_KEY, baselines)
+            return
+
+        terminalreporter.section("Lean browser profile")
+        by_pattern = ", ".join(f"{pattern}: {count}" for pattern, count in sorted(self.blocked.items()))
+        terminalreporter.write_line(f"Blocked requests: {sum(self.blocked.values())} ({by_pattern or 'none counted'})")
+
+        baseline = baselines.get(browser)
+        if not baseline:
+            terminalreporter.write_line("No baseline yet: run once without --lean-profile to measure savings")
+            return
+
+        bytes_saved = time_saved = 0.0
+        for page, totals in sorted(self.page_loads.items()):
+            if page not in baseline:
+                continue
+            page_bytes = (baseline[page]["transfer_size"] - totals["transfer_size"] / totals["count"]) * totals["count"]
+            page_time = (baseline[page]["load"] - totals["load"] / totals["count"]) * totals["count"]
+            bytes_saved += page_bytes
+            time_saved += page_time
+            terminalreporter.write_line(f"{page}: {totals['count']} loads, {page_bytes / 1024:.0f} KiB "
+                                        f"and {page_time / 1000:.1f}s saved")
+        terminalreporter.write_line(f"Total: {bytes_saved / 1024 / 1024:.1f} MiB and {time_saved / 1000:.1f}s "
+                                    f"of page load time saved")
+        logger.info(f"Lean profile saved {bytes_saved:.0f} bytes and {time_saved / 1000:.1f}s of page load time")
+
+    def _merge(self, page_loads, blocked):
+        """
+        Add page-load totals and blocked request counts
+
+        :param page_loads: Dictionary {page: {"count", "load", "transfer_size"}}
+        :param blocked: Dictionary {pattern: count}
+        """
+        for page, totals in page_loads.items():
+            merged = self.page_loads.setdefault(page, {"count": 0, "load": 0.0, "transfer_size": 0})
+            for key, value in totals.items():
+                merged[key] += value
+        for pattern, count in blocked.items():
+            self.blocked[pattern] = self.blocked.get(pattern, 0) + count
@@ -0,0 +1,154 @@
+from selenium.common.exceptions import TimeoutException
+from utils.config import Config
+from utils.data_reader import DataReader
+from utils.logger import logger
+
+
+class SessionCache:
+    """
+    Per-worker cache of authenticated browser sessions.
+
+    The first request for a role logs in (over HTTP with ApiClient when
+    Config.SESSION_LOGIN is "api", else through the login page) and snapshots
+    the resulting cookies and local storage. Later requests inject the snapshot into
+    the browser and only fall back to the UI login when the session has expired.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty snapshot cache
+        """
+        self._snapshots = {}
+
+    def login(self, driver, role="Admin"):
+        """
+        Make sure the browser is logged in as a user with the given role
+
+        :param driver: WebDriver instance
+        :param role: Role of the user from users.json
+        :return: DashboardPage object
+        """
+        from pages.dashboard_page import DashboardPage
+
+        snapshot = self._snapshots.get(role)
+        if snapshot:
+            dashboard_page = self.restore(driver, snapshot)
+            if dashboard_page.is_session_valid():
+                logger.info(f"Reused cached session for role: {role}")
+                return dashboard_page
+            logger.info(f"Cached session for role {role} has expired, logging in again")
+
+        dashboard_page = self._api_login(driver, role) if Config.SESSION_LOGIN == "api" else None
+        if dashboard_page is None:
+            dashboard_page = self._ui_login(driver, role)
+        self._snapshots[role] = self.capture(driver)
+        return dashboard_page
+
+    def invalidate(self, role=None):
+        """
+        Drop cached sessions (e.g. after a test logged out or changed the password)
+
+        :param role: Role to drop, or None to drop every cached session
+        """
+        if role is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(role, None)
+
+    @staticmethod
+    def capture(driver):
+        """
+        Snapshot the authentication state of the current page
+
+        :param driver: WebDriver instance
+        :return: Dictionary with cookies and local storage entries
+        """
+        return {
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+        }
+
+    @staticmethod
+    def restore(driver, snapshot):
+        """
+        Inject a snapshot into the browser and open the dashboard
+
+        :param driver: WebDriver instance
+        :param snapshot: Dictionary produced by capture()
+        :return: DashboardPage object (check is_session_valid(), the snapshot may have expired)
+        """
+        from pages.dashboard_page import DashboardPage
+
+        # Cookies and storage can only be set for the origin of the current page,
+        # so load a lightweight page from the application first
+        driver.get(f"{Config.BASE_URL}{Config.SESSION_RESTORE_PATH}")
+
+        for cookie in snapshot["cookies"]:
+            driver.add_cookie(cookie)
+
+        driver.execute_script(
+            "for (const [key, value] of Object.entries(arguments[0])) { window.localStorage.setItem(key, value); }",
+            snapshot["local_storage"],
+        )
+        DashboardPage.invalidate_menu_index(driver)
+
+        dashboard_page = DashboardPage(driver)
+        driver.get(dashboard_page.url)
+        if "/auth/login" in driver.current_url:
+            # Expired or invalid: the application redirected to the login page, no need to wait for the dashboard
+            logger.info("Restored session was redirected to the login page")
+            return dashboard_page
+
+        try:
+            dashboard_page.wait_until_ready()
+            dashboard_page.measure_page_load()
+            return dashboard_page
+        except TimeoutException:
+            # The redirect may not have been followed yet when get() returned (page-load strategy "none")
+            logger.info(f"Dashboard did not become ready after restoring a session (at {driver.current_url})")
+            return dashboard_page
+
+    @staticmethod
+    def _api_login(driver, role):
+        """
+        Log in over HTTP and hand the session cookie to the browser
+
+        :param driver: WebDriver instance
+        :param role: Role of the user from users.json
+        :return: DashboardPage object, or None if the browser did not end up logged in
+        """
+        from utils.api_client import ApiClient
+
+        user = DataReader.get_valid_user(role)
+        client = ApiClient()
+        try:
+            if not client.login(user["username"], user["password"]):
+                logger.warning(f"API login for role {role} was rejected, falling back to the UI")
+                return None
+            dashboard_page = client.authenticate_driver(driver)
+        except Exception as e:
+            logger.warning(f"API login for role {role} failed ({e}), falling back to the UI")
+            return None
+        finally:
+            client.close()
+
+        return dashboard_page if dashboard_page.is_session_valid() else None
+
+    @staticmethod
+    def _ui_login(driver, role):
+        """
+        Log in through the login page
+
+        :param driver: WebDriver instance
+        :param role: Role of the user from users.json
+        :return: DashboardPage object
+        """
+        from pages.login_page import LoginPage
+
+        user = DataReader.get_valid_user(role)
+        logger.info(f"Logging in through the UI as {user['username']} ({role})")
+
+        dashboard_page = LoginPage(driver).open().login(user["username"], user["password"])
+        if not dashboard_page.is_dashboard_displayed():
+            raise RuntimeError(f"UI login for role {role} did not reach the dashboard")
+        return dashboard_page